@@ -6,7 +6,6 @@
 # Standard library
 import streamlit as st
 import pandas as pd
-import time
 from google.oauth2 import service_account
 import gspread
 from tenacity import retry, wait_exponential, stop_after_attempt
@@ -36,9 +35,18 @@ from components.new_navigation import render_main_navigation, render_user_info
 
 # Utils
 from utils.styles import get_main_styles_v2
-from utils.data_manager import safe_get_sheet_data, batch_update_sheet
+from utils.data_manager import batch_update_sheet, invalidate, get_data_status, ContextoDatos
 from utils.permissions import has_permission
 from utils.date_utils import ahora_argentina
+from utils.helpers import format_antiguedad
+from utils.modelo_datos import (
+    normalizar_reclamos,
+    normalizar_clientes,
+    reclamos_activos,
+    reclamos_cerrados,
+    modelo_datos,
+)
+from utils.metricas import METRICAS_RECLAMOS
 from utils.api_manager import api_manager
 from components.reclamos.nuevo import generar_id_unico
 
@@ -75,18 +83,28 @@ def init_google_sheets():
         st.stop()
 
 # --- Carga de Datos ---
-def cargar_datos_principales(sheet_reclamos, sheet_clientes, sheet_usuarios):
-    """Carga los dataframes principales desde las hojas de cálculo."""
-    with st.spinner("Cargando datos..."):
-        df_r = safe_get_sheet_data(sheet_reclamos, COLUMNAS_RECLAMOS)
-        df_c = safe_get_sheet_data(sheet_clientes, COLUMNAS_CLIENTES)
-        df_u = safe_get_sheet_data(sheet_usuarios, COLUMNAS_USUARIOS)
-    return df_r, df_c, df_u
+def crear_contexto_datos(sheet_reclamos, sheet_clientes, sheet_usuarios):
+    """Crea el contexto de datos perezoso: cada hoja se lee recién cuando una página la usa."""
+    return ContextoDatos(
+        {
+            "reclamos": (sheet_reclamos, COLUMNAS_RECLAMOS, normalizar_reclamos),
+            "clientes": (sheet_clientes, COLUMNAS_CLIENTES, normalizar_clientes),
+            "usuarios": (sheet_usuarios, COLUMNAS_USUARIOS, None),
+        },
+        particiones={
+            # Reclamos abiertos (lo que usan las páginas de trabajo diario) e historial
+            "reclamos_activos": ("reclamos", reclamos_activos),
+            "reclamos_cerrados": ("reclamos", reclamos_cerrados),
+        },
+    )
 
 # --- UTILIDAD: Migración de UUIDs existentes ---
-def migrar_uuids_existentes(sheet_reclamos, sheet_clientes):
+def migrar_uuids_existentes(datos):
     """Genera UUIDs para registros existentes que no los tengan"""
     try:
+        sheet_reclamos, sheet_clientes = datos.sheet_reclamos, datos.sheet_clientes
+        df_reclamos, df_clientes = datos.reclamos, datos.clientes
+
         if not sheet_reclamos or not sheet_clientes:
             st.error("No se pudo conectar a las hojas de cálculo")
             return False
@@ -95,18 +113,18 @@ def migrar_uuids_existentes(sheet_reclamos, sheet_clientes):
         updates_clientes = []
 
         # Validaciones de columnas
-        if 'ID Reclamo' not in st.session_state.df_reclamos.columns:
+        if 'ID Reclamo' not in df_reclamos.columns:
             st.error("La columna 'ID Reclamo' no existe en los datos de reclamos")
             return False
 
-        if 'ID Cliente' not in st.session_state.df_clientes.columns:
+        if 'ID Cliente' not in df_clientes.columns:
             st.error("La columna 'ID Cliente' no existe en los datos de clientes")
             return False
 
         # Reclamos sin UUID
-        reclamos_sin_uuid = st.session_state.df_reclamos[
-            st.session_state.df_reclamos['ID Reclamo'].isna() |
-            (st.session_state.df_reclamos['ID Reclamo'] == '')
+        reclamos_sin_uuid = df_reclamos[
+            df_reclamos['ID Reclamo'].isna() |
+            (df_reclamos['ID Reclamo'] == '')
         ]
 
         if not reclamos_sin_uuid.empty:
@@ -150,9 +168,9 @@ def migrar_uuids_existentes(sheet_reclamos, sheet_clientes):
                 status.update(label="✅ UUIDs para reclamos completados", state="complete", expanded=False)
 
         # Clientes sin UUID
-        clientes_sin_uuid = st.session_state.df_clientes[
-            st.session_state.df_clientes['ID Cliente'].isna() |
-            (st.session_state.df_clientes['ID Cliente'] == '')
+        clientes_sin_uuid = df_clientes[
+            df_clientes['ID Cliente'].isna() |
+            (df_clientes['ID Cliente'] == '')
         ]
 
         if not clientes_sin_uuid.empty:
@@ -188,9 +206,8 @@ def migrar_uuids_existentes(sheet_reclamos, sheet_clientes):
             st.info("ℹ️ Todos los registros ya tienen UUIDs asignados")
             return False
 
-        # Refrescar DataFrames en caché
-        st.session_state.df_reclamos = safe_get_sheet_data(sheet_reclamos, COLUMNAS_RECLAMOS)
-        st.session_state.df_clientes = safe_get_sheet_data(sheet_clientes, COLUMNAS_CLIENTES)
+        # Los próximos accesos leen los datos ya actualizados
+        datos.recargar()
 
         return True
 
@@ -207,11 +224,8 @@ if not check_authentication():
     render_login(sheet_usuarios)
     st.stop()
 
-# --- CARGA Y CACHEO DE DATOS ---
-df_reclamos, df_clientes, df_usuarios = cargar_datos_principales(sheet_reclamos, sheet_clientes, sheet_usuarios)
-st.session_state.df_reclamos = df_reclamos
-st.session_state.df_clientes = df_clientes
-st.session_state.df_usuarios = df_usuarios
+# --- CONTEXTO DE DATOS (carga perezosa) ---
+datos = crear_contexto_datos(sheet_reclamos, sheet_clientes, sheet_usuarios)
 
 # --- OBTENER INFORMACIÓN DEL USUARIO AUTENTICADO ---
 user_info = st.session_state.auth.get('user_info', {})
@@ -228,13 +242,11 @@ st.markdown(get_main_styles_v2(dark_mode=st.session_state.modo_oscuro), unsafe_a
 # --- HEADER Y NAVEGACIÓN PRINCIPAL ---
 st.markdown("""<h1 style="text-align: center; margin-bottom: 2rem;">Fusion Reclamos App</h1>""", unsafe_allow_html=True)
 
-# Métricas compactas para el header (hoy y pendientes)
+# Métricas compactas para el header (hoy y pendientes), materializadas por versión de la hoja
 try:
-    df_header = df_reclamos.copy()
-    df_header["Fecha y hora"] = pd.to_datetime(df_header["Fecha y hora"], dayfirst=True, errors='coerce')
-    hoy = ahora_argentina().date()
-    reclamos_hoy_count = int((df_header["Fecha y hora"].dt.date == hoy).sum())
-    pendientes_count = int((df_header["Estado"].astype(str).str.strip().str.lower() == "pendiente").sum())
+    metricas = datos.indice("reclamos", METRICAS_RECLAMOS)
+    reclamos_hoy_count = metricas.reclamos_del_dia(ahora_argentina().date())
+    pendientes_count = metricas.por_estado("Pendiente")
 except Exception:
     reclamos_hoy_count = 0
     pendientes_count = 0
@@ -246,6 +258,13 @@ with header_cols[0]:
         st.metric(label="📝 Hoy", value=reclamos_hoy_count)
     with mcol2:
         st.metric(label="⏳ Pendientes", value=pendientes_count)
+    # Frescura de los datos compartidos entre sesiones
+    estado_datos = get_data_status(WORKSHEET_RECLAMOS)
+    if estado_datos is not None:
+        if estado_datos.desactualizada:
+            st.warning(f"⚠️ Sin conexión con Google Sheets: datos {format_antiguedad(estado_datos.edad)}")
+        else:
+            st.caption(f"🔄 Datos sincronizados {format_antiguedad(estado_datos.edad)}")
 with header_cols[1]:
     render_user_info()
 with header_cols[2]:
@@ -269,10 +288,6 @@ COMPONENTES = {
         "render": render_nuevo_reclamo,
         "permiso": "inicio",
         "params": {
-            "df_reclamos": df_reclamos,
-            "df_clientes": df_clientes,
-            "sheet_reclamos": sheet_reclamos,
-            "sheet_clientes": sheet_clientes,
             "current_user": user_info.get('nombre', '')
         }
     },
@@ -280,9 +295,6 @@ COMPONENTES = {
         "render": render_gestion_reclamos,
         "permiso": "reclamos_cargados",
         "params": {
-            "df_reclamos": df_reclamos,
-            "df_clientes": df_clientes,
-            "sheet_reclamos": sheet_reclamos,
             "user": user_info
         }
     },
@@ -290,9 +302,6 @@ COMPONENTES = {
         "render": render_gestion_clientes,
         "permiso": "gestion_clientes",
         "params": {
-            "df_clientes": df_clientes,
-            "df_reclamos": df_reclamos,
-            "sheet_clientes": sheet_clientes,
             "user_role": user_info.get('rol', '')
         }
     },
@@ -300,8 +309,6 @@ COMPONENTES = {
         "render": render_impresion_reclamos,
         "permiso": "imprimir_reclamos",
         "params": {
-            "df_clientes": df_clientes,
-            "df_reclamos": df_reclamos,
             "user": user_info
         }
     },
@@ -309,21 +316,13 @@ COMPONENTES = {
         "render": render_planificacion_grupos,
         "permiso": "seguimiento_tecnico",
         "params": {
-            "df_reclamos": df_reclamos,
-            "sheet_reclamos": sheet_reclamos,
-            "user": user_info,
-            "df_clientes": df_clientes,
-            "sheet_clientes": sheet_clientes
+            "user": user_info
         }
     },
     "Cierre de Reclamos": {
         "render": render_cierre_reclamos,
         "permiso": "cierre_reclamos",
         "params": {
-            "df_reclamos": df_reclamos,
-            "df_clientes": df_clientes,
-            "sheet_reclamos": sheet_reclamos,
-            "sheet_clientes": sheet_clientes,
             "user": user_info
         }
     }
@@ -333,15 +332,32 @@ COMPONENTES = {
 if opcion in COMPONENTES and has_permission(COMPONENTES[opcion]["permiso"]):
     with st.container():
         st.markdown("---")
-        resultado = COMPONENTES[opcion]["render"](**COMPONENTES[opcion]["params"])
+        # Cada página recibe el contexto de datos y carga sólo lo que usa
+        resultado = COMPONENTES[opcion]["render"](datos, **COMPONENTES[opcion]["params"])
         
         if resultado and resultado.get('needs_refresh'):
-            st.cache_data.clear()
-            time.sleep(1)
+            # Las escrituras ya se reflejaron en la réplica; sólo se verifican diferencias
+            invalidate(WORKSHEET_RECLAMOS)
             st.rerun()
 
 # --- FOOTER Y RESUMEN ---
 with st.container():
-    render_resumen_jornada(df_reclamos)
+    render_resumen_jornada(datos.indice("reclamos", METRICAS_RECLAMOS))
+
+# Memoria de los datasets tipados frente a la versión cruda (sólo depuración)
+if DEBUG_MODE:
+    with st.expander("🧠 Memoria de los datos"):
+        reporte = modelo_datos.reporte_memoria()
+        if reporte:
+            st.dataframe(pd.DataFrame([
+                {
+                    "Hoja": r["hoja"],
+                    "Partición": r["particion"],
+                    "Filas": r["filas"],
+                    "Crudo (KB)": round(r["bytes_crudo"] / 1024, 1),
+                    "Tipado (KB)": round(r["bytes_tipado"] / 1024, 1),
+                }
+                for r in reporte
+            ]), use_container_width=True, hide_index=True)
 
 st.markdown(f"""<div style="text-align:center; font-size:1rem; color: var(--text-muted); padding-top: 2rem;">Desarrollado con 💜 por Sebastián Andrés (v3.0)</div>""", unsafe_allow_html=True)
@@ -27,7 +27,7 @@ def init_auth_session():
 def logout():
     """Cierra la sesión del usuario"""
     st.session_state.auth = {'logged_in': False, 'user_info': None}
-    st.cache_data.clear()  # Limpiar caché de datos
+    # Los datos de las hojas son compartidos entre sesiones: no se vacían al salir
 
 def verify_credentials(username, password, sheet_usuarios):
     """Verifica las credenciales del usuario usando password en texto plano (Google Sheets)."""
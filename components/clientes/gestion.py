@@ -2,11 +2,17 @@
 import streamlit as st
 import pandas as pd
 import uuid
-from utils.date_utils import ahora_argentina, format_fecha, parse_fecha
-from utils.api_manager import api_manager
-from utils.data_manager import batch_update_sheet as dm_batch_update_sheet
+from utils.date_utils import ahora_argentina, format_fecha
+from utils.data_manager import append_sheet_row, ColaEscrituras
+from utils.indices import CLIENTES_POR_NUMERO, RECLAMOS_POR_CLIENTE
+from utils.busqueda import BUSQUEDA_CLIENTES
+from components.ui import paginar
 from config.settings import SECTORES_DISPONIBLES
 
+# Buscador de clientes: resultados por página y máximo de coincidencias ordenadas
+CLIENTES_POR_PAGINA = 10
+MAX_RESULTADOS_CLIENTES = 100
+
 # --- FUNCIONES HELPER NUEVAS ---
 def _validar_telefono(telefono):
     """Acepta cualquier formato de teléfono (libre)."""
@@ -31,28 +37,25 @@ def _obtener_indice_sector(sector_actual, sectores_disponibles):
         return 0
 
 # --- FUNCIÓN PRINCIPAL CORREGIDA ---
-def render_gestion_clientes(df_clientes, df_reclamos, sheet_clientes, user_role):
+def render_gestion_clientes(datos, user_role):
     """
     Muestra la sección de gestión de clientes
     
     Args:
-        df_clientes (pd.DataFrame): DataFrame con los clientes
-        df_reclamos (pd.DataFrame): DataFrame con los reclamos
-        sheet_clientes: Objeto de conexión a la hoja de clientes
+        datos (ContextoDatos): contexto de datos (usa clientes y reclamos)
         user_role (str): Rol del usuario actual
     
     Returns:
         dict: Diccionario con estado de cambios y necesidad de recarga
     """
     st.subheader("🛠️ Gestión de Clientes")
-
-    # Normalización de datos - CORREGIDO
-    df_clientes["Nº Cliente"] = df_clientes["Nº Cliente"].astype(str).str.strip()
+    df_clientes = datos.clientes
+    sheet_clientes = datos.sheet_clientes
 
     cambios = False
 
     if user_role == 'admin':
-        cambios = _mostrar_edicion_cliente(df_clientes, df_reclamos, sheet_clientes) or cambios
+        cambios = _mostrar_edicion_cliente(datos, df_clientes, sheet_clientes) or cambios
         st.markdown("---")
         cambios = _mostrar_nuevo_cliente(df_clientes, sheet_clientes) or cambios
     else:
@@ -64,43 +67,83 @@ def render_gestion_clientes(df_clientes, df_reclamos, sheet_clientes, user_role)
         "needs_refresh": cambios
     }
 
+# --- BUSCADOR DE CLIENTES ---
+def _buscar_cliente(datos, df_clientes):
+    """
+    Buscador aproximado de clientes con resultados paginados.
+
+    La búsqueda corre en el servidor sobre el índice de trigramas de la hoja
+    (ver utils.busqueda) y al navegador sólo se envía la página visible.
+    Devuelve el Nº Cliente elegido o None.
+    """
+    busqueda = st.text_input(
+        "🔍 Buscar cliente",
+        placeholder="Nombre, dirección, teléfono o N° de cliente (se toleran errores de tipeo)",
+        key="buscar_cliente_gestion"
+    ).strip()
+
+    if not busqueda:
+        st.caption("Escribí parte del nombre, la dirección, el teléfono o el número del cliente.")
+        return None
+
+    # Coincidencia exacta por número primero, luego las aproximadas por similitud
+    indice_numeros = datos.indice("clientes", CLIENTES_POR_NUMERO)
+    exacta = indice_numeros.primera(busqueda)
+    posiciones = [exacta] if exacta is not None else []
+    resultados = datos.indice("clientes", BUSQUEDA_CLIENTES).buscar(busqueda, limite=MAX_RESULTADOS_CLIENTES)
+    posiciones += [posicion for posicion, _ in resultados if posicion != exacta]
+
+    if not posiciones:
+        st.warning("⚠️ No se encontraron clientes para esa búsqueda")
+        return None
+
+    # La página vuelve a la primera cada vez que cambia la búsqueda
+    pagina = paginar(
+        df_clientes.iloc[posiciones], "clientes_busqueda", CLIENTES_POR_PAGINA,
+        reiniciar_con=busqueda, etiqueta="clientes"
+    )
+    etiquetas = dict(zip(
+        pagina["Nº Cliente"],
+        pagina["Nº Cliente"].astype(str) + " - " + pagina["Nombre"].astype(str)
+        + " - " + pagina["Dirección"].astype(str)
+    ))
+
+    return st.radio(
+        "Seleccionar cliente",
+        list(etiquetas),
+        format_func=lambda nro: etiquetas.get(nro, nro),
+        key="cliente_seleccionado_gestion",
+        help="Elegí el cliente que querés editar"
+    )
+
 # --- FUNCIÓN DE EDICIÓN MEJORADA ---
-def _mostrar_edicion_cliente(df_clientes, df_reclamos, sheet_clientes):
+def _mostrar_edicion_cliente(datos, df_clientes, sheet_clientes):
     """Muestra el formulario para editar un cliente existente"""
     cambios = False
 
-    # Filtrar solo clientes con número válido
-    clientes_validos = df_clientes[
-        df_clientes["Nº Cliente"].astype(str).str.strip() != ""
-    ]
-    
-    if clientes_validos.empty:
+    if df_clientes.empty:
         st.info("📝 No hay clientes registrados para editar")
         return cambios
 
-    clientes_lista = clientes_validos["Nº Cliente"].astype(str).tolist()
-    
-    cliente_seleccionado = st.selectbox(
-        "🔍 Seleccionar cliente", 
-        clientes_lista,
-        help="Elegí el cliente que querés editar"
-    )
+    cliente_seleccionado = _buscar_cliente(datos, df_clientes)
 
     if not cliente_seleccionado:
         return cambios
 
-    # Búsqueda robusta del cliente
-    cliente_actual = df_clientes[
-        df_clientes["Nº Cliente"].astype(str).str.strip() == str(cliente_seleccionado).strip()
-    ]
+    # Filas del cliente según el índice por número (posiciones válidas para .iloc)
+    posiciones_cliente = datos.indice("clientes", CLIENTES_POR_NUMERO).posiciones(cliente_seleccionado)
     
-    if cliente_actual.empty:
+    if not posiciones_cliente:
         st.error(f"❌ No se encontró el cliente {cliente_seleccionado}")
         return cambios
 
-    cliente_actual = cliente_actual.iloc[0]
+    cliente_actual = df_clientes.iloc[posiciones_cliente[0]]
     st.info(f"📋 Editando: Cliente {cliente_seleccionado} - {cliente_actual.get('Nombre', '')}")
     
+    # Historial del cliente: sólo sus filas, ubicadas con el índice por Nº Cliente
+    df_reclamos = datos.filas(
+        "reclamos", datos.indice("reclamos", RECLAMOS_POR_CLIENTE).posiciones(cliente_seleccionado)
+    )
     _mostrar_reclamos_cliente(cliente_seleccionado, df_reclamos)
 
     # Formulario de edición con índice seguro - CORREGIDO
@@ -210,7 +253,7 @@ def _mostrar_edicion_cliente(df_clientes, df_reclamos, sheet_clientes):
             st.table(df_cambios)
             # Guardar inmediatamente al enviar el formulario
             cambios = _actualizar_cliente(
-                df_clientes[df_clientes["Nº Cliente"].astype(str) == str(cliente_seleccionado)],
+                df_clientes.iloc[list(posiciones_cliente)],
                 sheet_clientes,
                 nuevo_sector,
                 nuevo_nombre.strip(),
@@ -230,10 +273,6 @@ def _mostrar_reclamos_cliente(nro_cliente, df_reclamos):
         df_reclamos["Nº Cliente"] == nro_cliente
     ].copy()
     
-    df_reclamos_cliente["Fecha y hora"] = df_reclamos_cliente["Fecha y hora"].apply(
-        parse_fecha
-    )
-    
     df_reclamos_cliente = df_reclamos_cliente.sort_values(
         "Fecha y hora", 
         ascending=False
@@ -327,29 +366,15 @@ def _actualizar_cliente(cliente_row, sheet_clientes, nuevo_sector, nuevo_nombre,
                 {"range": f"H{index}", "values": [[format_fecha(ahora_argentina())]]}
             ]
 
-            # Ejecutar actualización por lotes con manejo de errores
-            success, error = dm_batch_update_sheet(sheet_clientes, updates)
+            # Una sola solicitud para todas las celdas (los reintentos ante cuota o
+            # errores del servidor los hace api_manager, no hace falta ir celda por celda)
+            cola = ColaEscrituras()
+            cola.agregar(sheet_clientes, updates)
+            success, error = cola.enviar()
 
             if not success:
-                # Fallback: intentar actualización individual celda por celda
-                errores = []
-                for upd in updates:
-                    try:
-                        result, err = api_manager.safe_sheet_operation(
-                            sheet_clientes.update, upd["range"], upd["values"]
-                        )
-                        if err:
-                            errores.append(f"{upd['range']}: {err}")
-                    except Exception as e:
-                        errores.append(f"{upd['range']}: {str(e)}")
-
-                if errores:
-                    st.error("❌ Error al actualizar algunas celdas:")
-                    for er in errores:
-                        st.write(f"- {er}")
-                    return False
-                else:
-                    success = True
+                st.error(f"❌ Error al actualizar el cliente: {error}")
+                return False
 
             if success:
                 st.success("✅ Cliente actualizado correctamente.")
@@ -475,10 +500,7 @@ def _guardar_nuevo_cliente(df_clientes, sheet_clientes, nuevo_nro, nuevo_sector,
                 format_fecha(ahora_argentina())
             ]
 
-            success, error = api_manager.safe_sheet_operation(
-                sheet_clientes.append_row,
-                nueva_fila
-            )
+            success, error = append_sheet_row(sheet_clientes, nueva_fila)
 
             if success:
                 st.success("✅ Nuevo cliente agregado correctamente.")
@@ -63,7 +63,7 @@ def render_metrics_dashboard(df_reclamos, is_mobile=False):
         pendientes = len(df_activos[df_activos["Estado"] == "Pendiente"])
         en_curso = len(df_activos[df_activos["Estado"] == "En curso"])
         resueltos = len(df_metricas[df_metricas["Estado"] == "Resuelto"])
-        desconexiones = df_metricas["Estado"].str.strip().str.lower().eq("desconexión").sum()
+        desconexiones = (df_metricas["Estado"] == "Desconexión").sum()
         
         # Calcular porcentajes para tendencias
         total_reclamos = len(df_metricas)
@@ -53,7 +53,7 @@ def render_notification_bell():
                             if st.button("Marcar como leída", key=key):
                                 if notif_id != "unknown":
                                     st.session_state.notification_manager.mark_as_read([int(notif_id)])
-                                    st.cache_data.clear()  # ⚠️ limpia el cache para que no vuelva a aparecer
+                                    get_cached_notifications.clear()  # ⚠️ sólo se limpia el caché de notificaciones
                                     st.experimental_rerun()
 
                     st.divider()
@@ -5,13 +5,15 @@ import pandas as pd
 import time
 from datetime import datetime, timedelta
 from utils.date_utils import ahora_argentina, format_fecha
-from utils.api_manager import api_manager
-from utils.data_manager import safe_get_sheet_data, batch_update_sheet
+from utils.api_manager import api_manager, PRIORIDAD_FONDO
+from utils.data_manager import safe_get_sheet_data, batch_update_sheet, append_sheet_row, invalidate
 from config.settings import NOTIFICATION_TYPES, COLUMNAS_NOTIFICACIONES, MAX_NOTIFICATIONS
 
 @st.cache_data(ttl=10)
 def get_cached_notifications(username, unread_only=True, limit=MAX_NOTIFICATIONS):
-    return st.session_state.notification_manager.get_for_user(username, unread_only, limit)
+    # El polling de notificaciones nunca debe demorar las escrituras del operador
+    with api_manager.prioridad(PRIORIDAD_FONDO):
+        return st.session_state.notification_manager.get_for_user(username, unread_only, limit)
 
 class NotificationManager:
     def __init__(self, sheet_notifications):
@@ -74,10 +76,7 @@ class NotificationManager:
         ]
 
         for attempt in range(self.max_retries):
-            success, error = api_manager.safe_sheet_operation(
-                self.sheet.append_row,
-                new_notification
-            )
+            success, error = append_sheet_row(self.sheet, new_notification)
             if success:
                 return True
             time.sleep(1)
@@ -180,6 +179,8 @@ class NotificationManager:
             self.sheet.batch_update,
             {'requests': updates}
         )
+        # Las filas se desplazan al borrar: la réplica debe resincronizarse completa
+        invalidate(self.sheet.title, full=True)
         return success
 
     def delete_notification_by_id(self, notif_id):
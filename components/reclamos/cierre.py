@@ -1,21 +1,25 @@
 # components/reclamos/cierre.py
 
-import time
-from datetime import datetime
 import pytz
 import pandas as pd
 import streamlit as st
 
-from utils.date_utils import format_fecha, ahora_argentina, parse_fecha
+from utils.date_utils import format_fecha, ahora_argentina
 from utils.api_manager import api_manager
-from utils.data_manager import batch_update_sheet
+from utils.data_manager import batch_update_sheet, ColaEscrituras, get_sheet_index
+from utils.indices import RECLAMOS_POR_ID, CLIENTES_POR_NUMERO
+from utils.archivo import archivar_reclamos
+from components.ui import paginar
 from config.settings import (
     SECTORES_DISPONIBLES,
     TECNICOS_DISPONIBLES,
     COLUMNAS_RECLAMOS,
+    DIAS_ARCHIVO_RECLAMOS,
     DEBUG_MODE
 )
 
+RECLAMOS_POR_PAGINA = 10
+
 # === Helpers para mapear nombre de columna -> letra de Excel ===
 def _excel_col_letter(n: int) -> str:
     letters = ""
@@ -29,11 +33,18 @@ def _col_letter(col_name: str) -> str:
     idx = COLUMNAS_RECLAMOS.index(col_name) + 1
     return _excel_col_letter(idx)
 
+def _fila_reclamo(row, sheet_reclamos):
+    """Número de fila del reclamo en la hoja según el índice por ID (o su posición si no tiene ID)"""
+    reclamo_id = str(row.get("ID Reclamo", "")).strip()
+    if not reclamo_id:
+        return row.name + 2
+    return get_sheet_index(sheet_reclamos, RECLAMOS_POR_ID).fila_hoja(reclamo_id)
+
 def mostrar_overlay_cargando(mensaje="Procesando..."):
     """Muestra un spinner simple de Streamlit"""
     return st.spinner(mensaje)
 
-def render_cierre_reclamos(df_reclamos, df_clientes, sheet_reclamos, sheet_clientes, user):
+def render_cierre_reclamos(datos, user):
     result = {
         'needs_refresh': False,
         'message': None,
@@ -52,11 +63,10 @@ def render_cierre_reclamos(df_reclamos, df_clientes, sheet_reclamos, sheet_clien
     st.subheader("✅ Cierre de reclamos en curso")
 
     try:
-        # Normalización de datos
-        df_reclamos["ID Reclamo"] = df_reclamos["ID Reclamo"].astype(str).str.strip()
-        df_reclamos["Nº Cliente"] = df_reclamos["Nº Cliente"].astype(str).str.strip()
-        df_reclamos["Técnico"] = df_reclamos["Técnico"].astype(str).fillna("")
-        df_reclamos["Fecha y hora"] = df_reclamos["Fecha y hora"].apply(parse_fecha)
+        # Sólo reclamos abiertos: el historial se carga recién al revisar el archivo
+        df_reclamos, sheet_reclamos = datos.reclamos_activos, datos.sheet_reclamos
+
+        # IDs, técnicos y fechas llegan normalizados desde el modelo de datos
 
         # Procesar cada sección
         cambios_tecnicos = _mostrar_reasignacion_tecnico(df_reclamos, sheet_reclamos)
@@ -68,7 +78,7 @@ def render_cierre_reclamos(df_reclamos, df_clientes, sheet_reclamos, sheet_clien
             })
             return result
 
-        cambios_cierre = _mostrar_reclamos_en_curso(df_reclamos, df_clientes, sheet_reclamos, sheet_clientes)
+        cambios_cierre = _mostrar_reclamos_en_curso(df_reclamos, datos, sheet_reclamos)
         if cambios_cierre:
             result.update({
                 'needs_refresh': True,
@@ -77,11 +87,11 @@ def render_cierre_reclamos(df_reclamos, df_clientes, sheet_reclamos, sheet_clien
             })
             return result
 
-        cambios_limpieza = _mostrar_limpieza_reclamos(df_reclamos, sheet_reclamos)
+        cambios_limpieza = _mostrar_limpieza_reclamos(datos, sheet_reclamos)
         if cambios_limpieza:
             result.update({
                 'needs_refresh': True,
-                'message': 'Reclamos antiguos eliminados',
+                'message': 'Reclamos antiguos archivados',
                 'data_updated': True
             })
             return result
@@ -129,7 +139,10 @@ def _mostrar_reasignacion_tecnico(df_reclamos, sheet_reclamos):
     if st.button("💾 Guardar nuevo técnico", key="guardar_tecnico"):
         with st.spinner("Actualizando técnico..."):
             try:
-                fila_index = reclamo.name + 2
+                fila_index = _fila_reclamo(reclamo, sheet_reclamos)
+                if fila_index is None:
+                    st.error("❌ No se encontró el reclamo en la hoja.")
+                    return False
                 nuevo_tecnico = ", ".join(nuevo_tecnico_multiselect).upper()
 
                 col_tecnico = _col_letter("Técnico")
@@ -168,7 +181,7 @@ def _mostrar_reasignacion_tecnico(df_reclamos, sheet_reclamos):
 
     return False
 
-def _mostrar_reclamos_en_curso(df_reclamos, df_clientes, sheet_reclamos, sheet_clientes):
+def _mostrar_reclamos_en_curso(df_reclamos, datos, sheet_reclamos):
     en_curso = df_reclamos[df_reclamos["Estado"] == "En curso"].copy()
     
     filtro_sector = st.selectbox(
@@ -188,6 +201,9 @@ def _mostrar_reclamos_en_curso(df_reclamos, df_clientes, sheet_reclamos, sheet_c
             st.session_state.filtro_tecnicos_persistente = []
         return False
 
+    # Los clientes sólo se leen si hay reclamos en curso para cerrar
+    df_clientes, sheet_clientes = datos.clientes, datos.sheet_clientes
+
     # Filtro por técnicos
     tecnicos_unicos = sorted(set(
         tecnico.strip().upper()
@@ -250,11 +266,23 @@ def _mostrar_reclamos_en_curso(df_reclamos, df_clientes, sheet_reclamos, sheet_c
                     "Sector": st.column_config.TextColumn("Sector", help="Número de sector asignado")
                 })
 
-    st.markdown("### ✏️ Acciones por reclamo:")
-    
     cambios = False
+    indice_clientes = datos.indice("clientes", CLIENTES_POR_NUMERO)
+
+    if _mostrar_cierre_masivo(en_curso, df_clientes, indice_clientes, sheet_reclamos, sheet_clientes):
+        st.session_state.filtro_tecnicos_persistente = tecnicos_seleccionados
+        st.session_state.force_refresh = True
+        st.rerun()
+
+    st.markdown("### ✏️ Acciones por reclamo:")
     
-    for i, row in en_curso.iterrows():
+    # Sólo se dibujan los formularios de la página visible (keys por ID de reclamo)
+    pagina = paginar(
+        en_curso, "reclamos_en_curso", RECLAMOS_POR_PAGINA,
+        reiniciar_con=(filtro_sector, tuple(tecnicos_seleccionados)), etiqueta="reclamos"
+    )
+    for _, row in pagina.iterrows():
+        reclamo_key = row["ID Reclamo"] or row.name
         with st.container():
             col1, col2, col3 = st.columns([3, 1, 1])
 
@@ -266,24 +294,24 @@ def _mostrar_reclamos_en_curso(df_reclamos, df_clientes, sheet_reclamos, sheet_c
                 st.markdown(f"📌 {row['Tipo de reclamo']}")
                 st.markdown(f"👷 {row['Técnico']}")
 
-                cliente_id = str(row["Nº Cliente"]).strip()
-                cliente_info = df_clientes[df_clientes["Nº Cliente"] == cliente_id]
+                posicion_cliente = indice_clientes.primera(row["Nº Cliente"])
+                cliente_info = df_clientes.iloc[[posicion_cliente]] if posicion_cliente is not None else df_clientes.iloc[[]]
                 precinto_actual = cliente_info["N° de Precinto"].values[0] if not cliente_info.empty else ""
 
-                nuevo_precinto = st.text_input("🔒 Precinto", value=precinto_actual, key=f"precinto_{i}")
+                nuevo_precinto = st.text_input("🔒 Precinto", value=precinto_actual, key=f"precinto_{reclamo_key}")
                 
                 # CAMPO DE ANOTACIONES AÑADIDO
                 anotaciones_actuales = row.get("Anotaciones", "")
                 anotaciones = st.text_area(
                     "📝 Anotaciones (opcional)", 
                     value=anotaciones_actuales,
-                    key=f"anotaciones_{i}",
+                    key=f"anotaciones_{reclamo_key}",
                     help="Información adicional sobre el trabajo realizado o observaciones del cliente",
                     height=80
                 )
 
             with col2:
-                if st.button("✅ Resuelto", key=f"resolver_{row['ID Reclamo']}", use_container_width=True):
+                if st.button("✅ Resuelto", key=f"resolver_{reclamo_key}", use_container_width=True):
                     if _cerrar_reclamo(row, nuevo_precinto, precinto_actual, cliente_info, sheet_reclamos, sheet_clientes, anotaciones):
                         # Guardar el filtro actual antes del rerun
                         st.session_state.filtro_tecnicos_persistente = tecnicos_seleccionados
@@ -291,7 +319,7 @@ def _mostrar_reclamos_en_curso(df_reclamos, df_clientes, sheet_reclamos, sheet_c
                         st.rerun()
 
             with col3:
-                if st.button("↩️ Pendiente", key=f"volver_{row['ID Reclamo']}", use_container_width=True):
+                if st.button("↩️ Pendiente", key=f"volver_{reclamo_key}", use_container_width=True):
                     if _volver_a_pendiente(row, sheet_reclamos):
                         # Guardar el filtro actual antes del rerun
                         st.session_state.filtro_tecnicos_persistente = tecnicos_seleccionados
@@ -302,60 +330,187 @@ def _mostrar_reclamos_en_curso(df_reclamos, df_clientes, sheet_reclamos, sheet_c
     
     return cambios
 
+def _updates_cierre(fila_index, nuevo_precinto, precinto_actual, cliente_info, anotaciones, fecha_resolucion):
+    """Actualizaciones (reclamo, cliente) para cerrar un reclamo como resuelto"""
+    col_estado           = _col_letter("Estado")
+    col_fecha_formateada = _col_letter("Fecha_formateada")
+    col_precinto         = _col_letter("N° de Precinto")
+    col_anotaciones      = _col_letter("Anotaciones")  # Columna para anotaciones
+
+    updates = [
+        {"range": f"{col_estado}{fila_index}", "values": [["Resuelto"]]},
+        {"range": f"{col_fecha_formateada}{fila_index}", "values": [[fecha_resolucion]]},
+        {"range": f"{col_anotaciones}{fila_index}", "values": [[anotaciones]]},  # Guardar anotaciones
+    ]
+
+    cambia_precinto = bool(nuevo_precinto.strip()) and nuevo_precinto != precinto_actual
+    if cambia_precinto:
+        updates.append({"range": f"{col_precinto}{fila_index}", "values": [[nuevo_precinto.strip()]]})
+
+    updates_cliente = []
+    if not cliente_info.empty:
+        idx_cliente = cliente_info.index[0] + 2
+        if cambia_precinto:
+            updates_cliente.append({"range": f"F{idx_cliente}", "values": [[nuevo_precinto.strip()]]})
+        # Actualizar anotaciones en cliente si se proporcionaron (Columna I)
+        if anotaciones.strip():
+            updates_cliente.append({"range": f"I{idx_cliente}", "values": [[anotaciones]]})
+
+    return updates, updates_cliente
+
+def _updates_pendiente(fila_index):
+    """Actualizaciones para devolver un reclamo a pendiente (sin técnico ni fecha de cierre)"""
+    col_estado           = _col_letter("Estado")
+    col_tecnico          = _col_letter("Técnico")
+    col_fecha_formateada = _col_letter("Fecha_formateada")
+
+    return [
+        {"range": f"{col_estado}{fila_index}", "values": [["Pendiente"]]},
+        {"range": f"{col_tecnico}{fila_index}", "values": [[""]]},
+        {"range": f"{col_fecha_formateada}{fila_index}", "values": [[""]]},
+    ]
+
+def _mostrar_cierre_masivo(en_curso, df_clientes, indice_clientes, sheet_reclamos, sheet_clientes):
+    """
+    Cierra o devuelve a pendiente varios reclamos a la vez.
+
+    Todos los cambios (reclamos y clientes) viajan en una sola solicitud y la
+    página se refresca una sola vez. El resumen por reclamo se guarda en
+    session_state para mostrarlo después del rerun.
+    """
+    resumen = st.session_state.pop("resumen_cierre_masivo", None)
+
+    with st.expander("📦 Cierre masivo", expanded=resumen is not None):
+        if resumen is not None:
+            exitos = sum(1 for r in resumen if r["Resultado"].startswith("✅"))
+            if exitos == len(resumen):
+                st.success(f"✅ {exitos} reclamo(s) actualizados correctamente.")
+            else:
+                st.warning(f"⚠️ {exitos} de {len(resumen)} reclamo(s) actualizados.")
+            st.dataframe(pd.DataFrame(resumen), use_container_width=True, hide_index=True)
+
+        # Precinto actual de cada cliente, leído por índice
+        posiciones = [indice_clientes.primera(n) for n in en_curso["Nº Cliente"]]
+        precintos = df_clientes["N° de Precinto"].fillna("").astype(str).tolist() if "N° de Precinto" in df_clientes.columns else []
+        tabla = pd.DataFrame({
+            "Seleccionar": False,
+            "ID Reclamo": en_curso["ID Reclamo"].astype(str).to_numpy(),
+            "Nº Cliente": en_curso["Nº Cliente"].to_numpy(),
+            "Nombre": en_curso["Nombre"].fillna("").astype(str).to_numpy(),
+            "Técnico": en_curso["Técnico"].astype(str).to_numpy(),
+            "Precinto": [precintos[p] if p is not None and precintos else "" for p in posiciones],
+            "Anotaciones": en_curso["Anotaciones"].fillna("").astype(str).to_numpy()
+                           if "Anotaciones" in en_curso.columns else "",
+        })
+
+        with st.form("form_cierre_masivo"):
+            editada = st.data_editor(
+                tabla,
+                hide_index=True,
+                use_container_width=True,
+                disabled=["ID Reclamo", "Nº Cliente", "Nombre", "Técnico"],
+                column_config={
+                    "Seleccionar": st.column_config.CheckboxColumn("✔", help="Incluir en la acción"),
+                    "Precinto": st.column_config.TextColumn("🔒 Precinto"),
+                    "Anotaciones": st.column_config.TextColumn("📝 Anotaciones"),
+                },
+                # La tabla cambia con los filtros: una key por conjunto de reclamos
+                key=f"editor_cierre_masivo_{abs(hash(tuple(tabla['ID Reclamo'])))}",
+            )
+            accion = st.radio(
+                "Acción",
+                ["✅ Cerrar como resueltos", "↩️ Volver a pendiente"],
+                horizontal=True,
+                key="accion_cierre_masivo"
+            )
+            aplicar = st.form_submit_button("💾 Aplicar a los seleccionados", use_container_width=True)
+
+        if not aplicar:
+            return False
+
+        seleccion = editada.index[editada["Seleccionar"]].tolist()
+        if not seleccion:
+            st.warning("⚠️ Seleccioná al menos un reclamo.")
+            return False
+
+        with st.spinner(f"Actualizando {len(seleccion)} reclamo(s)..."):
+            resumen = _aplicar_cierre_masivo(
+                en_curso, editada, seleccion, posiciones, precintos, df_clientes,
+                accion.endswith("resueltos"), sheet_reclamos, sheet_clientes
+            )
+
+        st.session_state["resumen_cierre_masivo"] = resumen
+        if not any(r["Resultado"].startswith("✅") for r in resumen):
+            # Nada cambió: se muestra el resumen sin refrescar los datos
+            st.rerun()
+        return True
+
+def _aplicar_cierre_masivo(en_curso, editada, seleccion, posiciones, precintos, df_clientes,
+                           cerrar, sheet_reclamos, sheet_clientes):
+    """Encola los cambios de todos los reclamos seleccionados y los envía juntos. Devuelve el resumen por reclamo"""
+    fecha_resolucion = ahora_argentina().strftime('%d/%m/%Y %H:%M')
+    cola = ColaEscrituras()
+    resumen, encolados = [], []
+
+    for i in seleccion:
+        row = en_curso.iloc[i]
+        fila = {"ID Reclamo": row["ID Reclamo"], "Nº Cliente": row["Nº Cliente"], "Nombre": row["Nombre"]}
+        resumen.append(fila)
+        try:
+            fila_index = _fila_reclamo(row, sheet_reclamos)
+            if fila_index is None:
+                fila["Resultado"] = "❌ No se encontró el reclamo en la hoja"
+                continue
+
+            if cerrar:
+                posicion = posiciones[i]
+                cliente_info = df_clientes.iloc[[posicion]] if posicion is not None else df_clientes.iloc[[]]
+                precinto_actual = precintos[posicion] if posicion is not None and precintos else ""
+                updates, updates_cliente = _updates_cierre(
+                    fila_index, str(editada.at[i, "Precinto"] or ""), precinto_actual,
+                    cliente_info, str(editada.at[i, "Anotaciones"] or ""), fecha_resolucion
+                )
+                cola.agregar(sheet_reclamos, updates)
+                cola.agregar(sheet_clientes, updates_cliente)
+            else:
+                cola.agregar(sheet_reclamos, _updates_pendiente(fila_index))
+            encolados.append(fila)
+        except Exception as e:
+            fila["Resultado"] = f"❌ {str(e)}"
+            if DEBUG_MODE:
+                st.exception(e)
+
+    if encolados:
+        success, error = cola.enviar()
+        for fila in encolados:
+            if success:
+                fila["Resultado"] = "✅ Cerrado" if cerrar else "✅ Vuelto a pendiente"
+            else:
+                fila["Resultado"] = f"❌ Error al actualizar: {error}"
+
+    return resumen
+
 def _cerrar_reclamo(row, nuevo_precinto, precinto_actual, cliente_info, sheet_reclamos, sheet_clientes, anotaciones):
     try:
         with st.spinner("Cerrando reclamo..."):
-            time.sleep(1)
-            fila_index = row.name + 2
-
-            col_estado           = _col_letter("Estado")
-            col_fecha_formateada = _col_letter("Fecha_formateada")
-            col_precinto         = _col_letter("N° de Precinto")
-            col_anotaciones      = _col_letter("Anotaciones")  # Columna para anotaciones
+            fila_index = _fila_reclamo(row, sheet_reclamos)
+            if fila_index is None:
+                st.error("❌ No se encontró el reclamo en la hoja.")
+                return False
 
             fecha_resolucion = ahora_argentina().strftime('%d/%m/%Y %H:%M')
+            updates, updates_cliente = _updates_cierre(
+                fila_index, nuevo_precinto, precinto_actual, cliente_info, anotaciones, fecha_resolucion
+            )
 
-            updates = [
-                {"range": f"{col_estado}{fila_index}", "values": [["Resuelto"]]},
-                {"range": f"{col_fecha_formateada}{fila_index}", "values": [[fecha_resolucion]]},
-                {"range": f"{col_anotaciones}{fila_index}", "values": [[anotaciones]]},  # Guardar anotaciones
-            ]
-
-            if nuevo_precinto.strip() and nuevo_precinto != precinto_actual:
-                updates.append({"range": f"{col_precinto}{fila_index}", "values": [[nuevo_precinto.strip()]]})
+            # Reclamo, precinto y anotaciones del cliente viajan en una sola solicitud
+            cola = ColaEscrituras()
+            cola.agregar(sheet_reclamos, updates)
+            cola.agregar(sheet_clientes, updates_cliente)
 
-            success, error = api_manager.safe_sheet_operation(
-                batch_update_sheet,
-                sheet_reclamos,
-                updates,
-                is_batch=True
-            )
+            success, error = cola.enviar()
             
             if success:
-                if nuevo_precinto.strip() and nuevo_precinto != precinto_actual and not cliente_info.empty:
-                    index_cliente_en_clientes = cliente_info.index[0] + 2
-                    success_precinto, error_precinto = api_manager.safe_sheet_operation(
-                        sheet_clientes.update,
-                        f"F{index_cliente_en_clientes}",
-                        [[nuevo_precinto.strip()]]
-                    )
-                    if not success_precinto:
-                        st.warning(f"⚠️ Precinto guardado en reclamo pero no en hoja de clientes: {error_precinto}")
-
-                # Actualizar anotaciones en cliente si se proporcionaron (Columna I)
-                if anotaciones.strip():
-                    if not cliente_info.empty:
-                        idx_cliente = cliente_info.index[0] + 2
-                        updates_cliente = [
-                            {
-                                "range": "I" + str(idx_cliente),  # Columna I: Anotaciones
-                                "values": [[anotaciones]],
-                            }
-                        ]
-                        api_manager.safe_sheet_operation(
-                            batch_update_sheet, sheet_clientes, updates_cliente, is_batch=True
-                        )
-                
                 st.success(f"🟢 Reclamo de {row['Nombre']} cerrado correctamente. Fecha cierre: {fecha_resolucion}")
                 return True
             else:
@@ -372,18 +527,12 @@ def _cerrar_reclamo(row, nuevo_precinto, precinto_actual, cliente_info, sheet_re
 def _volver_a_pendiente(row, sheet_reclamos):
     try:
         with st.spinner("Cambiando estado..."):
-            time.sleep(1)
-            fila_index = row.name + 2
-
-            col_estado           = _col_letter("Estado")
-            col_tecnico          = _col_letter("Técnico")
-            col_fecha_formateada = _col_letter("Fecha_formateada")
+            fila_index = _fila_reclamo(row, sheet_reclamos)
+            if fila_index is None:
+                st.error("❌ No se encontró el reclamo en la hoja.")
+                return False
 
-            updates = [
-                {"range": f"{col_estado}{fila_index}", "values": [["Pendiente"]]},
-                {"range": f"{col_tecnico}{fila_index}", "values": [[""]]},
-                {"range": f"{col_fecha_formateada}{fila_index}", "values": [[""]]},
-            ]
+            updates = _updates_pendiente(fila_index)
 
             success, error = api_manager.safe_sheet_operation(
                 batch_update_sheet,
@@ -406,51 +555,44 @@ def _volver_a_pendiente(row, sheet_reclamos):
 
     return False
 
-def _mostrar_limpieza_reclamos(df_reclamos, sheet_reclamos):
+def _mostrar_limpieza_reclamos(datos, sheet_reclamos):
     st.markdown("---")
-    st.markdown("### 🗑️ Limpieza de reclamos antiguos")
+    st.markdown("### 🗄️ Archivo de reclamos antiguos")
+
+    # El historial es la parte grande de la hoja: se carga sólo si se pide
+    if not st.checkbox("🔍 Revisar reclamos resueltos para archivar", key="revisar_archivo"):
+        return False
 
     # FILTRAR SOLO RECLAMOS RESUELTOS (CONDICIÓN ABSOLUTA)
+    df_reclamos = datos.reclamos_cerrados
     df_resueltos = df_reclamos[df_reclamos["Estado"] == "Resuelto"].copy()
     
     if df_resueltos.empty:
         st.info("No hay reclamos resueltos para analizar.")
         return False
     
-    # CÁLCULO SIMPLIFICADO DE FECHAS - SIN ZONAS HORARIAS
+    # La fecha de cierre llega parseada en "Fecha_formateada_dt" (zona horaria Argentina)
     try:
-        # Convertir fechas a datetime (sin zona horaria)
-        df_resueltos["Fecha_formateada_dt"] = pd.to_datetime(
-            df_resueltos["Fecha_formateada"], 
-            format='%d/%m/%Y %H:%M', 
-            errors='coerce'
-        )
-        
         # Filtrar solo fechas válidas
         df_resueltos = df_resueltos.dropna(subset=["Fecha_formateada_dt"])
         
-        # Calcular días desde la resolución (usando fecha actual sin zona horaria)
-        fecha_actual = datetime.now()
+        # Calcular días desde la resolución
+        fecha_actual = ahora_argentina()
         df_resueltos["Dias_resuelto"] = (fecha_actual - df_resueltos["Fecha_formateada_dt"]).dt.days
         
-        # FILTRAR POR MÁS DE 30 DÍAS
-        df_antiguos = df_resueltos[df_resueltos["Dias_resuelto"] > 30]
+        # FILTRAR POR ANTIGÜEDAD
+        df_antiguos = df_resueltos[df_resueltos["Dias_resuelto"] > DIAS_ARCHIVO_RECLAMOS]
 
-        st.markdown(f"📅 **Reclamos resueltos con más de 30 días:** {len(df_antiguos)}")
+        st.markdown(f"📅 **Reclamos resueltos con más de {DIAS_ARCHIVO_RECLAMOS} días:** {len(df_antiguos)}")
+        st.caption("Se copian a la hoja de archivo, se suman al resumen mensual y se quitan de la hoja de reclamos.")
 
         if len(df_antiguos) > 0:
             if st.button("🔍 Ver reclamos antiguos", key="ver_antiguos"):
                 st.dataframe(df_antiguos[["Fecha_formateada", "Nº Cliente", "Nombre", "Sector", "Tipo de reclamo", "Dias_resuelto"]])
             
-            if st.button("🗑️ Eliminar reclamos antiguos", key="eliminar_antiguos"):
-                with st.spinner("Eliminando reclamos antiguos..."):
-                    try:
-                        resultado = _eliminar_reclamos_antiguos(df_antiguos, sheet_reclamos)
-                        return resultado
-                    except Exception as e:
-                        st.error(f"❌ Error al eliminar reclamos: {str(e)}")
-                        if DEBUG_MODE:
-                            st.exception(e)
+            if st.button("🗄️ Archivar reclamos antiguos", key="archivar_antiguos"):
+                with st.spinner("Archivando reclamos antiguos..."):
+                    return _archivar_reclamos_antiguos(df_antiguos, sheet_reclamos)
         
         return False
         
@@ -460,36 +602,18 @@ def _mostrar_limpieza_reclamos(df_reclamos, sheet_reclamos):
             st.exception(e)
         return False
 
-def _eliminar_reclamos_antiguos(df_antiguos, sheet_reclamos):
-    """Elimina reclamos antiguos de la hoja de cálculo"""
+def _archivar_reclamos_antiguos(df_antiguos, sheet_reclamos):
+    """Archiva los reclamos antiguos y los quita de la hoja de reclamos"""
     try:
-        # Ordenar por índice descendente para eliminar de abajo hacia arriba
-        df_antiguos = df_antiguos.sort_index(ascending=False)
-        
-        requests = []
-        sheet_id = sheet_reclamos.id
-        
-        for index in df_antiguos.index:
-            row_index_api = index + 2  # +1 para encabezado, +1 porque gspread es 1-indexed
-            requests.append({
-                "deleteDimension": {
-                    "range": {
-                        "sheetId": sheet_id,
-                        "dimension": "ROWS",
-                        "startIndex": row_index_api - 1,  # Ajustar para API de Google
-                        "endIndex": row_index_api
-                    }
-                }
-            })
-        
-        if requests:
-            sheet_reclamos.spreadsheet.batch_update({"requests": requests})
-            st.success(f"🎉 ¡Éxito! Se eliminaron {len(df_antiguos)} reclamos antiguos resueltos (más de 30 días).")
-            return True
-            
+        archivados, error = archivar_reclamos(sheet_reclamos, df_antiguos)
+        if archivados:
+            st.success(f"🎉 ¡Éxito! Se archivaron {archivados} reclamos resueltos hace más de {DIAS_ARCHIVO_RECLAMOS} días.")
+        if error:
+            st.error(f"❌ Error al archivar reclamos: {error}")
+        return archivados > 0
     except Exception as e:
-        st.error(f"❌ Error al eliminar reclamos: {str(e)}")
+        st.error(f"❌ Error al archivar reclamos: {str(e)}")
         if DEBUG_MODE:
             st.exception(e)
     
-    return False
\ No newline at end of file
+    return False
@@ -6,22 +6,30 @@ import unidecode  # al inicio del archivo
 from datetime import datetime
 from utils.date_utils import format_fecha, parse_fecha
 from utils.api_manager import api_manager
-from utils.data_manager import batch_update_sheet as dm_batch_update_sheet
+from utils.data_manager import batch_update_sheet as dm_batch_update_sheet, get_sheet_index
+from utils.indices import RECLAMOS_POR_ID
+from utils.busqueda import BUSQUEDA_RECLAMOS
+from components.ui import paginar
 from config.settings import SECTORES_DISPONIBLES, DEBUG_MODE, TECNICOS_DISPONIBLES
 
-def render_gestion_reclamos(df_reclamos, df_clientes, sheet_reclamos, user):
+# Resultados del buscador del editor que se envían al navegador
+MAX_RESULTADOS_BUSQUEDA = 20
+DESCONEXIONES_POR_PAGINA = 10
+
+def render_gestion_reclamos(datos, user):
     """
     Dashboard de gestión de reclamos con contadores, dataframe compacto y editor.
     """
     st.subheader("📊 Dashboard de Gestión de Reclamos")
     
     try:
+        df_reclamos, sheet_reclamos = datos.reclamos, datos.sheet_reclamos
         if df_reclamos.empty:
             st.info("No hay reclamos para mostrar.")
             return
 
         # Prepara los datos
-        df_preparado = _preparar_datos(df_reclamos, df_clientes)
+        df_preparado = _preparar_datos(df_reclamos, datos.clientes)
         
         # 1. Mostrar contadores por tipo de reclamo
         _mostrar_contadores_reclamos(df_preparado)
@@ -34,7 +42,7 @@ def render_gestion_reclamos(df_reclamos, df_clientes, sheet_reclamos, user):
         # 3. Buscador y editor de reclamos (USANDO EL EDITOR MEJORADO)
         st.markdown("---")
         st.subheader("🔍 Buscar y Editar Reclamo")
-        cambios_edicion = _mostrar_edicion_reclamo_mejorado(df_filtrado, sheet_reclamos, user)
+        cambios_edicion = _mostrar_edicion_reclamo_mejorado(df_filtrado, datos, user)
         
         if cambios_edicion:
             st.success("✅ Reclamo actualizado correctamente.")
@@ -53,13 +61,9 @@ def render_gestion_reclamos(df_reclamos, df_clientes, sheet_reclamos, user):
 
 def _preparar_datos(df_reclamos, df_clientes):
     """Prepara y limpia los datos para su visualización."""
-    df = df_reclamos.copy()
-    df_clientes_norm = df_clientes.copy()
-
-    # Normalización de columnas clave para el merge
-    df_clientes_norm["Nº Cliente"] = df_clientes_norm["Nº Cliente"].astype(str).str.strip()
-    df["Nº Cliente"] = df["Nº Cliente"].astype(str).str.strip()
-    df["ID Reclamo"] = df["ID Reclamo"].astype(str).str.strip()
+    # Reclamos y clientes llegan normalizados (Nº Cliente sin espacios, fechas parseadas)
+    df = df_reclamos
+    df_clientes_norm = df_clientes
 
     # Verificar si la columna Teléfono ya existe en df_reclamos
     if "Teléfono" not in df.columns:
@@ -73,9 +77,7 @@ def _preparar_datos(df_reclamos, df_clientes):
         df["Teléfono"] = df["Teléfono"].fillna(df["Teléfono_cliente"])
         df = df.drop(columns=["Teléfono_cliente"])
 
-    # Manejo de fechas
-    df["Fecha y hora"] = pd.to_datetime(df["Fecha y hora"], errors='coerce')
-    df.sort_values("Fecha y hora", ascending=False, inplace=True)
+    df = df.sort_values("Fecha y hora", ascending=False)
 
     return df
 
@@ -85,7 +87,7 @@ def _mostrar_contadores_reclamos(df):
     df_activos = df[df["Estado"].isin(["Pendiente", "En curso"])]
     
     # Obtener tipos de reclamo que tienen al menos un reclamo activo
-    tipos_con_reclamos = df_activos["Tipo de reclamo"].value_counts()
+    tipos_con_reclamos = df_activos["Tipo de reclamo"].value_counts().loc[lambda c: c > 0]
     tipos_reclamo = tipos_con_reclamos.index.tolist()
     
     if len(tipos_reclamo) == 0:
@@ -180,40 +182,50 @@ def _mostrar_filtros_y_dataframe(df):
     return df_filtrado
 
 # --- EDITOR MEJORADO (REEMPLAZANDO EL ANTERIOR) ---
-def _mostrar_edicion_reclamo_mejorado(df, sheet_reclamos, user):
+def _mostrar_edicion_reclamo_mejorado(df, datos, user):
     """Muestra la interfaz para editar reclamos (versión mejorada de gestion2.py)"""
     st.markdown("### ✏️ Editar un reclamo puntual")
+    df_reclamos, sheet_reclamos = datos.reclamos, datos.sheet_reclamos
     
-    # Crear selector mejorado (sin UUID visible)
-    df["selector"] = df.apply(
-        lambda x: f"{x['Nº Cliente']} - {x['Nombre']} ({x['Estado']})", 
-        axis=1
-    )
+    # Búsqueda por número de cliente, nombre, dirección o teléfono (sin importar acentos)
+    busqueda = st.text_input("🔍 Buscar por número de cliente, nombre, dirección o teléfono")
     
-    # Añadir búsqueda por número de cliente o nombre
-    busqueda = st.text_input("🔍 Buscar por número de cliente o nombre")
-    
-    # Filtrar opciones basadas en la búsqueda
-    opciones_filtradas = [""] + df["selector"].tolist()
     if busqueda:
-        opciones_filtradas = [""] + [
-            opc for opc in df["selector"].tolist() 
-            if busqueda.lower() in opc.lower()
-        ]
+        # El índice se arma una vez por versión de la hoja y busca en todos los reclamos
+        indice = datos.indice("reclamos", BUSQUEDA_RECLAMOS)
+        resultados = indice.buscar(busqueda, limite=MAX_RESULTADOS_BUSQUEDA)
+        candidatos = df_reclamos.iloc[[posicion for posicion, _ in resultados]]
+    else:
+        # Sin búsqueda se ofrecen los reclamos de la lista filtrada
+        candidatos = df
+    candidatos = candidatos[candidatos["ID Reclamo"] != ""]
+
+    # Cada opción es el ID del reclamo; la etiqueta no muestra el UUID
+    etiquetas = dict(zip(
+        candidatos["ID Reclamo"],
+        candidatos["Nº Cliente"].astype(str) + " - " + candidatos["Nombre"].astype(str)
+        + " (" + candidatos["Estado"].astype(str) + ")"
+    ))
+    if busqueda and not etiquetas:
+        st.info("No se encontraron reclamos para esa búsqueda.")
     
     seleccion = st.selectbox(
         "Seleccioná un reclamo para editar", 
-        opciones_filtradas,
+        [""] + list(etiquetas),
+        format_func=lambda reclamo_id: etiquetas.get(reclamo_id, ""),
         index=0
     )
 
     if not seleccion:
         return False
 
-    # Obtener el ID del reclamo
-    numero_cliente = seleccion.split(" - ")[0]
-    reclamo_actual = df[df["Nº Cliente"] == numero_cliente].iloc[0]
-    reclamo_id = reclamo_actual["ID Reclamo"]
+    # Obtener el reclamo exacto por su ID
+    posicion = datos.indice("reclamos", RECLAMOS_POR_ID).primera(seleccion)
+    if posicion is None:
+        st.warning("⚠️ El reclamo seleccionado ya no está disponible.")
+        return False
+    reclamo_actual = df_reclamos.iloc[posicion]
+    reclamo_id = seleccion
 
     # Mostrar información del reclamo
     with st.expander("📄 Información del reclamo", expanded=True):
@@ -339,46 +351,15 @@ def _actualizar_reclamo_mejorado(df, sheet_reclamos, reclamo_id, updates, full_u
             # Normalizar reclamo_id a string sin espacios
             reclamo_id_str = str(reclamo_id).strip()
 
-            # Buscar la fila del reclamo en varias columnas posibles (tolerante a nombres distintos)
-            df_ids = df.copy()
-            # Asegurarnos de que las columnas que vamos a buscar existan
-            posible_cols = [col for col in ["ID Reclamo", "ID", "Id", "id_reclamo"] if col in df_ids.columns]
-            filas_encontradas = pd.Index([])
-
-            for col in posible_cols:
-                try:
-                    matches = df_ids[df_ids[col].astype(str).str.strip() == reclamo_id_str].index
-                    if not matches.empty:
-                        filas_encontradas = matches
-                        break
-                except Exception:
-                    continue
-
-            # Si no lo encontró exacto, intentar búsqueda parcial (por si el id fue cortado o tiene prefijo)
-            if filas_encontradas.empty:
-                for col in posible_cols:
-                    try:
-                        matches = df_ids[df_ids[col].astype(str).str.strip().str.contains(reclamo_id_str, na=False)].index
-                        if not matches.empty:
-                            filas_encontradas = matches
-                            break
-                    except Exception:
-                        continue
-
-            if filas_encontradas.empty:
-                st.error(f"❌ No se encontró el reclamo con ID '{reclamo_id_str}' en el DataFrame (busqué en {posible_cols}).")
-                if DEBUG_MODE:
-                    st.info(f"Columnas disponibles: {list(df.columns)}")
-                return False
+            # Ubicar la fila en la hoja con el índice por ID (sin recorrer el DataFrame)
+            indice_ids = get_sheet_index(sheet_reclamos, RECLAMOS_POR_ID)
+            fila = indice_ids.fila_hoja(reclamo_id_str)
 
-            fila = int(filas_encontradas[0]) + 2  # +2 para mapear al índice de Google Sheets (cabecera)
+            if fila is None:
+                st.error(f"❌ No se encontró el reclamo con ID '{reclamo_id_str}' en la hoja.")
+                return False
 
             updates_list = []
-            # Guardar estado anterior para debug
-            try:
-                estado_anterior = df.loc[filas_encontradas[0], "Estado"]
-            except Exception:
-                estado_anterior = None
 
             # Si es full_update, mapear todos los campos que correspondan
             if full_update:
@@ -427,17 +408,12 @@ def _actualizar_reclamo_mejorado(df, sheet_reclamos, reclamo_id, updates, full_u
             )
 
             if success:
-                # Limpiar cache para que una nueva carga traiga los datos actualizados
-                try:
-                    st.cache_data.clear()
-                except Exception:
-                    pass
-
+                # batch_update_sheet ya refleja la fila en la réplica: no hace falta limpiar cachés
                 st.success("✅ Reclamo actualizado correctamente.")
                 # DEBUG: mostrar qué se envió
                 if DEBUG_MODE:
-                    st.info(f"Fila actualizada: {fila}")
-                    st.json({"updates_sent": updates_list, "estado_anterior": estado_anterior})
+                    st.info(f"Fila actualizada: {fila} (versión de la hoja {indice_ids.version})")
+                    st.json({"updates_sent": updates_list})
                 return True
             else:
                 st.error(f"❌ Error al actualizar en Google Sheets: {error}")
@@ -458,12 +434,10 @@ def _gestionar_desconexiones(df, sheet_reclamos, user):
     st.markdown("---")
     st.markdown("### 🔌 Desconexiones a Pedido Pendientes")
 
-    # Filtrar solo las desconexiones con estado "Desconexión"
-    import unidecode  # al inicio del archivo
-
+    # Filtrar solo las desconexiones con estado "Desconexión" (categóricas canónicas)
     desconexiones = df[
-        (df["Tipo de reclamo"].apply(lambda x: unidecode.unidecode(str(x)).strip().lower()) == "desconexion a pedido") &
-        (df["Estado"].apply(lambda x: unidecode.unidecode(str(x)).strip().lower()) == "desconexion")
+        (df["Tipo de reclamo"] == "Desconexion a Pedido") &
+        (df["Estado"] == "Desconexión")
     ]
 
     if desconexiones.empty:
@@ -474,7 +448,8 @@ def _gestionar_desconexiones(df, sheet_reclamos, user):
 
     cambios = False
 
-    for i, row in desconexiones.iterrows():
+    pagina = paginar(desconexiones, "desconexiones", DESCONEXIONES_POR_PAGINA, etiqueta="desconexiones")
+    for i, row in pagina.iterrows():
         with st.container(border=True):
             col1, col2 = st.columns([4, 1])
 
@@ -485,7 +460,7 @@ def _gestionar_desconexiones(df, sheet_reclamos, user):
                 st.markdown(f"🆔 ID: `{row.get('ID Reclamo', row.name)}`")
 
             with col2:
-                if st.button("✅ Marcar como resuelto", key=f"resuelto_{i}", use_container_width=True):
+                if st.button("✅ Marcar como resuelto", key=f"resuelto_{row.get('ID Reclamo') or i}", use_container_width=True):
                     if _marcar_desconexion_como_resuelta(row, sheet_reclamos):
                         cambios = True
                         st.rerun()
@@ -506,21 +481,12 @@ def _marcar_desconexion_como_resuelta(row, sheet_reclamos):
                 st.error("⚠️ No se encontró el ID del reclamo para actualizar.")
                 return False
 
-            # Buscar la fila correspondiente en la hoja
-            df_sheet = sheet_reclamos.get_all_records()
-            df_aux = pd.DataFrame(df_sheet)
-
-            if "ID Reclamo" not in df_aux.columns:
-                st.error("❌ No se encontró la columna 'ID Reclamo' en la hoja.")
-                return False
-
-            match = df_aux[df_aux["ID Reclamo"].astype(str).str.strip() == reclamo_id]
-            if match.empty:
+            # Buscar la fila correspondiente en la hoja (índice por ID, sin leer la hoja)
+            fila = get_sheet_index(sheet_reclamos, RECLAMOS_POR_ID).fila_hoja(reclamo_id)
+            if fila is None:
                 st.error(f"❌ No se encontró el reclamo con ID {reclamo_id} en la hoja.")
                 return False
 
-            fila = int(match.index[0]) + 2  # +2 por cabecera
-
             updates_list = [{"range": f"I{fila}", "values": [["Resuelto"]]}]
 
             success, error = api_manager.safe_sheet_operation(
@@ -531,11 +497,6 @@ def _marcar_desconexion_como_resuelta(row, sheet_reclamos):
             )
 
             if success:
-                try:
-                    st.cache_data.clear()
-                except Exception:
-                    pass
-
                 st.success(f"✅ Desconexión de {row.get('Nombre', 'Cliente')} marcada como resuelta.")
                 return True
             else:
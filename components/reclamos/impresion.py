@@ -12,13 +12,12 @@ from utils.date_utils import ahora_argentina
 from utils.reporte_diario import *
 from config.settings import DEBUG_MODE
 
-def render_impresion_reclamos(df_reclamos, df_clientes, user):
+def render_impresion_reclamos(datos, user):
     """
     Muestra la sección para imprimir reclamos en formato PDF
 
     Args:
-        df_reclamos (pd.DataFrame): DataFrame con los reclamos
-        df_clientes (pd.DataFrame): DataFrame con los clientes
+        datos (ContextoDatos): contexto de datos (usa reclamos y clientes)
         user (dict): Información del usuario actual
 
     Returns:
@@ -38,7 +37,8 @@ def render_impresion_reclamos(df_reclamos, df_clientes, user):
 
     try:
         # Preparar datos con información del usuario
-        df_merged = _preparar_datos(df_reclamos, df_clientes, user)
+        df_reclamos = datos.reclamos
+        df_merged = _preparar_datos(df_reclamos, datos.clientes, user)
 
         # Mostrar reclamos pendientes
         _mostrar_reclamos_pendientes(df_merged)
@@ -153,14 +153,8 @@ def render_impresion_reclamos(df_reclamos, df_clientes, user):
 
 def _preparar_datos(df_reclamos, df_clientes, user):
     """Prepara y combina los datos para impresión incluyendo info de usuario"""
-    df_pdf = df_reclamos.copy()
-
-    # Procesamiento de fechas
-    df_pdf["Fecha y hora"] = pd.to_datetime(
-        df_pdf["Fecha y hora"],
-        dayfirst=True,
-        errors='coerce'
-    )
+    # Las fechas llegan ya parseadas desde el modelo de datos
+    df_pdf = df_reclamos.copy(deep=False)
 
     # Agregar información del usuario a los datos
     df_pdf["Usuario_impresion"] = user.get('nombre', 'Sistema')
@@ -178,7 +172,7 @@ def _mostrar_reclamos_pendientes(df_merged):
     """Muestra tabla de reclamos pendientes con mejor formato"""
     with st.expander("🕒 Reclamos pendientes de resolución", expanded=True):
         df_pendientes = df_merged[
-            df_merged["Estado"].astype(str).str.strip().str.lower() == "pendiente"
+            df_merged["Estado"] == "Pendiente"
         ]
 
         if not df_pendientes.empty:
@@ -220,7 +214,7 @@ def _generar_pdf_todos_pendientes(df_merged, usuario=None):
     
     # Filtrar solo pendientes
     df_pendientes = df_merged[
-        df_merged["Estado"].astype(str).str.strip().str.lower() == "pendiente"
+        df_merged["Estado"] == "Pendiente"
     ]
 
     if df_pendientes.empty:
@@ -286,7 +280,7 @@ def _generar_pdf_por_tipo(df_merged, solo_pendientes, usuario=None):
     df_filtrado = df_merged.copy()
     if solo_pendientes:
         df_filtrado = df_filtrado[
-            df_filtrado["Estado"].str.strip().str.lower() == "pendiente"
+            df_filtrado["Estado"] == "Pendiente"
         ]
 
     reclamos_filtrados = df_filtrado[
@@ -328,7 +322,7 @@ def _generar_pdf_manual(df_merged, solo_pendientes, usuario=None):
     df_filtrado = df_merged.copy()
     if solo_pendientes:
         df_filtrado = df_filtrado[
-            df_filtrado["Estado"].astype(str).str.strip().str.lower() == "pendiente"
+            df_filtrado["Estado"] == "Pendiente"
         ]
 
     # Selector mejorado con más información
@@ -375,8 +369,8 @@ def _generar_pdf_desconexiones(df_merged, usuario=None):
     st.markdown("#### 🔌 Desconexiones a pedido")
 
     df_desconexiones = df_merged[
-        (df_merged["Tipo de reclamo"].str.strip().str.lower() == "desconexion a pedido") &
-        (df_merged["Estado"].str.strip().str.lower() == "desconexión")
+        (df_merged["Tipo de reclamo"] == "Desconexion a Pedido") &
+        (df_merged["Estado"] == "Desconexión")
     ]
 
     if df_desconexiones.empty:
@@ -411,7 +405,7 @@ def _generar_pdf_en_curso_por_tecnico(df_merged, usuario=None):
     st.markdown("#### 👷 En curso por técnico")
 
     df_en_curso = df_merged[
-        df_merged["Estado"].astype(str).str.strip().str.lower() == "en curso"
+        df_merged["Estado"] == "En curso"
     ].copy()
 
     if df_en_curso.empty:
@@ -506,10 +500,9 @@ def _generar_pdf_resumen_mensual(df_reclamos, usuario=None, rango_dias=30):
     fecha_inicio = hoy - timedelta(days=rango_dias)
 
     # Filtrar solo los reclamos resueltos en el rango seleccionado
-    df = df_reclamos.copy()
-    df["Fecha y hora"] = pd.to_datetime(df["Fecha y hora"], dayfirst=True, errors='coerce')
+    df = df_reclamos
     df_filtrado = df[
-        (df["Estado"].astype(str).str.strip().str.lower() == "resuelto") &
+        (df["Estado"] == "Resuelto") &
         (df["Fecha y hora"].dt.date >= fecha_inicio.date())
     ]
 
@@ -536,8 +529,8 @@ def _generar_pdf_resumen_mensual(df_reclamos, usuario=None, rango_dias=30):
     y -= 20
 
     totales_tipo = (
-        df_filtrado["Tipo de reclamo"].fillna("Sin tipo")
-        .str.strip()
+        df_filtrado["Tipo de reclamo"].astype(str)
+        .replace("", "Sin tipo")
         .value_counts()
         .sort_index()
     )
@@ -4,7 +4,8 @@ import pandas as pd
 from datetime import datetime
 from utils.date_utils import ahora_argentina, format_fecha
 from utils.api_manager import api_manager
-from utils.data_manager import batch_update_sheet
+from utils.data_manager import batch_update_sheet, append_sheet_row
+from utils.indices import CLIENTES_POR_NUMERO, RECLAMOS_ACTIVOS_POR_CLIENTE
 from config.settings import (
     SECTORES_DISPONIBLES,
     TIPOS_RECLAMO,
@@ -12,19 +13,6 @@ from config.settings import (
 )
 
 # --- FUNCIONES HELPER NUEVAS ---
-def _normalizar_datos(df_clientes, df_reclamos, nro_cliente):
-    """Normaliza datos solo cuando es necesario"""
-    if not nro_cliente:
-        return df_clientes, df_reclamos
-    
-    df_clientes_normalizado = df_clientes.copy()
-    df_reclamos_normalizado = df_reclamos.copy()
-    
-    df_clientes_normalizado["Nº Cliente"] = df_clientes_normalizado["Nº Cliente"].astype(str).str.strip()
-    df_reclamos_normalizado["Nº Cliente"] = df_reclamos_normalizado["Nº Cliente"].astype(str).str.strip()
-    
-    return df_clientes_normalizado, df_reclamos_normalizado
-
 def _validar_y_normalizar_sector(sector_input):
     """Valida y normaliza el sector ingresado"""
     try:
@@ -39,21 +27,12 @@ def _validar_y_normalizar_sector(sector_input):
     except ValueError:
         return None, f"⚠️ El sector debe ser un número válido. Se ingresó: {sector_input}"
 
-def _verificar_reclamos_activos(nro_cliente, df_reclamos):
-    """Verifica reclamos activos de forma eficiente"""
-    if nro_cliente not in df_reclamos["Nº Cliente"].values:
+def _verificar_reclamos_activos(nro_cliente, datos, indice_activos):
+    """Reclamos activos del cliente: sólo sus filas, ubicadas con el índice por Nº Cliente"""
+    posiciones = indice_activos.posiciones(nro_cliente)
+    if not posiciones:
         return pd.DataFrame()
-    
-    reclamos_cliente = df_reclamos[df_reclamos["Nº Cliente"] == nro_cliente]
-    
-    # Convertir estados a minúsculas para comparación case-insensitive
-    estados_activos = ["pendiente", "en curso"]
-    reclamos_activos = reclamos_cliente[
-        reclamos_cliente["Estado"].str.strip().str.lower().isin(estados_activos) |
-        (reclamos_cliente["Tipo de reclamo"].str.strip().str.lower() == "desconexion a pedido")
-    ]
-    
-    return reclamos_activos
+    return datos.filas("reclamos", posiciones)
 
 def generar_id_unico():
     """Genera un ID único para reclamos"""
@@ -96,10 +75,16 @@ def _reset_formulario():
         st.session_state.nro_cliente_input = ''
 
 # --- FUNCIÓN PRINCIPAL OPTIMIZADA ---
-def render_nuevo_reclamo(df_reclamos, df_clientes, sheet_reclamos, sheet_clientes, current_user=None):
+def render_nuevo_reclamo(datos, current_user=None):
     """
     Muestra la sección para cargar nuevos reclamos
     """
+    # Los reclamos no se cargan completos: sólo se leen las filas activas del cliente
+    df_clientes = datos.clientes
+    sheet_reclamos, sheet_clientes = datos.sheet_reclamos, datos.sheet_clientes
+    # Índices por Nº Cliente de la misma versión que los datos (se actualizan al agregar filas)
+    indice_clientes = datos.indice("clientes", CLIENTES_POR_NUMERO)
+    indice_activos = datos.indice("reclamos", RECLAMOS_ACTIVOS_POR_CLIENTE)
     st.subheader("📝 Cargar nuevo reclamo")
 
     # Inicializar estado en session_state
@@ -131,16 +116,11 @@ def render_nuevo_reclamo(df_reclamos, df_clientes, sheet_reclamos, sheet_cliente
         estado['reclamo_guardado'] = False
 
     if estado['nro_cliente']:
-        # Normalizar datos solo cuando sea necesario
-        df_clientes_norm, df_reclamos_norm = _normalizar_datos(
-            df_clientes, df_reclamos, estado['nro_cliente']
-        )
-        
         # Buscar cliente
-        match = df_clientes_norm[df_clientes_norm["Nº Cliente"] == estado['nro_cliente']]
+        posicion = indice_clientes.primera(estado['nro_cliente'])
         
-        if not match.empty:
-            estado['cliente_existente'] = match.iloc[0].to_dict()
+        if posicion is not None:
+            estado['cliente_existente'] = df_clientes.iloc[posicion].to_dict()
             st.success("✅ Cliente reconocido, datos auto-cargados.")
 
         else:
@@ -148,7 +128,7 @@ def render_nuevo_reclamo(df_reclamos, df_clientes, sheet_reclamos, sheet_cliente
             st.info("ℹ️ Este cliente no existe en la base y se cargará como cliente nuevo.")
         
         # Verificar reclamos activos
-        reclamos_activos = _verificar_reclamos_activos(estado['nro_cliente'], df_reclamos_norm)
+        reclamos_activos = _verificar_reclamos_activos(estado['nro_cliente'], datos, indice_activos)
         
         if not reclamos_activos.empty:
             estado['formulario_bloqueado'] = True
@@ -173,10 +153,7 @@ def render_nuevo_reclamo(df_reclamos, df_clientes, sheet_reclamos, sheet_cliente
         st.success("✅ Reclamo registrado correctamente.")
         
         # Verificar si el cliente tiene reclamos activos después de guardar
-        df_clientes_norm, df_reclamos_norm = _normalizar_datos(
-            df_clientes, df_reclamos, estado['nro_cliente']
-        )
-        reclamos_activos = _verificar_reclamos_activos(estado['nro_cliente'], df_reclamos_norm)
+        reclamos_activos = _verificar_reclamos_activos(estado['nro_cliente'], datos, indice_activos)
         
         if not reclamos_activos.empty:
             st.warning("⚠️ Este cliente ya tiene un reclamo activo. No es posible crear otro hasta que se resuelva o cambie de número de cliente.")
@@ -202,13 +179,13 @@ def render_nuevo_reclamo(df_reclamos, df_clientes, sheet_reclamos, sheet_cliente
             st.rerun()
             
     elif not estado['formulario_bloqueado']:
-        _mostrar_formulario_reclamo(estado, df_clientes, sheet_reclamos, sheet_clientes, current_user)
+        _mostrar_formulario_reclamo(estado, df_clientes, indice_clientes, sheet_reclamos, sheet_clientes, current_user)
 
     # Actualizar session_state
     st.session_state.nuevo_reclamo = estado
 
 # --- FUNCIÓN DE FORMULARIO MEJORADA ---
-def _mostrar_formulario_reclamo(estado, df_clientes, sheet_reclamos, sheet_clientes, current_user):
+def _mostrar_formulario_reclamo(estado, df_clientes, indice_clientes, sheet_reclamos, sheet_clientes, current_user):
     """Muestra y procesa el formulario de nuevo reclamo con anotaciones previas"""
     
     # Mostrar anotaciones previas si el cliente existe y tiene anotaciones
@@ -286,12 +263,13 @@ def _mostrar_formulario_reclamo(estado, df_clientes, sheet_reclamos, sheet_clien
         _procesar_envio_formulario(
             estado, nombre, direccion, telefono, sector, 
             tipo_reclamo, detalles, precinto, atendido_por,
-            df_clientes, sheet_reclamos, sheet_clientes
+            df_clientes, indice_clientes, sheet_reclamos, sheet_clientes
         )
 
 # --- FUNCIÓN DE PROCESAMIENTO OPTIMIZADA ---
 def _procesar_envio_formulario(estado, nombre, direccion, telefono, sector, tipo_reclamo, 
-                              detalles, precinto, atendido_por, df_clientes, sheet_reclamos, sheet_clientes):
+                              detalles, precinto, atendido_por, df_clientes, indice_clientes,
+                              sheet_reclamos, sheet_clientes):
     """Procesa el envío del formulario de manera optimizada"""
     
     # Validar campos obligatorios
@@ -339,10 +317,7 @@ def _procesar_envio_formulario(estado, nombre, direccion, telefono, sector, tipo
             ]
 
             # --- Interacción con Google Sheets ---
-            success, error = api_manager.safe_sheet_operation(
-                sheet_reclamos.append_row,
-                fila_reclamo
-            )
+            success, error = append_sheet_row(sheet_reclamos, fila_reclamo)
 
             if success:
                 estado.update({
@@ -355,11 +330,9 @@ def _procesar_envio_formulario(estado, nombre, direccion, telefono, sector, tipo
                 # Gestionar cliente (nuevo o actualización)
                 _gestionar_cliente(
                     estado['nro_cliente'], sector_normalizado, nombre, 
-                    direccion, telefono, precinto, df_clientes, sheet_clientes
+                    direccion, telefono, precinto, df_clientes, indice_clientes, sheet_clientes
                 )
                 
-                st.cache_data.clear()
-                
                 # 🔄 Forzar recarga para limpiar el formulario y mostrar reclamo activo
                 st.rerun()
 
@@ -371,11 +344,12 @@ def _procesar_envio_formulario(estado, nombre, direccion, telefono, sector, tipo
             if DEBUG_MODE:
                 st.exception(e)
 
-def _gestionar_cliente(nro_cliente, sector, nombre, direccion, telefono, precinto, df_clientes, sheet_clientes):
+def _gestionar_cliente(nro_cliente, sector, nombre, direccion, telefono, precinto,
+                       df_clientes, indice_clientes, sheet_clientes):
     """Gestiona la creación o actualización del cliente, preservando anotaciones existentes"""
-    cliente_existente = df_clientes[df_clientes["Nº Cliente"] == nro_cliente]
+    posicion = indice_clientes.primera(nro_cliente)
     
-    if cliente_existente.empty:
+    if posicion is None:
         # Crear nuevo cliente con UUID y última modificación
         id_cliente = generar_id_unico()
         ultima_mod = format_fecha(ahora_argentina())
@@ -390,15 +364,16 @@ def _gestionar_cliente(nro_cliente, sector, nombre, direccion, telefono, precint
             ultima_mod,            # H: Última Modificación
             ""                     # I: Anotaciones (vacío para nuevo cliente)
         ]
-        success, _ = api_manager.safe_sheet_operation(sheet_clientes.append_row, fila_cliente)
+        success, _ = append_sheet_row(sheet_clientes, fila_cliente)
         if success:
             st.info("ℹ️ Nuevo cliente registrado con ID asignado")
     else:
         # Actualizar cliente existente pero preservar anotaciones
+        cliente_existente = df_clientes.iloc[[posicion]]
         anotaciones_existentes = cliente_existente.iloc[0].get("Anotaciones", "")
         
         updates = []
-        idx = cliente_existente.index[0] + 2
+        idx = posicion + 2
         
         # Mapeo correcto de columnas (A=1, B=2, C=3, D=4, E=5, F=6, G=7, H=8, I=9)
         campos_actualizar = {
@@ -6,19 +6,28 @@ import pandas as pd
 from datetime import datetime
 from reportlab.lib.pagesizes import A4
 from reportlab.pdfgen import canvas
-from utils.date_utils import parse_fecha, format_fecha
-from utils.api_manager import api_manager, batch_update_sheet
+from utils.date_utils import parse_fecha, format_fecha, ahora_argentina
+from utils.data_manager import invalidate, ColaEscrituras, get_sheet_index
+from utils.indices import RECLAMOS_POR_ID
+from utils.asignacion_grupos import ResultadoAsignacion, optimizar_asignacion, repartir_por_capacidad
+from utils.recorridos import cargar_matriz, ordenar_recorrido, largo_recorrido
+from utils.tiempos_servicio import TIEMPOS_SERVICIO
+from utils.materiales import TABLA_MATERIALES, lista_de_retiro
 from utils.pdf_utils import agregar_pie_pdf
+from components.ui import paginar
 from config.settings import (
     SECTORES_DISPONIBLES,
     TECNICOS_DISPONIBLES,
-    MATERIALES_POR_RECLAMO,
-    ROUTER_POR_SECTOR,
+    WORKSHEET_RECLAMOS,
+    CENTROIDES_SECTORES_PATH,
+    RECORRIDO_TIEMPO_MAXIMO,
     DEBUG_MODE
 )
 import uuid
+from collections import Counter
 
 GRUPOS_POSIBLES = [f"Grupo {letra}" for letra in "ABCDE"]
+RECLAMOS_POR_PAGINA = 15
 
 def generar_id_unico():
     """Genera un ID único para reclamos y clientes"""
@@ -66,32 +75,20 @@ def _generar_uuids_faltantes(df_reclamos, df_clientes, sheet_reclamos, sheet_cli
                         "values": [[nuevo_uuid]]
                     })
         
-        # Aplicar actualizaciones si hay alguna
-        if updates_reclamos:
-            success, error = api_manager.safe_sheet_operation(
-                batch_update_sheet, 
-                sheet_reclamos, 
-                updates_reclamos, 
-                is_batch=True
-            )
-            if success:
-                uuids_generados = True
-                st.success(f"✅ Se generaron {len(updates_reclamos)} UUIDs para reclamos")
-            else:
-                st.error(f"❌ Error al generar UUIDs para reclamos: {error}")
-        
-        if updates_clientes:
-            success, error = api_manager.safe_sheet_operation(
-                batch_update_sheet, 
-                sheet_clientes, 
-                updates_clientes, 
-                is_batch=True
-            )
+        # Aplicar actualizaciones si hay alguna (reclamos y clientes en una sola solicitud)
+        if updates_reclamos or updates_clientes:
+            cola = ColaEscrituras()
+            cola.agregar(sheet_reclamos, updates_reclamos)
+            cola.agregar(sheet_clientes, updates_clientes)
+            success, error = cola.enviar()
             if success:
                 uuids_generados = True
-                st.success(f"✅ Se generaron {len(updates_clientes)} UUIDs para clientes")
+                if updates_reclamos:
+                    st.success(f"✅ Se generaron {len(updates_reclamos)} UUIDs para reclamos")
+                if updates_clientes:
+                    st.success(f"✅ Se generaron {len(updates_clientes)} UUIDs para clientes")
             else:
-                st.error(f"❌ Error al generar UUIDs para clientes: {error}")
+                st.error(f"❌ Error al generar UUIDs: {error}")
         
         if not updates_reclamos and not updates_clientes:
             st.info("ℹ️ Todos los reclamos y clientes ya tienen UUIDs asignados")
@@ -118,6 +115,10 @@ ZONAS_COMPATIBLES = {
     "Zona 5": ["Zona 1", "Zona 3"]
 }
 
+# Tablas derivadas para el balanceo: sector -> zona y cuántas zonas son compatibles con cada una
+ZONA_POR_SECTOR = {sector: zona for zona, sectores in SECTORES_VECINOS.items() for sector in sectores}
+CENTRALIDAD_ZONA = {zona: len(ZONAS_COMPATIBLES.get(zona, [])) for zona in SECTORES_VECINOS}
+
 def inicializar_estado_grupos():
     if "asignaciones_grupos" not in st.session_state:
         st.session_state.asignaciones_grupos = {g: [] for g in GRUPOS_POSIBLES}
@@ -125,8 +126,10 @@ def inicializar_estado_grupos():
         st.session_state.tecnicos_grupos = {g: [] for g in GRUPOS_POSIBLES}
     if "vista_simulacion" not in st.session_state:
         st.session_state.vista_simulacion = False
-    if "simulacion_asignaciones" not in st.session_state:
-        st.session_state.simulacion_asignaciones = {}
+    if "simulacion" not in st.session_state:
+        st.session_state.simulacion = None  # (clave, modo, ResultadoAsignacion), ver _simular_distribucion
+    if "recorridos_grupos" not in st.session_state:
+        st.session_state.recorridos_grupos = {}
 
 def agrupar_zonas_completas(zonas, grupos, df_reclamos, permitir_redistribucion=True):
     """
@@ -218,6 +221,9 @@ def _son_zonas_compatibles(zona, zonas_destino):
 def distribuir_por_sector_mejorado(df_reclamos, grupos_activos):
     """
     Distribución que respeta zonas completas
+
+    Returns:
+        ResultadoAsignacion con los IDs y las zonas de cada grupo
     """
     df_reclamos = df_reclamos[df_reclamos["Estado"] == "Pendiente"].copy()
     grupos = GRUPOS_POSIBLES[:grupos_activos]
@@ -243,7 +249,24 @@ def distribuir_por_sector_mejorado(df_reclamos, grupos_activos):
         if grupo:
             asignaciones[grupo].append(r["ID Reclamo"])
     
-    return asignaciones
+    return ResultadoAsignacion(asignaciones, zonas_por_grupo)
+
+def distribuir_optimo(df_reclamos, grupos_activos):
+    """
+    Distribución que minimiza el desbalance entre grupos respetando ZONAS_COMPATIBLES
+    (ver utils.asignacion_grupos.optimizar_asignacion).
+
+    Returns:
+        ResultadoAsignacion con los IDs, las zonas y la carga de cada grupo
+    """
+    df_reclamos = df_reclamos[df_reclamos["Estado"] == "Pendiente"]
+    return optimizar_asignacion(
+        df_reclamos["ID Reclamo"].tolist(),
+        df_reclamos["Sector"].astype(str).tolist(),
+        GRUPOS_POSIBLES[:grupos_activos],
+        SECTORES_VECINOS,
+        ZONAS_COMPATIBLES,
+    )
 
 def _balancear_asignaciones(asignaciones, df_reclamos):
     """
@@ -251,6 +274,13 @@ def _balancear_asignaciones(asignaciones, df_reclamos):
     - Todos los grupos tendrán carga floor(N/G) o ceil(N/G).
     - Condición de corte: max(cargas) - min(cargas) <= 1
     """
+    # Zona de cada reclamo y zonas que atiende cada grupo, calculadas una sola vez
+    zona_por_id = _zonas_de_reclamos(df_reclamos)
+    zonas_por_grupo = {
+        g: Counter(zona_por_id[r] for r in recs if zona_por_id.get(r))
+        for g, recs in asignaciones.items()
+    }
+
     # Cargas iniciales
     carga_por_grupo = {g: len(recs) for g, recs in asignaciones.items()}
 
@@ -275,10 +305,8 @@ def _balancear_asignaciones(asignaciones, df_reclamos):
         # Elegir un reclamo candidato del grupo más cargado que sea compatible con el menos cargado
         reclamo_a_transferir = _encontrar_reclamo_transferible(
             asignaciones[grupo_mas_cargado],
-            grupo_mas_cargado,
-            grupo_menos_cargado,
-            df_reclamos,
-            asignaciones
+            zonas_por_grupo[grupo_menos_cargado],
+            zona_por_id
         )
 
         if not reclamo_a_transferir:
@@ -289,64 +317,58 @@ def _balancear_asignaciones(asignaciones, df_reclamos):
         asignaciones[grupo_mas_cargado].remove(reclamo_a_transferir)
         asignaciones[grupo_menos_cargado].append(reclamo_a_transferir)
 
-        # Actualizar cargas
+        # Actualizar cargas y zonas atendidas
         carga_por_grupo[grupo_mas_cargado] -= 1
         carga_por_grupo[grupo_menos_cargado] += 1
+        zona = zona_por_id.get(reclamo_a_transferir)
+        if zona:
+            zonas_por_grupo[grupo_mas_cargado][zona] -= 1
+            zonas_por_grupo[grupo_menos_cargado][zona] += 1
 
     return asignaciones
 
-def _encontrar_reclamo_transferible(reclamos_grupo_origen, grupo_origen, grupo_destino, df_reclamos, asignaciones):
+def _zonas_de_reclamos(df_reclamos):
+    """ID Reclamo -> zona de su sector (None si el sector no está en ninguna zona)"""
+    df_reclamos = df_reclamos.drop_duplicates("ID Reclamo")
+    sectores = df_reclamos["Sector"].astype(str).str.strip()
+    return {i: ZONA_POR_SECTOR.get(s) for i, s in zip(df_reclamos["ID Reclamo"], sectores)}
+
+def _encontrar_reclamo_transferible(reclamos_grupo_origen, zonas_destino, zona_por_id):
     """
     Elige el mejor reclamo para mover del grupo origen al destino:
     - Compatible con zonas del destino (prioridad alta)
     - Zonas más "centrales" (mayor conectividad) tienen más prioridad
     - Si el destino aún no tiene zonas, prioriza centralidad
-    """
-    # 1) Armar zonas actuales del destino
-    zonas_destino = []
-    reclamos_destino = df_reclamos[df_reclamos["ID Reclamo"].isin(asignaciones[grupo_destino])]
-    for _, r in reclamos_destino.iterrows():
-        sec = str(r["Sector"])
-        for z, sectores in SECTORES_VECINOS.items():
-            if sec in sectores and z not in zonas_destino:
-                zonas_destino.append(z)
-
-    # 2) Evaluar candidatos del origen
-    mejor_id = None
-    mejor_score = float("-inf")
-
-    for reclamo_id in reclamos_grupo_origen:
-        fila = df_reclamos[df_reclamos["ID Reclamo"] == reclamo_id]
-        if fila.empty:
-            continue
-
-        sector = str(fila.iloc[0]["Sector"])
-        zona_reclamo = None
-        for z, sectores in SECTORES_VECINOS.items():
-            if sector in sectores:
-                zona_reclamo = z
-                break
-
-        if not zona_reclamo:
-            continue
 
-        # Puntaje base por centralidad (cuántas zonas son compatibles con esta zona)
-        centralidad = len(ZONAS_COMPATIBLES.get(zona_reclamo, []))
+    Args:
+        reclamos_grupo_origen: IDs del grupo origen
+        zonas_destino: zona -> cantidad de reclamos que ya atiende el destino
+        zona_por_id: ID Reclamo -> zona (ver _zonas_de_reclamos)
+    """
+    # 1) El puntaje depende sólo de la zona: se calcula una vez por zona
+    atendidas = {z for z, cantidad in zonas_destino.items() if cantidad > 0}
+    compatibles = set().union(*(ZONAS_COMPATIBLES.get(z, []) for z in atendidas))
+    puntaje_zona = {}
+    for zona, centralidad in CENTRALIDAD_ZONA.items():
         score = centralidad  # base
-
-        if zonas_destino:
-            # Compatible con al menos una zona del destino
-            compatible = any(zona_reclamo in ZONAS_COMPATIBLES.get(zd, []) for zd in zonas_destino)
-            if compatible:
+        if atendidas:
+            if zona in compatibles:
                 score += 100
             # Match exacto (misma zona) también suma
-            if zona_reclamo in zonas_destino:
+            if zona in atendidas:
                 score += 20
         else:
             # Sin zonas destino aún → priorizar centralidad pura
             score += 10  # pequeño empuje para desbloquear
+        puntaje_zona[zona] = score
+
+    # 2) Evaluar candidatos del origen (a igual puntaje, el primero)
+    mejor_id = None
+    mejor_score = float("-inf")
 
-        if score > mejor_score:
+    for reclamo_id in reclamos_grupo_origen:
+        score = puntaje_zona.get(zona_por_id.get(reclamo_id))
+        if score is not None and score > mejor_score:
             mejor_score = score
             mejor_id = reclamo_id
 
@@ -354,6 +376,12 @@ def _encontrar_reclamo_transferible(reclamos_grupo_origen, grupo_origen, grupo_d
     return mejor_id if mejor_id is not None else (reclamos_grupo_origen[0] if reclamos_grupo_origen else None)
 
 def distribuir_por_tipo(df_reclamos, grupos_activos):
+    """
+    Reparte los reclamos de cada tipo entre los grupos, uno a cada uno
+
+    Returns:
+        ResultadoAsignacion con los IDs de cada grupo (sin zonas)
+    """
     df_reclamos = df_reclamos[df_reclamos["Estado"] == "Pendiente"].copy()  # <--- agregado
 
     grupos = GRUPOS_POSIBLES[:grupos_activos]
@@ -372,7 +400,25 @@ def distribuir_por_tipo(df_reclamos, grupos_activos):
             asignaciones[grupo].append(rid)
             i += 1
 
-    return asignaciones
+    return ResultadoAsignacion(asignaciones, {g: [] for g in grupos})
+
+def distribuir_por_capacidad(df_reclamos, grupos_activos, tiempos):
+    """
+    Distribución que equilibra las horas estimadas por técnico en lugar de la
+    cantidad de reclamos (ver utils.tiempos_servicio y repartir_por_capacidad).
+
+    Returns:
+        ResultadoAsignacion con los IDs y las horas estimadas de cada grupo
+    """
+    df_reclamos = df_reclamos[df_reclamos["Estado"] == "Pendiente"]
+    grupos = GRUPOS_POSIBLES[:grupos_activos]
+    horas_por_tipo = {tipo: tiempos.horas(tipo) for tipo in df_reclamos["Tipo de reclamo"].astype(str).unique()}
+    return repartir_por_capacidad(
+        df_reclamos["ID Reclamo"].tolist(),
+        df_reclamos["Tipo de reclamo"].astype(str).map(horas_por_tipo).tolist(),
+        grupos,
+        {g: len(st.session_state.tecnicos_grupos.get(g, [])) for g in grupos},
+    )
 
 def _mostrar_asignacion_tecnicos(grupos_activos):
     """Muestra la interfaz para asignar técnicos a grupos"""
@@ -391,9 +437,7 @@ def _mostrar_reclamos_disponibles(df_reclamos, grupos_activos):
     st.markdown("---")
     st.markdown("### 📋 Reclamos pendientes para asignar")
 
-    df_reclamos.columns = df_reclamos.columns.str.strip()
-    df_reclamos["ID Reclamo"] = df_reclamos["ID Reclamo"].astype(str).str.strip()
-    df_reclamos["Fecha y hora"] = pd.to_datetime(df_reclamos["Fecha y hora"], dayfirst=True, errors='coerce')
+    # IDs y fechas llegan normalizados desde el modelo de datos
 
     # Verificamos si hay IDs vacíos
     if df_reclamos["ID Reclamo"].eq("").any():
@@ -429,7 +473,12 @@ def _mostrar_reclamos_disponibles(df_reclamos, grupos_activos):
     if df_disponibles.empty:
         st.info("🎉 No hay reclamos pendientes disponibles.")
     else:
-        for idx, row in df_disponibles.iterrows():
+        # Sólo se dibujan las tarjetas de la página visible
+        df_pagina = paginar(
+            df_disponibles, "reclamos_disponibles", RECLAMOS_POR_PAGINA,
+            reiniciar_con=(filtro_sector, filtro_tipo, orden), etiqueta="reclamos"
+        )
+        for _, row in df_pagina.iterrows():
             with st.container():
                 col1, *cols_grupo = st.columns([4] + [1] * grupos_activos)
                 resumen = f"📍 Sector {row['Sector']} - {row['Tipo de reclamo'].capitalize()} - {_format_fecha_reclamo(row['Fecha y hora'])}"
@@ -438,7 +487,7 @@ def _mostrar_reclamos_disponibles(df_reclamos, grupos_activos):
             for i, grupo in enumerate(GRUPOS_POSIBLES[:grupos_activos]):
                 tecnicos = st.session_state.tecnicos_grupos[grupo]
                 tecnicos_str = ", ".join(tecnicos[:2]) + ("..." if len(tecnicos) > 2 else "") if tecnicos else "Sin técnicos"
-                button_key = f"asignar_{grupo}_{row['ID Reclamo']}_{idx}"
+                button_key = f"asignar_{grupo}_{row['ID Reclamo']}"
                 if cols_grupo[i].button(f"➡️{grupo[-1]} ({tecnicos_str})", key=button_key):
                     if row["ID Reclamo"] not in asignados:
                         st.session_state.asignaciones_grupos[grupo].append(row["ID Reclamo"])
@@ -482,11 +531,94 @@ def _limpiar_asignaciones(df_reclamos):
             if str(id) in ids_validos
         ]
 
-def render_planificacion_grupos(df_reclamos, sheet_reclamos, user, df_clientes=None, sheet_clientes=None):
+def _simular_distribucion(datos, df_reclamos, grupos_activos, modo):
+    """
+    Distribución previa memorizada por (versión de la hoja, grupos activos, modo).
+
+    Volver a pedir la misma distribución sobre la misma versión de la hoja
+    reutiliza el resultado; la vista previa y la confirmación leen ese mismo objeto.
+    """
+    grupos = GRUPOS_POSIBLES[:grupos_activos]
+    tecnicos = None
+    if modo == "Automática por tiempo estimado (capacidad)":
+        # El reparto por capacidad depende también de los técnicos de cada grupo
+        tecnicos = tuple(len(st.session_state.tecnicos_grupos.get(g, [])) for g in grupos)
+    clave = (datos.version("reclamos"), grupos_activos, modo, tecnicos)
+
+    memorizada = st.session_state.get("simulacion")
+    if memorizada and memorizada[0] == clave:
+        return memorizada[2]
+
+    if modo == "Automática por sector (mejorada)":
+        resultado = distribuir_por_sector_mejorado(df_reclamos, grupos_activos)
+    elif modo == "Automática óptima por zonas":
+        resultado = distribuir_optimo(df_reclamos, grupos_activos)
+    elif modo == "Automática por tiempo estimado (capacidad)":
+        resultado = distribuir_por_capacidad(df_reclamos, grupos_activos, datos.indice("reclamos", TIEMPOS_SERVICIO))
+    else:
+        resultado = distribuir_por_tipo(df_reclamos, grupos_activos)
+
+    _completar_resultado(resultado, df_reclamos[df_reclamos["Estado"] == "Pendiente"])
+    st.session_state.simulacion = (clave, modo, resultado)
+    return resultado
+
+def _completar_resultado(resultado, df_pendientes):
+    """Agrega al resultado los materiales y las filas de la vista previa de cada grupo"""
+    por_id = df_pendientes.drop_duplicates("ID Reclamo").set_index("ID Reclamo")
+    grupo_de_id = {rid: grupo for grupo, ids in resultado.asignaciones.items() for rid in ids}
+    asignados = por_id[por_id.index.map(grupo_de_id).notna()]
+    resultado.materiales = TABLA_MATERIALES.totales_por_grupo(
+        asignados.index.map(grupo_de_id).tolist(),
+        asignados["Tipo de reclamo"].tolist(),
+        asignados["Sector"].tolist()
+    )
+    columnas = ["Nº Cliente", "Tipo de reclamo", "Sector"]
+    resultado.vista_previa = {
+        grupo: por_id.reindex([rid for rid in ids if rid in por_id.index], columns=columnas)
+        for grupo, ids in resultado.asignaciones.items()
+    }
+
+def _mostrar_simulacion(datos, modo, resultado):
+    """Vista previa de una distribución (ver _simular_distribucion)"""
+    if any(resultado.zonas_por_grupo.values()):
+        st.markdown("### 🗺️ Zonas asignadas por grupo:")
+        for grupo, zonas_asignadas in resultado.zonas_por_grupo.items():
+            st.markdown(f"- **{grupo}** cubre: {', '.join(zonas_asignadas) or '—'} ({resultado.cargas[grupo]} reclamos)")
+        if modo == "Automática óptima por zonas":
+            st.caption(f"Diferencia entre el grupo más y el menos cargado: {resultado.desbalance} reclamo(s)")
+
+    if resultado.horas is not None:
+        st.markdown("### ⏱️ Horas estimadas por grupo:")
+        for grupo, horas in resultado.horas.items():
+            tecnicos = len(st.session_state.tecnicos_grupos.get(grupo, []))
+            por_tecnico = f", {horas / tecnicos:.1f} h por técnico" if tecnicos else ", sin técnicos"
+            st.markdown(f"- **{grupo}**: {resultado.cargas[grupo]} reclamos, ~{horas:.1f} h{por_tecnico}")
+        tiempos = datos.indice("reclamos", TIEMPOS_SERVICIO)
+        with st.expander(f"Tiempos por tipo de reclamo ({len(tiempos)} cierres analizados)"):
+            st.dataframe(tiempos.estimaciones(), use_container_width=True, hide_index=True)
+
+    st.subheader("🗂️ Distribución previa de reclamos")
+    for grupo, filas in resultado.vista_previa.items():
+        st.markdown(f"### 📦 {grupo} - {resultado.cargas[grupo]} reclamos")
+        if grupo in resultado.materiales.index:
+            materiales = resultado.materiales.loc[grupo]
+            materiales = ", ".join(f"{c} {m.replace('_', ' ').title()}" for m, c in materiales.items() if c)
+            if materiales:
+                st.caption(f"🛠️ Materiales: {materiales}")
+        if not filas.empty:
+            st.markdown("\n".join(
+                f"- {cliente} | {tipo} | Sector {sector}"
+                for cliente, tipo, sector in filas.itertuples(index=False)
+            ))
+
+def render_planificacion_grupos(datos, user):
     if user.get('rol') != 'admin':
         st.warning("⚠️ Solo los administradores pueden acceder a esta sección")
         return {'needs_refresh': False}
 
+    # Sólo reclamos abiertos: la planificación no necesita el historial
+    df_reclamos, sheet_reclamos = datos.reclamos_activos, datos.sheet_reclamos
+
     st.subheader("📋 Asignación de reclamos a grupos de trabajo")
 
     try:
@@ -497,58 +629,39 @@ def render_planificacion_grupos(df_reclamos, sheet_reclamos, user, df_clientes=N
 
         modo_distribucion = st.selectbox(
             "📊 Elegí el modo de distribución",
-            ["Manual", "Automática por sector (mejorada)", "Automática por tipo de reclamo"],
+            [
+                "Manual", "Automática por sector (mejorada)", "Automática óptima por zonas",
+                "Automática por tipo de reclamo", "Automática por tiempo estimado (capacidad)"
+            ],
             index=0
         )
 
         if modo_distribucion != "Manual":
             if st.button("⚙️ Distribuir reclamos ahora"):
-                if modo_distribucion == "Automática por sector (mejorada)":
-                    st.session_state.simulacion_asignaciones = distribuir_por_sector_mejorado(df_reclamos, grupos_activos)
-
-                    # Mostrar zonas asignadas por grupo con el algoritmo mejorado
-                    zonas_por_grupo = agrupar_zonas_completas(
-                        list(SECTORES_VECINOS.keys()),
-                        GRUPOS_POSIBLES[:grupos_activos],
-                        df_reclamos
-                    )
-                    st.markdown("### 🗺️ Zonas asignadas por grupo (mejorado):")
-                    for grupo, zonas_asignadas in zonas_por_grupo.items():
-                        st.markdown(f"- **{grupo}** cubre: {', '.join(zonas_asignadas)}")
-
-                else:
-                    st.session_state.simulacion_asignaciones = distribuir_por_tipo(df_reclamos, grupos_activos)
-
+                _simular_distribucion(datos, df_reclamos, grupos_activos, modo_distribucion)
                 st.session_state.vista_simulacion = True
                 st.success("✅ Distribución previa generada. Revisala antes de guardar.")
 
-        if st.session_state.get("vista_simulacion"):
-            st.subheader("🗂️ Distribución previa de reclamos")
-            for grupo, reclamos in st.session_state.simulacion_asignaciones.items():
-                st.markdown(f"### 📦 {grupo} - {len(reclamos)} reclamos")
-                for rid in reclamos:
-                    row = df_reclamos[df_reclamos["ID Reclamo"] == rid]
-                    if not row.empty:
-                        r = row.iloc[0]
-                        st.markdown(f"- {r['Nº Cliente']} | {r['Tipo de reclamo']} | Sector {r['Sector']}")
+        if st.session_state.get("vista_simulacion") and st.session_state.get("simulacion"):
+            _, modo_simulado, resultado = st.session_state.simulacion
+            _mostrar_simulacion(datos, modo_simulado, resultado)
 
             # Solo opción de confirmar, sin generar PDF en la simulación
             if st.button("💾 Confirmar y guardar esta asignación"):
-                for g in GRUPOS_POSIBLES:
-                    st.session_state.asignaciones_grupos[g] = []
-                        
-                st.session_state.asignaciones_grupos = st.session_state.simulacion_asignaciones
+                # Copias: quitar reclamos a mano no debe modificar el resultado memorizado
+                st.session_state.asignaciones_grupos = {g: [] for g in GRUPOS_POSIBLES}
+                for grupo, ids in resultado.asignaciones.items():
+                    st.session_state.asignaciones_grupos[grupo] = list(ids)
                 st.session_state.vista_simulacion = False
                 st.success("✅ Asignaciones aplicadas.")
                 st.rerun()
 
         if st.button("🔄 Refrescar reclamos"):
-            st.cache_data.clear()
+            invalidate(WORKSHEET_RECLAMOS)
             
-            # Generar UUIDs faltantes si se tienen los datos necesarios
-            if df_clientes is not None and sheet_clientes is not None:
-                with st.spinner("Verificando y generando UUIDs faltantes..."):
-                    _generar_uuids_faltantes(df_reclamos, df_clientes, sheet_reclamos, sheet_clientes)
+            # Generar UUIDs faltantes (la hoja completa y los clientes sólo se leen en este caso)
+            with st.spinner("Verificando y generando UUIDs faltantes..."):
+                _generar_uuids_faltantes(datos.reclamos, datos.clientes, sheet_reclamos, datos.sheet_clientes)
             
             return {'needs_refresh': True}
 
@@ -556,7 +669,7 @@ def render_planificacion_grupos(df_reclamos, sheet_reclamos, user, df_clientes=N
         df_pendientes = _mostrar_reclamos_disponibles(df_reclamos, grupos_activos)
 
         if df_pendientes is not None:
-            materiales_por_grupo = _mostrar_reclamos_asignados(df_pendientes, grupos_activos)
+            materiales_por_grupo = _mostrar_reclamos_asignados(df_pendientes, grupos_activos, df_reclamos)
             cambios = _mostrar_acciones_finales(
                 df_reclamos, sheet_reclamos, 
                 grupos_activos, materiales_por_grupo, df_pendientes
@@ -571,27 +684,49 @@ def render_planificacion_grupos(df_reclamos, sheet_reclamos, user, df_clientes=N
             st.exception(e)
         return {'needs_refresh': False}
 
-def _mostrar_reclamos_asignados(df_pendientes, grupos_activos):
-    """Muestra los reclamos asignados por grupo"""
+def _mostrar_reclamos_asignados(df_pendientes, grupos_activos, df_reclamos):
+    """
+    Muestra los reclamos asignados por grupo
+
+    `df_pendientes` es la lista filtrada en pantalla; el recorrido y los materiales
+    (que también van al PDF y a la lista de retiro) se calculan con todos los
+    reclamos activos (`df_reclamos`), para no depender de los filtros.
+    """
     st.markdown("---")
     st.markdown("### 📌 Reclamos asignados por grupo")
 
     materiales_por_grupo = {}
+    ordenar = st.checkbox(
+        "🧭 Ordenar los reclamos de cada grupo por recorrido",
+        key="ordenar_recorrido",
+        help="Agrupa los reclamos por sector y ordena los sectores para minimizar los traslados. El PDF sigue el mismo orden."
+    )
+    matriz = cargar_matriz(CENTROIDES_SECTORES_PATH, SECTORES_VECINOS, ZONAS_COMPATIBLES) if ordenar else None
+    totales_materiales = _materiales_por_grupo(df_reclamos[df_reclamos["Estado"] == "Pendiente"], grupos_activos)
 
     for grupo in GRUPOS_POSIBLES[:grupos_activos]:
+        if ordenar:
+            _ordenar_grupo_por_recorrido(grupo, df_reclamos, matriz)
         reclamos_ids = st.session_state.asignaciones_grupos[grupo]
         tecnicos = st.session_state.tecnicos_grupos[grupo]
 
         st.markdown(f"#### 🔢 {grupo} - Técnicos: {', '.join(tecnicos) if tecnicos else 'Sin asignar'} ({len(reclamos_ids)} reclamos)")
+        if ordenar and reclamos_ids:
+            orden_sectores = st.session_state.recorridos_grupos[grupo][1]
+            distancia = f" (~{largo_recorrido(orden_sectores, matriz):.1f} km)" if matriz.unidad == "km" else ""
+            st.caption(f"🧭 Recorrido: sectores {' → '.join(orden_sectores)}{distancia}")
         reclamos_grupo = df_pendientes[df_pendientes["ID Reclamo"].isin(reclamos_ids)]
 
         if not reclamos_grupo.empty:
-            resumen_tipos = " - ".join([f"{v} {k}" for k, v in reclamos_grupo["Tipo de reclamo"].value_counts().items()])
+            resumen_tipos = " - ".join([f"{v} {k}" for k, v in reclamos_grupo["Tipo de reclamo"].value_counts().loc[lambda c: c > 0].items()])
             sectores = ", ".join(sorted(set(reclamos_grupo["Sector"].astype(str))))
             st.markdown(resumen_tipos)
             st.markdown(f"Sectores: {sectores}")
 
-        materiales_total = _calcular_materiales_grupo(reclamos_grupo)
+        materiales_total = (
+            {m: int(c) for m, c in totales_materiales.loc[grupo].items() if c}
+            if grupo in totales_materiales.index else {}
+        )
         materiales_por_grupo[grupo] = materiales_total
 
         if materiales_total:
@@ -619,20 +754,48 @@ def _mostrar_reclamos_asignados(df_pendientes, grupos_activos):
     return materiales_por_grupo
 
 
-def _calcular_materiales_grupo(reclamos_grupo):
-    """Calcula los materiales necesarios para un grupo de trabajo"""
-    materiales_total = {}
-    for _, row in reclamos_grupo.iterrows():
-        tipo = row["Tipo de reclamo"]
-        sector = str(row["Sector"])
-        materiales_tipo = MATERIALES_POR_RECLAMO.get(tipo, {})
-        for mat, cant in materiales_tipo.items():
-            key = mat
-            if "router" in mat:
-                marca = ROUTER_POR_SECTOR.get(sector, "vsol")
-                key = f"router_{marca}"
-            materiales_total[key] = materiales_total.get(key, 0) + cant
-    return materiales_total
+def _ordenar_grupo_por_recorrido(grupo, df_reclamos, matriz):
+    """
+    Reordena en el estado los reclamos del grupo según el recorrido por sectores
+    (ver utils.recorridos). Sólo se recalcula si cambiaron los reclamos del grupo
+    o sus sectores.
+
+    Args:
+        df_reclamos: reclamos activos sin los filtros de pantalla
+    """
+    reclamos_ids = st.session_state.asignaciones_grupos[grupo]
+    sector_por_id = dict(zip(df_reclamos["ID Reclamo"], df_reclamos["Sector"].astype(str)))
+    sectores = [sector_por_id.get(r, "") for r in reclamos_ids]
+
+    recorridos = st.session_state.recorridos_grupos
+    firma = (frozenset(zip(reclamos_ids, sectores)), id(matriz))
+    if recorridos.get(grupo, (None, None))[0] == firma:
+        return
+
+    ordenados, orden_sectores = ordenar_recorrido(
+        reclamos_ids,
+        sectores,
+        matriz,
+        RECORRIDO_TIEMPO_MAXIMO
+    )
+    st.session_state.asignaciones_grupos[grupo] = ordenados
+    recorridos[grupo] = (firma, [s for s in orden_sectores if s])
+
+
+def _materiales_por_grupo(df_pendientes, grupos_activos):
+    """Materiales de todos los grupos (filas) con una sola suma (ver utils.materiales)"""
+    grupo_de_id = {
+        reclamo_id: grupo
+        for grupo in GRUPOS_POSIBLES[:grupos_activos]
+        for reclamo_id in st.session_state.asignaciones_grupos[grupo]
+    }
+    grupos = df_pendientes["ID Reclamo"].map(grupo_de_id)
+    asignados = df_pendientes[grupos.notna()]
+    return TABLA_MATERIALES.totales_por_grupo(
+        grupos[grupos.notna()].tolist(),
+        asignados["Tipo de reclamo"].tolist(),
+        asignados["Sector"].tolist()
+    )
 
 
 def _mostrar_acciones_finales(df_reclamos, sheet_reclamos, grupos_activos, materiales_por_grupo, df_pendientes):
@@ -640,7 +803,7 @@ def _mostrar_acciones_finales(df_reclamos, sheet_reclamos, grupos_activos, mater
     st.markdown("---")
     cambios = False
 
-    col1, col2 = st.columns(2)
+    col1, col2, col3 = st.columns(3)
 
     if col1.button("💾 Guardar cambios y pasar a 'En curso'", use_container_width=True):
         cambios = _guardar_cambios(df_reclamos, sheet_reclamos, grupos_activos)
@@ -648,6 +811,18 @@ def _mostrar_acciones_finales(df_reclamos, sheet_reclamos, grupos_activos, mater
     if col2.button("📄 Generar PDF de asignaciones por grupo", use_container_width=True):
         _generar_pdf_asignaciones(grupos_activos, materiales_por_grupo, df_pendientes)
 
+    # Lista de retiro de depósito: materiales de todos los grupos del día
+    totales = pd.DataFrame.from_dict(materiales_por_grupo, orient="index").fillna(0).astype(int)
+    if not totales.empty:
+        fecha_hoy = ahora_argentina().strftime("%Y-%m-%d")
+        col3.download_button(
+            label="📦 Lista de materiales del día (CSV)",
+            data=lista_de_retiro(totales).to_csv(index=False).encode("utf-8-sig"),
+            file_name=f"materiales_{fecha_hoy}.csv",
+            mime="text/csv",
+            use_container_width=True
+        )
+
     return cambios
 
 
@@ -665,6 +840,7 @@ def _guardar_cambios(df_reclamos, sheet_reclamos, grupos_activos):
     with st.spinner("Actualizando reclamos..."):
         updates = []
         notificaciones = []
+        indice_ids = get_sheet_index(sheet_reclamos, RECLAMOS_POR_ID)
 
         for grupo in GRUPOS_POSIBLES[:grupos_activos]:
             tecnicos = st.session_state.tecnicos_grupos[grupo]
@@ -673,9 +849,8 @@ def _guardar_cambios(df_reclamos, sheet_reclamos, grupos_activos):
 
             if reclamos_ids:
                 for reclamo_id in reclamos_ids:
-                    fila = df_reclamos[df_reclamos["ID Reclamo"] == reclamo_id]
-                    if not fila.empty:
-                        index = fila.index[0] + 2
+                    index = indice_ids.fila_hoja(reclamo_id)
+                    if index is not None:
                         updates.append({"range": f"I{index}", "values": [["En curso"]]})
                         updates.append({"range": f"J{index}", "values": [[tecnicos_str]]})
 
@@ -686,7 +861,9 @@ def _guardar_cambios(df_reclamos, sheet_reclamos, grupos_activos):
                 })
 
         if updates:
-            success, error = api_manager.safe_sheet_operation(batch_update_sheet, sheet_reclamos, updates, is_batch=True)
+            cola = ColaEscrituras()
+            cola.agregar(sheet_reclamos, updates)
+            success, error = cola.enviar()
             if success:
                 st.success("✅ Reclamos actualizados correctamente en la hoja.")
                 if 'notification_manager' in st.session_state:
@@ -721,7 +898,7 @@ def _generar_pdf_asignaciones(grupos_activos, materiales_por_grupo, df_pendiente
         c.showPage()
         y = height - 40
 
-        tipos = df_pendientes[df_pendientes["ID Reclamo"].isin(reclamos_ids)]["Tipo de reclamo"].value_counts()
+        tipos = df_pendientes[df_pendientes["ID Reclamo"].isin(reclamos_ids)]["Tipo de reclamo"].value_counts().loc[lambda c: c > 0]
         resumen_tipos = " - ".join([f"{v} {k}" for k, v in tipos.items()])
 
         c.setFont("Helvetica-Bold", 16)
@@ -1,70 +1,59 @@
 # components/resumen_jornada.py
 
 import streamlit as st
-import pandas as pd
 from utils.date_utils import ahora_argentina, format_fecha
 
-def render_resumen_jornada(df_reclamos):
-    """Muestra un resumen conciso con los reclamos del día, pendientes y en curso."""
+def render_resumen_jornada(metricas):
+    """
+    Muestra un resumen conciso con los reclamos del día, pendientes y en curso.
+
+    Args:
+        metricas (MetricasReclamos): contadores materializados de la hoja de reclamos
+                                     (ver utils.metricas), sin recorrer los datos
+    """
     st.markdown("---")
     st.markdown("### 📊 Resumen General")
 
-    if df_reclamos.empty:
+    if not len(metricas):
         st.info("No hay datos de reclamos para mostrar.")
         return
 
     try:
-        # Hacemos una copia para evitar modificar el dataframe original
-        df = df_reclamos.copy()
-
-        # Asegurar que la columna de fecha y hora esté en formato datetime
-        # Usamos errors='coerce' para manejar posibles errores de formato
-        df["Fecha y hora"] = pd.to_datetime(df["Fecha y hora"], dayfirst=True, errors='coerce')
-
         # 1. Reclamos cargados hoy
-        # Nos aseguramos de comparar fechas sin tener en cuenta la zona horaria para evitar errores
         hoy = ahora_argentina().date()
-        reclamos_hoy = df[df["Fecha y hora"].dt.date == hoy]
+        reclamos_hoy = metricas.reclamos_del_dia(hoy)
 
         # 2. Reclamos pendientes
-        # Usamos .str.strip().str.lower() para una comparación robusta
-        pendientes = df[df["Estado"].str.strip().str.lower() == "pendiente"]
+        pendientes = metricas.por_estado("Pendiente")
 
         # 3. Reclamos en curso
-        en_curso = df[df["Estado"].str.strip().str.lower() == "en curso"]
+        en_curso = metricas.por_estado("En curso")
 
         # Mostrar las métricas en tres columnas
         col1, col2, col3 = st.columns(3)
         with col1:
-            st.metric(label="📝 Reclamos de Hoy", value=len(reclamos_hoy))
+            st.metric(label="📝 Reclamos de Hoy", value=reclamos_hoy)
         with col2:
-            st.metric(label="⏳ Pendientes", value=len(pendientes))
+            st.metric(label="⏳ Pendientes", value=pendientes)
         with col3:
-            st.metric(label="⚙️ En Curso", value=len(en_curso))
+            st.metric(label="⚙️ En Curso", value=en_curso)
 
         # 👷 SECCIÓN DE TÉCNICOS - INTEGRACIÓN DEL NUEVO CÓDIGO
         st.markdown("### 👷 Reclamos en curso por técnicos")
 
-        if not en_curso.empty and "Técnico" in en_curso.columns:
-            en_curso["Técnico"] = en_curso["Técnico"].fillna("").astype(str)
-            en_curso = en_curso[en_curso["Técnico"].str.strip() != ""]
-
-            en_curso["tecnicos_set"] = en_curso["Técnico"].apply(
-                lambda x: tuple(sorted([t.strip().upper() for t in x.split(",") if t.strip()]))
-            )
-
-            conteo_grupos = en_curso.groupby("tecnicos_set").size().reset_index(name="Cantidad")
+        if en_curso:
+            conteo_grupos = metricas.en_curso_por_tecnicos()
 
-            if not conteo_grupos.empty:
+            if conteo_grupos:
                 st.markdown("#### Distribución de trabajo:")
-                for fila in conteo_grupos.itertuples():
-                    tecnicos = ", ".join(fila.tecnicos_set)
-                    st.markdown(f"- 👥 **{tecnicos}**: {fila.Cantidad} reclamos")
+                for tecnicos_set, cantidad in conteo_grupos:
+                    tecnicos = ", ".join(tecnicos_set)
+                    st.markdown(f"- 👥 **{tecnicos}**: {cantidad} reclamos")
 
-                reclamos_antiguos = en_curso.sort_values("Fecha y hora").head(3)
-                if not reclamos_antiguos.empty:
+                reclamos_antiguos = metricas.en_curso_mas_antiguos(3)
+                if reclamos_antiguos:
                     st.markdown("#### ⏳ Reclamos más antiguos aún en curso:")
-                    for _, row in reclamos_antiguos.iterrows():
+                    for row in reclamos_antiguos:
                         fecha_formateada = format_fecha(row["Fecha y hora"])
                         st.markdown(
                             f"- **{row['Nombre']}** ({row['Nº Cliente']}) - "
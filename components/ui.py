@@ -215,4 +215,42 @@ def expandable_section(title, content, expanded=False, icon="📦"):
             {content}
         </div>
     </div>
-    """
\ No newline at end of file
+    """
+
+
+def _mover_pagina(clave_estado, desplazamiento):
+    st.session_state[clave_estado]["pagina"] += desplazamiento
+
+
+def paginar(df, clave, por_pagina=10, reiniciar_con=None, etiqueta="elementos"):
+    """
+    Lista paginada: dibuja los controles y devuelve sólo las filas de la página visible.
+
+    Así cada rerun crea widgets únicamente para `por_pagina` filas, sin importar
+    cuántas haya en total. La página actual se guarda en session_state bajo
+    `pagina_{clave}` y vuelve a la primera cuando cambia `reiniciar_con`
+    (p. ej. los filtros aplicados). Las filas deben dibujarse con keys propias
+    de cada fila (p. ej. su ID), no con su posición en la página.
+    """
+    total = len(df)
+    if total <= por_pagina:
+        return df
+
+    clave_estado = f"pagina_{clave}"
+    estado = st.session_state.setdefault(clave_estado, {"pagina": 0, "firma": reiniciar_con})
+    if estado["firma"] != reiniciar_con:
+        estado.update(pagina=0, firma=reiniciar_con)
+
+    paginas = (total + por_pagina - 1) // por_pagina
+    estado["pagina"] = min(max(estado["pagina"], 0), paginas - 1)
+    inicio = estado["pagina"] * por_pagina
+    fin = min(inicio + por_pagina, total)
+
+    col_ant, col_info, col_sig = st.columns([1, 3, 1])
+    col_ant.button("◀ Anterior", key=f"{clave}_anterior", disabled=estado["pagina"] == 0,
+                   on_click=_mover_pagina, args=(clave_estado, -1), use_container_width=True)
+    col_info.caption(f"Mostrando {inicio + 1}–{fin} de {total} {etiqueta} · página {estado['pagina'] + 1} de {paginas}")
+    col_sig.button("Siguiente ▶", key=f"{clave}_siguiente", disabled=estado["pagina"] == paginas - 1,
+                   on_click=_mover_pagina, args=(clave_estado, 1), use_container_width=True)
+
+    return df.iloc[inicio:fin]
@@ -15,6 +15,8 @@ WORKSHEET_RECLAMOS = "Reclamos"
 WORKSHEET_CLIENTES = "Clientes"
 WORKSHEET_USUARIOS = "usuarios"
 WORKSHEET_NOTIFICACIONES = "Notificaciones"
+WORKSHEET_ARCHIVO = "Archivo"  # Reclamos resueltos antiguos quitados de la hoja principal
+WORKSHEET_RESUMEN_MENSUAL = "Resumen mensual"  # Totales por mes de los reclamos archivados
 
 MAX_NOTIFICATIONS = 10  # Máximo de notificaciones a mostrar en UI
 
@@ -57,6 +59,8 @@ COLUMNAS_USUARIOS = [
     "username", "password", "nombre", "rol", "activo", "modo_oscuro"
 ]
 
+COLUMNAS_RESUMEN_MENSUAL = ["Mes", "Sector", "Tipo de reclamo", "Cantidad"]
+
 # --------------------------
 # IDENTIFICADORES ÚNICOS
 # --------------------------
@@ -98,6 +102,11 @@ OPCIONES_PERMISOS = {
 # --------------------------
 SECTORES_DISPONIBLES = [str(n) for n in range(1, 18)]
 
+ESTADOS_RECLAMO = ["Pendiente", "En curso", "Desconexión", "Resuelto"]
+ESTADOS_ACTIVOS = ["Pendiente", "En curso", "Desconexión"]  # Reclamos abiertos (datos "calientes")
+
+DIAS_ARCHIVO_RECLAMOS = 30  # Días desde el cierre para archivar un reclamo resuelto
+
 TECNICOS_DISPONIBLES = [
     "Braian", "Conejo", "Juan", "Junior", "Maxi", "Marki", 
     "Ramon", "Roque", "Viki", "Oficina", "Base"
@@ -199,10 +208,43 @@ MATERIALES_POR_RECLAMO = {
 # --------------------------
 # SEGURIDAD Y API
 # --------------------------
-API_DELAY = 2.0  # Segundos entre llamadas a la API
-BATCH_DELAY = 2.0  # Segundos entre operaciones batch
+API_DELAY = 2.0  # Espera base (segundos) del backoff exponencial ante 429/5xx
+BATCH_DELAY = 2.0  # Espera base (segundos) del backoff para operaciones batch
+API_LIMITE_POR_MINUTO = 55  # Llamadas por minuto del proceso (la cuota de Google es 60 por usuario)
+API_RAFAGA = 10  # Llamadas que pueden hacerse seguidas antes de empezar a esperar
+API_MAX_REINTENTOS = 5  # Reintentos ante errores de cuota (429) o del servidor (5xx)
+API_BACKOFF_MAXIMO = 32.0  # Tope en segundos de una espera del backoff
 SESSION_TIMEOUT = 1800  # 30 minutos de inactividad para cerrar sesión
 
+# --------------------------
+# RÉPLICA LOCAL DE LAS HOJAS
+# --------------------------
+REPLICA_DB_PATH = ".cache/replica.sqlite3"  # Archivo SQLite con la copia local de las hojas
+REPLICA_TTL = 120  # Segundos antes de volver a sincronizar una hoja contra Google Sheets
+SYNC_INTERVALO_COMPLETO = 900  # Segundos entre descargas completas (entre medio sólo se bajan diferencias)
+
+# Columnas "sonda" que se descargan en cada sincronización incremental para detectar
+# filas modificadas. Son las que cambian durante el circuito normal de trabajo.
+# Las hojas sin sonda se descargan completas (son chicas).
+SYNC_COLUMNAS_SONDA = {
+    WORKSHEET_RECLAMOS: "I:O",  # Estado, Técnico, Precinto, Atendido por, Fecha_formateada, Anotaciones, ID
+    WORKSHEET_CLIENTES: "F:I",  # Precinto, ID Cliente, Última Modificación, Anotaciones
+}
+
+# --------------------------
+# RECORRIDOS DE LOS GRUPOS
+# --------------------------
+# CSV opcional con el centro de cada sector (columnas Sector, Latitud, Longitud).
+# Una fila con Sector "Base" fija el punto de partida de los grupos. Si el archivo
+# no existe, la distancia se estima con SECTORES_VECINOS y ZONAS_COMPATIBLES.
+CENTROIDES_SECTORES_PATH = "config/centroides_sectores.csv"
+RECORRIDO_TIEMPO_MAXIMO = 0.5  # Segundos por grupo para mejorar el recorrido (2-opt)
+
+# Tiempo de resolución por tipo de reclamo (desde "Fecha y hora" hasta "Fecha_formateada")
+TIEMPO_SERVICIO_POR_DEFECTO = 2.0  # Horas estimadas si todavía no hay historial
+TIEMPO_SERVICIO_MAXIMO = 240.0  # Horas: las resoluciones más largas se descartan (cierres olvidados)
+TIEMPO_SERVICIO_MIN_MUESTRAS = 3  # Cierres mínimos de un tipo para usar su propia estimación
+
 # --------------------------
 # FUNCIONES DE UTILIDAD
 # --------------------------
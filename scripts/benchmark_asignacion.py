@@ -0,0 +1,110 @@
+"""
+Compara la distribución óptima por zonas con la distribución voraz actual.
+
+Genera reclamos pendientes sintéticos (con sectores repartidos de forma pareja y
+despareja) y mide, para cada cantidad de grupos, el desbalance de cargas, las
+zonas repartidas entre grupos y el tiempo de cada método.
+
+Uso (desde la raíz del proyecto):
+    python scripts/benchmark_asignacion.py [--reclamos 50 200 500] [--repeticiones 5]
+"""
+import argparse
+import copy
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+# Agrega el directorio raíz al path para poder importar módulos de la aplicación
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from config.settings import SECTORES_DISPONIBLES
+from components.reclamos.planificacion import (
+    GRUPOS_POSIBLES,
+    SECTORES_VECINOS,
+    distribuir_por_sector_mejorado,
+    distribuir_optimo,
+    _balancear_asignaciones,
+)
+
+
+def _reclamos_sinteticos(cantidad, rng, concentrado):
+    """Reclamos pendientes; con `concentrado` la mitad cae en dos o tres sectores"""
+    pesos = np.ones(len(SECTORES_DISPONIBLES))
+    if concentrado:
+        pesos[rng.choice(len(pesos), size=rng.integers(2, 4), replace=False)] = len(pesos) / 2
+    sectores = rng.choice(SECTORES_DISPONIBLES, size=cantidad, p=pesos / pesos.sum())
+    return pd.DataFrame({
+        "ID Reclamo": [f"R{i:05d}" for i in range(cantidad)],
+        "Sector": sectores,
+        "Estado": "Pendiente",
+    })
+
+
+def _medir(asignaciones, df):
+    """(desbalance, zonas repartidas entre grupos, reclamos sin asignar)"""
+    cargas = [len(ids) for ids in asignaciones.values()]
+    zona_de_sector = {s: z for z, sectores in SECTORES_VECINOS.items() for s in sectores}
+    sector_de_id = dict(zip(df["ID Reclamo"], df["Sector"]))
+    zonas = [
+        {zona_de_sector.get(sector_de_id[i]) for i in ids}
+        for ids in asignaciones.values()
+    ]
+    repartidas = sum(len(z) for z in zonas) - len(set().union(*zonas))
+    sin_asignar = len(df) - sum(cargas)
+    return max(cargas) - min(cargas), repartidas, sin_asignar
+
+
+def _voraz_balanceado(df, grupos):
+    asignaciones = distribuir_por_sector_mejorado(df, grupos).asignaciones
+    return _balancear_asignaciones(copy.deepcopy(asignaciones), df)
+
+
+METODOS = {
+    "voraz": lambda df, grupos: distribuir_por_sector_mejorado(df, grupos).asignaciones,
+    "voraz + balanceo": _voraz_balanceado,
+    "óptimo": lambda df, grupos: distribuir_optimo(df, grupos).asignaciones,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--reclamos", type=int, nargs="+", default=[50, 200, 500])
+    parser.add_argument("--repeticiones", type=int, default=5)
+    parser.add_argument("--semilla", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.semilla)
+    filas = []
+    for cantidad in args.reclamos:
+        for grupos in range(2, len(GRUPOS_POSIBLES) + 1):
+            for repeticion in range(args.repeticiones):
+                df = _reclamos_sinteticos(cantidad, rng, concentrado=repeticion % 2 == 1)
+                for metodo, funcion in METODOS.items():
+                    inicio = time.perf_counter()
+                    asignaciones = funcion(df, grupos)
+                    ms = (time.perf_counter() - inicio) * 1000
+                    desbalance, repartidas, sin_asignar = _medir(asignaciones, df)
+                    filas.append({
+                        "reclamos": cantidad, "grupos": grupos, "método": metodo,
+                        "desbalance": desbalance, "zonas repartidas": repartidas,
+                        "sin asignar": sin_asignar, "ms": ms,
+                    })
+
+    resultados = pd.DataFrame(filas)
+    resumen = resultados.groupby(["reclamos", "grupos", "método"], sort=False).agg(
+        desbalance_medio=("desbalance", "mean"),
+        desbalance_max=("desbalance", "max"),
+        zonas_repartidas=("zonas repartidas", "mean"),
+        sin_asignar=("sin asignar", "mean"),
+        ms_medio=("ms", "mean"),
+        ms_max=("ms", "max"),
+    )
+    with pd.option_context("display.max_rows", None, "display.max_columns", None, "display.width", 140, "display.float_format", "{:.2f}".format):
+        print(resumen)
+
+
+if __name__ == "__main__":
+    main()
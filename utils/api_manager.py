@@ -3,36 +3,225 @@ Módulo para gestión segura de datos con Google Sheets
 Versión 3.2 - Con manejo robusto de errores y compatibilidad con API
 """
 import streamlit as st
+import heapq
+import itertools
+import random
+import threading
 import time
+from contextlib import contextmanager
 from typing import List, Dict, Union, Optional
 
+from config.settings import (
+    API_DELAY,
+    BATCH_DELAY,
+    API_LIMITE_POR_MINUTO,
+    API_RAFAGA,
+    API_MAX_REINTENTOS,
+    API_BACKOFF_MAXIMO,
+)
+
+# Prioridades (menor número = se atiende antes)
+PRIORIDAD_INTERACTIVA = 0  # Escrituras del operador (cerrar un reclamo, guardar cambios)
+PRIORIDAD_NORMAL = 1       # Lecturas de la pantalla actual
+PRIORIDAD_FONDO = 2        # Tareas en segundo plano (consulta de notificaciones)
+
+# Métodos de gspread que escriben en la hoja: se tratan como interactivos por defecto
+_METODOS_ESCRITURA = {
+    "add_worksheet", "append_row", "append_rows", "batch_update", "clear", "delete_rows",
+    "insert_row", "insert_rows", "update", "update_cell", "update_cells",
+    "values_batch_update",
+}
+
+# Escrituras que dan el mismo resultado si se repiten (valores en rangos fijos).
+# batch_update no está porque en un Spreadsheet puede borrar o insertar filas;
+# Worksheet.batch_update con rangos fijos se marca con idempotente=True
+_METODOS_IDEMPOTENTES = {
+    "clear", "update", "update_cell", "update_cells", "values_batch_update",
+}
+
+_CODIGO_CUOTA = 429
+_CODIGOS_SERVIDOR = {500, 502, 503, 504}
+
+
+class LimitadorTokens:
+    """
+    Token bucket compartido por todas las sesiones del proceso.
+
+    Se recarga a `por_minuto / 60` tokens por segundo hasta `rafaga` tokens.
+    Las solicitudes esperan en una cola ordenada por prioridad y las de menor
+    prioridad sólo consumen tokens si queda la reserva indicada para ellas,
+    de modo que una escritura interactiva nunca queda detrás del polling.
+    """
+
+    def __init__(self, por_minuto=API_LIMITE_POR_MINUTO, rafaga=API_RAFAGA):
+        self.tasa = por_minuto / 60.0
+        self.capacidad = float(rafaga)
+        self.tokens = float(rafaga)
+        self.reservas = {
+            PRIORIDAD_INTERACTIVA: 0.0,
+            PRIORIDAD_NORMAL: 1.0,
+            PRIORIDAD_FONDO: rafaga / 2.0,
+        }
+        self._actualizado = time.monotonic()
+        self._cond = threading.Condition()
+        self._cola = []
+        self._orden = itertools.count()
+
+    def _recargar(self):
+        ahora = time.monotonic()
+        self.tokens = min(self.capacidad, self.tokens + (ahora - self._actualizado) * self.tasa)
+        self._actualizado = ahora
+
+    def adquirir(self, prioridad=PRIORIDAD_NORMAL) -> float:
+        """Bloquea hasta obtener un token; devuelve los segundos esperados"""
+        turno = (prioridad, next(self._orden))
+        inicio = time.monotonic()
+        with self._cond:
+            heapq.heappush(self._cola, turno)
+            try:
+                while True:
+                    self._recargar()
+                    necesarios = self.reservas.get(prioridad, 0.0) + 1.0
+                    if self._cola[0] == turno and self.tokens >= necesarios:
+                        self.tokens -= 1.0
+                        return time.monotonic() - inicio
+                    faltan = max(necesarios - self.tokens, 0.0)
+                    self._cond.wait(timeout=max(faltan / self.tasa, 0.05))
+            finally:
+                self._cola.remove(turno)
+                heapq.heapify(self._cola)
+                self._cond.notify_all()
+
+    def penalizar(self):
+        """Ante un 429 se vacía el balde para que todas las sesiones frenen a la vez"""
+        with self._cond:
+            self._recargar()
+            self.tokens = min(self.tokens, 0.0)
+
+
+def _codigo_http(error) -> Optional[int]:
+    """Extrae el código HTTP de un error de gspread/requests, si lo tiene"""
+    respuesta = getattr(error, "response", None)
+    codigo = getattr(respuesta, "status_code", None) or getattr(error, "code", None)
+    try:
+        return int(codigo)
+    except (TypeError, ValueError):
+        return None
+
+
+def _retry_after(error) -> float:
+    """Segundos sugeridos por el servidor en el encabezado Retry-After (0 si no hay)"""
+    respuesta = getattr(error, "response", None)
+    encabezados = getattr(respuesta, "headers", None) or {}
+    try:
+        return float(encabezados.get("Retry-After", 0))
+    except (TypeError, ValueError):
+        return 0.0
+
+
 class ApiManager:
     def __init__(self):
         self.total_calls = 0
         self.error_count = 0
         self.last_call = 0
+        self.retry_count = 0
+        self.throttled_seconds = 0.0
+        self.limitador = LimitadorTokens()
+        self._contexto = threading.local()
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def prioridad(self, nivel):
+        """Fija la prioridad de todas las llamadas hechas dentro del bloque (en este hilo)"""
+        anterior = getattr(self._contexto, "prioridad", None)
+        self._contexto.prioridad = nivel
+        try:
+            yield
+        finally:
+            self._contexto.prioridad = anterior
 
-    def safe_sheet_operation(self, func, *args, is_batch=False, **kwargs):
+    def _resolver_prioridad(self, func, prioridad):
+        if prioridad is not None:
+            return prioridad
+        contexto = getattr(self._contexto, "prioridad", None)
+        if contexto is not None:
+            return contexto
+        if getattr(func, "__name__", "") in _METODOS_ESCRITURA:
+            return PRIORIDAD_INTERACTIVA
+        return PRIORIDAD_NORMAL
+
+    @staticmethod
+    def _resolver_idempotente(func, idempotente):
+        if idempotente is not None:
+            return idempotente
+        nombre = getattr(func, "__name__", "")
+        return nombre not in _METODOS_ESCRITURA or nombre in _METODOS_IDEMPOTENTES
+
+    def safe_sheet_operation(self, func, *args, is_batch=False, prioridad=None, idempotente=None, **kwargs):
         """
         Ejecuta una operación segura sobre la API de Google Sheets
         
+        Cada llamada consume un token del limitador del proceso. Los errores de
+        cuota (429) se reintentan con backoff exponencial y jitter. Los del servidor
+        (5xx) sólo en operaciones idempotentes: con un 5xx la escritura pudo haberse
+        aplicado, y repetir un append o un borrado de filas duplica o borra de más.
+        Las funciones propias que no son métodos de gspread (p. ej.
+        data_manager.batch_update_sheet) se ejecutan sin consumir tokens: las llamadas
+        a la API que hacen internamente pasan otra vez por aquí con la misma prioridad.
+        
         Args:
             func: función de gspread a ejecutar
             *args: argumentos posicionales para la función
-            is_batch: bool, si es operación por lote (sólo informativo)
+            is_batch: bool, si es operación por lote (usa BATCH_DELAY como espera base)
+            prioridad: PRIORIDAD_INTERACTIVA, PRIORIDAD_NORMAL o PRIORIDAD_FONDO.
+                       Por defecto las escrituras son interactivas y las lecturas normales.
+            idempotente: bool, si se puede repetir ante un 5xx. Por defecto sí para
+                         lecturas y escrituras de valores (update, values_batch_update...)
+                         y no para append, insert, delete_rows y batch_update.
             **kwargs: argumentos clave
         
         Returns:
             tuple: (resultado, error) donde error es None si fue exitoso
         """
-        try:
-            self.total_calls += 1
-            self.last_call = time.time()
-            result = func(*args, **kwargs)
-            return result, None
-        except Exception as e:
-            self.error_count += 1
-            return None, str(e)
+        nivel = self._resolver_prioridad(func, prioridad)
+
+        if not hasattr(func, "__self__"):
+            try:
+                with self.prioridad(nivel):
+                    return func(*args, **kwargs), None
+            except Exception as e:
+                with self._lock:
+                    self.error_count += 1
+                return None, str(e)
+
+        reintentables = {_CODIGO_CUOTA}
+        if self._resolver_idempotente(func, idempotente):
+            reintentables |= _CODIGOS_SERVIDOR
+
+        espera_base = BATCH_DELAY if is_batch else API_DELAY
+        for intento in range(API_MAX_REINTENTOS + 1):
+            esperado = self.limitador.adquirir(nivel)
+            with self._lock:
+                self.total_calls += 1
+                self.last_call = time.time()
+                self.throttled_seconds += esperado
+            try:
+                result = func(*args, **kwargs)
+                return result, None
+            except Exception as e:
+                codigo = _codigo_http(e)
+                if codigo not in reintentables or intento == API_MAX_REINTENTOS:
+                    with self._lock:
+                        self.error_count += 1
+                    return None, str(e)
+
+                if codigo == _CODIGO_CUOTA:
+                    self.limitador.penalizar()
+                espera = min(API_BACKOFF_MAXIMO, espera_base * (2 ** intento))
+                espera = max(random.uniform(espera / 2, espera), _retry_after(e))
+                with self._lock:
+                    self.retry_count += 1
+                time.sleep(espera)
 
     def get_api_stats(self):
         """
@@ -41,7 +230,10 @@ class ApiManager:
         return {
             "total_calls": self.total_calls,
             "error_count": self.error_count,
-            "last_call": self.last_call
+            "last_call": self.last_call,
+            "retry_count": self.retry_count,
+            "throttled_seconds": round(self.throttled_seconds, 2),
+            "available_tokens": round(self.limitador.tokens, 2)
         }
 
 def batch_update_sheet(worksheet, updates: List[Dict[str, Union[str, List[List[str]]]]]) -> bool:
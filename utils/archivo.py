@@ -0,0 +1,213 @@
+"""
+Archivo de reclamos resueltos antiguos
+Mueve filas de la hoja de reclamos a la hoja de archivo, acumula un resumen
+mensual y borra las filas archivadas agrupadas en rangos contiguos
+"""
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from config.settings import (
+    COLUMNAS_RECLAMOS,
+    COLUMNAS_RESUMEN_MENSUAL,
+    WORKSHEET_ARCHIVO,
+    WORKSHEET_RESUMEN_MENSUAL,
+)
+from utils.api_manager import api_manager
+from utils.indices import RECLAMOS_POR_ID, registro_indices
+from utils.sincronizacion import agrupar_contiguas, letra_columna, sincronizador
+
+
+def solicitudes_borrado(sheet_id: int, filas: List[int]) -> List[dict]:
+    """
+    Solicitudes deleteDimension para borrar las filas indicadas (números como en la hoja).
+
+    Las filas contiguas se borran con una sola solicitud y los rangos van de abajo
+    hacia arriba, así cada borrado no corre las filas de los siguientes.
+    """
+    return [
+        {
+            "deleteDimension": {
+                "range": {
+                    "sheetId": sheet_id,
+                    "dimension": "ROWS",
+                    "startIndex": inicio - 1,  # la API cuenta desde 0 y el fin es exclusivo
+                    "endIndex": fin,
+                }
+            }
+        }
+        for inicio, fin in reversed(agrupar_contiguas(filas))
+    ]
+
+
+def resumen_mensual(df_reclamos: pd.DataFrame) -> pd.DataFrame:
+    """
+    Cantidad de reclamos por mes de ingreso, sector y tipo (columnas COLUMNAS_RESUMEN_MENSUAL).
+
+    Si falta la fecha de ingreso se usa la de cierre.
+    """
+    fecha = df_reclamos["Fecha y hora"]
+    if "Fecha_formateada_dt" in df_reclamos.columns:
+        fecha = fecha.fillna(df_reclamos["Fecha_formateada_dt"])
+    agrupado = pd.DataFrame({
+        "Mes": fecha.dt.strftime("%Y-%m").fillna("Sin fecha"),
+        "Sector": df_reclamos["Sector"].astype(str),
+        "Tipo de reclamo": df_reclamos["Tipo de reclamo"].astype(str),
+    })
+    return (
+        agrupado.groupby(["Mes", "Sector", "Tipo de reclamo"], observed=True)
+        .size()
+        .rename("Cantidad")
+        .reset_index()
+    )
+
+
+def combinar_resumenes(existente: pd.DataFrame, nuevo: pd.DataFrame) -> pd.DataFrame:
+    """Suma dos resúmenes mensuales por (Mes, Sector, Tipo de reclamo)"""
+    combinado = pd.concat([existente, nuevo], ignore_index=True)
+    combinado["Cantidad"] = pd.to_numeric(combinado["Cantidad"], errors="coerce").fillna(0).astype(int)
+    return (
+        combinado.groupby(["Mes", "Sector", "Tipo de reclamo"], as_index=False)["Cantidad"]
+        .sum()
+        .sort_values(["Mes", "Sector", "Tipo de reclamo"], ignore_index=True)
+    )
+
+
+def _obtener_o_crear_hoja(spreadsheet, titulo: str, encabezados: List[str]):
+    """Hoja del documento con ese título; si no existe la crea con los encabezados"""
+    hojas, error = api_manager.safe_sheet_operation(spreadsheet.worksheets)
+    if error:
+        return None, error
+    for hoja in hojas:
+        if hoja.title == titulo:
+            return hoja, None
+
+    hoja, error = api_manager.safe_sheet_operation(
+        spreadsheet.add_worksheet, titulo, 1, len(encabezados), is_batch=True
+    )
+    if error:
+        return None, error
+    _, error = api_manager.safe_sheet_operation(hoja.append_row, encabezados)
+    return (hoja, None) if not error else (None, error)
+
+
+def _actualizar_resumen(spreadsheet, nuevo: pd.DataFrame) -> Optional[str]:
+    """Suma `nuevo` a la hoja de resumen mensual (es chica: se lee y se reescribe entera)"""
+    hoja, error = _obtener_o_crear_hoja(spreadsheet, WORKSHEET_RESUMEN_MENSUAL, COLUMNAS_RESUMEN_MENSUAL)
+    if error:
+        return error
+    valores, error = api_manager.safe_sheet_operation(hoja.get_all_values)
+    if error:
+        return error
+
+    existente = pd.DataFrame(valores[1:], columns=COLUMNAS_RESUMEN_MENSUAL) if len(valores) > 1 \
+        else pd.DataFrame(columns=COLUMNAS_RESUMEN_MENSUAL)
+    combinado = combinar_resumenes(existente[COLUMNAS_RESUMEN_MENSUAL], nuevo)
+
+    # Las combinaciones sólo se agregan, nunca desaparecen: alcanza con sobrescribir desde A1
+    _, error = api_manager.safe_sheet_operation(
+        hoja.batch_update,
+        [{"range": "A1", "values": [COLUMNAS_RESUMEN_MENSUAL] + combinado.astype(str).values.tolist()}],
+        is_batch=True, idempotente=True
+    )
+    return error
+
+def _verificar_ids(sheet, columna: str, esperados: Dict[int, str]) -> Optional[str]:
+    """
+    Lee la columna de IDs de las filas a borrar (un solo batch_get con los rangos
+    contiguos) y comprueba que sigan teniendo los IDs esperados.
+
+    Args:
+        sheet: hoja de reclamos
+        columna: letra de la columna ID Reclamo
+        esperados: número de fila en la hoja -> ID esperado
+
+    Returns:
+        None si todas coinciden, o el error
+    """
+    rangos = agrupar_contiguas(sorted(esperados))
+    respuesta, error = api_manager.safe_sheet_operation(
+        sheet.batch_get, [f"{columna}{a}:{columna}{b}" for a, b in rangos]
+    )
+    if error:
+        return error
+
+    for (a, b), valores in zip(rangos, respuesta):
+        for numero in range(a, b + 1):
+            fila = valores[numero - a] if numero - a < len(valores) else []
+            actual = str(fila[0]).strip() if fila else ""
+            if actual != esperados[numero]:
+                return f"la fila {numero} tiene el ID '{actual}' y se esperaba '{esperados[numero]}'"
+    return None
+
+
+def archivar_reclamos(sheet_reclamos, df_antiguos: pd.DataFrame) -> Tuple[int, Optional[str]]:
+    """
+    Archiva reclamos: los copia a la hoja de archivo, suma sus totales al resumen
+    mensual y los borra de la hoja de reclamos.
+
+    Las filas se copian tal como están en la hoja (desde la réplica local, sin leer
+    la API) y se ubican por ID Reclamo en esa misma versión. Antes de borrar se
+    vuelve a leer la columna de IDs: si falla el copiado o la hoja cambió mientras
+    tanto, no se borra nada. Ni el copiado ni el borrado se reintentan ante un 5xx,
+    porque pudieron haberse aplicado.
+
+    Args:
+        sheet_reclamos: hoja de reclamos
+        df_antiguos: reclamos a archivar, normalizados (ver utils.modelo_datos)
+
+    Returns:
+        (cantidad archivada, error)
+    """
+    instantanea = sincronizador.instantanea_actual(sheet_reclamos.title)
+    if instantanea is None:
+        return 0, "No hay datos cargados de la hoja de reclamos"
+
+    indice = registro_indices.obtener(instantanea, RECLAMOS_POR_ID)
+    posiciones, encontrados = set(), []
+    for etiqueta, reclamo_id in zip(df_antiguos.index, df_antiguos["ID Reclamo"]):
+        posicion = indice.primera(reclamo_id) if reclamo_id else etiqueta
+        if posicion is not None and posicion < len(instantanea.df) and posicion not in posiciones:
+            posiciones.add(posicion)
+            encontrados.append(etiqueta)
+    if not posiciones:
+        return 0, "No se encontraron los reclamos en la hoja"
+    posiciones = sorted(posiciones)
+
+    crudo = instantanea.df.reindex(columns=COLUMNAS_RECLAMOS).iloc[posiciones]
+    filas_archivo = crudo.fillna("").astype(str).values.tolist()
+
+    spreadsheet = sheet_reclamos.spreadsheet
+    hoja_archivo, error = _obtener_o_crear_hoja(spreadsheet, WORKSHEET_ARCHIVO, COLUMNAS_RECLAMOS)
+    if error:
+        return 0, error
+    _, error = api_manager.safe_sheet_operation(
+        hoja_archivo.append_rows, filas_archivo, is_batch=True, idempotente=False
+    )
+    if error:
+        return 0, error
+
+    error_resumen = _actualizar_resumen(spreadsheet, resumen_mensual(df_antiguos.loc[encontrados]))
+
+    columna_id = letra_columna(instantanea.df.columns.get_loc("ID Reclamo") + 1)
+    esperados = {
+        p + 2: str(reclamo_id).strip()
+        for p, reclamo_id in zip(posiciones, crudo["ID Reclamo"].fillna(""))
+    }
+    error = _verificar_ids(sheet_reclamos, columna_id, esperados)
+    if error:
+        sincronizador.invalidar(sheet_reclamos.title, completo=True)
+        return 0, f"Los reclamos se copiaron al archivo pero la hoja cambió y no se borró nada: {error}"
+
+    _, error = api_manager.safe_sheet_operation(
+        spreadsheet.batch_update,
+        {"requests": solicitudes_borrado(sheet_reclamos.id, list(esperados))},
+        is_batch=True, idempotente=False
+    )
+    # Las filas restantes cambian de posición: la próxima lectura baja la hoja completa
+    sincronizador.invalidar(sheet_reclamos.title, completo=True)
+    if error:
+        return 0, f"Los reclamos se copiaron al archivo pero no se borraron: {error}"
+    if error_resumen:
+        return len(posiciones), f"No se pudo actualizar el resumen mensual: {error_resumen}"
+    return len(posiciones), None
@@ -0,0 +1,244 @@
+"""
+Asignación óptima de reclamos a grupos de trabajo
+Reparto exacto de zonas completas entre grupos y búsqueda local sobre reclamos
+sueltos para equilibrar las cargas sin romper la coherencia geográfica
+"""
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+class ResultadoAsignacion:
+    """
+    Resultado de un reparto de reclamos entre grupos.
+
+    Attributes:
+        asignaciones: grupo -> IDs de reclamo, agrupados por zona y sector
+        zonas_por_grupo: grupo -> zonas que atiende (las propias primero)
+        cargas: grupo -> cantidad de reclamos
+        horas: grupo -> horas estimadas de trabajo (sólo en el reparto por capacidad)
+        materiales: grupo x material (ver utils.materiales), si quien reparte lo completa
+        vista_previa: grupo -> filas de sus reclamos para mostrar, ídem
+    """
+
+    def __init__(self, asignaciones: Dict[str, List[str]], zonas_por_grupo: Dict[str, List[str]],
+                 horas: Optional[Dict[str, float]] = None):
+        self.asignaciones = asignaciones
+        self.zonas_por_grupo = zonas_por_grupo
+        self.cargas = {g: len(ids) for g, ids in asignaciones.items()}
+        self.horas = horas
+        self.materiales = None
+        self.vista_previa = None
+
+    @property
+    def desbalance(self) -> int:
+        """Diferencia entre el grupo más cargado y el menos cargado"""
+        return max(self.cargas.values()) - min(self.cargas.values()) if self.cargas else 0
+
+    @property
+    def zonas_compartidas(self) -> int:
+        """Cantidad de veces que una zona quedó repartida entre más de un grupo"""
+        zonas = [z for zonas in self.zonas_por_grupo.values() for z in zonas]
+        return len(zonas) - len(set(zonas))
+
+
+def _particiones(n: int, k: int) -> Iterator[Tuple[int, ...]]:
+    """
+    Todas las formas de repartir n elementos en exactamente k bloques no vacíos.
+
+    Cada partición aparece una sola vez (el elemento i va a un bloque ya abierto o
+    abre el siguiente), así los grupos, que son intercambiables, no se repiten.
+    """
+    etiquetas: List[int] = []
+
+    def recorrer(i: int, maximo: int) -> Iterator[Tuple[int, ...]]:
+        if i == n:
+            if maximo + 1 == k:
+                yield tuple(etiquetas)
+            return
+        for bloque in range(min(maximo + 2, k)):
+            abiertos = max(maximo, bloque) + 1
+            # Los elementos que quedan tienen que alcanzar para abrir los bloques faltantes
+            if k - abiertos > n - i - 1:
+                continue
+            etiquetas.append(bloque)
+            yield from recorrer(i + 1, abiertos - 1)
+            etiquetas.pop()
+
+    yield from recorrer(0, -1)
+
+
+def _conexo(zonas: List[int], vecinas: np.ndarray) -> bool:
+    """True si las zonas forman un bloque conectado en el grafo de compatibilidad"""
+    pendientes, visitadas = [zonas[0]], {zonas[0]}
+    while pendientes:
+        z = pendientes.pop()
+        for otra in zonas:
+            if otra not in visitadas and vecinas[z, otra]:
+                visitadas.add(otra)
+                pendientes.append(otra)
+    return len(visitadas) == len(zonas)
+
+
+def _busqueda_local(cuenta: np.ndarray, propias: List[set], vecinas: np.ndarray) -> np.ndarray:
+    """
+    Mueve reclamos entre grupos hasta que no haya movimiento que reduzca el desbalance.
+
+    `cuenta[g, z]` es la cantidad de reclamos de la zona z que atiende el grupo g.
+    Un grupo sólo recibe reclamos de una zona que ya atiende o que es compatible
+    (vecina) con alguna de las suyas. Cada movimiento baja la suma de cuadrados
+    de las cargas, así que la búsqueda siempre termina.
+    """
+    cuenta = cuenta.copy()
+    while True:
+        cargas = cuenta.sum(axis=1)
+        movido = False
+        for origen in np.argsort(-cargas, kind="stable"):
+            for destino in np.argsort(cargas, kind="stable"):
+                diferencia = cargas[origen] - cargas[destino]
+                if diferencia <= 1:
+                    break
+                atiende = propias[destino] | set(np.flatnonzero(cuenta[destino]))
+                candidatas = [
+                    z for z in np.flatnonzero(cuenta[origen])
+                    if not atiende or z in atiende or vecinas[z, list(atiende)].any()
+                ]
+                if not candidatas:
+                    continue
+                # Primero zonas que el destino ya atiende, después las que el origen "prestó"
+                z = min(candidatas, key=lambda z: (z not in atiende, z in propias[origen], cuenta[origen, z]))
+                cantidad = min(cuenta[origen, z], diferencia // 2)
+                cuenta[origen, z] -= cantidad
+                cuenta[destino, z] += cantidad
+                movido = True
+                break
+            if movido:
+                break
+        if not movido:
+            return cuenta
+
+
+def optimizar_asignacion(ids: Sequence[str], sectores: Sequence[str], grupos: Sequence[str],
+                         sectores_por_zona: Dict[str, List[str]],
+                         zonas_compatibles: Dict[str, List[str]]) -> ResultadoAsignacion:
+    """
+    Reparte reclamos entre grupos minimizando el desbalance de carga.
+
+    1. Reparto exacto de zonas completas: se prueban todas las particiones de las
+       zonas en tantos bloques como grupos, descartando los bloques cuyas zonas no
+       son vecinas entre sí (ZONAS_COMPATIBLES). Si ninguna partición es conexa se
+       aceptan todas.
+    2. Sobre cada partición, búsqueda local que pasa reclamos del grupo más cargado
+       a uno menos cargado que atienda esa zona o una vecina.
+    Gana la partición con menor desbalance; a igualdad, la que menos zonas reparte.
+
+    Args:
+        ids: ID de cada reclamo pendiente
+        sectores: sector de cada reclamo (mismo orden que `ids`)
+        grupos: nombres de los grupos activos
+        sectores_por_zona: zona -> sectores (p. ej. SECTORES_VECINOS)
+        zonas_compatibles: zona -> zonas vecinas (p. ej. ZONAS_COMPATIBLES)
+    """
+    grupos = list(grupos)
+    if not grupos:
+        return ResultadoAsignacion({}, {})
+
+    zonas = list(sectores_por_zona)
+    zona_de_sector = {str(s): i for i, z in enumerate(zonas) for s in sectores_por_zona[z]}
+    zona_reclamo = np.array([zona_de_sector.get(str(s).strip(), -1) for s in sectores], dtype=int)
+    por_zona = np.bincount(zona_reclamo[zona_reclamo >= 0], minlength=len(zonas))
+
+    vecinas = np.zeros((len(zonas), len(zonas)), dtype=bool)
+    for i, z in enumerate(zonas):
+        for otra in zonas_compatibles.get(z, []):
+            if otra in zonas:
+                vecinas[i, zonas.index(otra)] = vecinas[zonas.index(otra), i] = True
+
+    # 1. Particiones de las zonas en bloques (uno por grupo, o menos si hay más grupos que zonas)
+    bloques = min(len(grupos), len(zonas))
+    particiones = list(_particiones(len(zonas), bloques))
+    conexas = [
+        p for p in particiones
+        if all(_conexo([z for z in range(len(zonas)) if p[z] == b], vecinas) for b in range(bloques))
+    ]
+
+    # 2. Búsqueda local sobre cada partición y elección de la mejor
+    mejor, mejor_clave = None, None
+    for particion in conexas or particiones:
+        cuenta = np.zeros((len(grupos), len(zonas)), dtype=int)
+        cuenta[list(particion), range(len(zonas))] = por_zona
+        propias = [{z for z in range(len(zonas)) if particion[z] == g} for g in range(len(grupos))]
+        cuenta = _busqueda_local(cuenta, propias, vecinas)
+        cargas = cuenta.sum(axis=1)
+        clave = (cargas.max() - cargas.min(), int((cuenta > 0).sum()), int((cargas ** 2).sum()))
+        if mejor_clave is None or clave < mejor_clave:
+            mejor, mejor_clave = (cuenta, propias), clave
+
+    cuenta, propias = mejor
+    return _materializar(ids, sectores, zona_reclamo, cuenta, propias, grupos, zonas)
+
+
+def _materializar(ids, sectores, zona_reclamo, cuenta, propias, grupos, zonas) -> ResultadoAsignacion:
+    """Convierte la matriz grupo x zona en listas de IDs, con los sectores de cada zona juntos"""
+    asignaciones = {g: [] for g in grupos}
+    zonas_por_grupo = {g: [] for g in grupos}
+
+    def orden_sector(i):
+        sector = str(sectores[i]).strip()
+        return (int(sector) if sector.isdigit() else float("inf"), sector, i)
+
+    for z, zona in enumerate(zonas):
+        reclamos_zona = sorted(np.flatnonzero(zona_reclamo == z), key=orden_sector)
+        # El grupo dueño de la zona se queda con los primeros sectores, el resto con lo que sigue
+        orden_grupos = sorted(range(len(grupos)), key=lambda g: (z not in propias[g], g))
+        inicio = 0
+        for g in orden_grupos:
+            if z in propias[g] or cuenta[g, z]:
+                zonas_por_grupo[grupos[g]].append(zona)
+            fin = inicio + cuenta[g, z]
+            asignaciones[grupos[g]].extend(ids[i] for i in reclamos_zona[inicio:fin])
+            inicio = fin
+
+    # Reclamos de sectores sin zona: al grupo menos cargado en cada caso
+    for i in np.flatnonzero(zona_reclamo < 0):
+        grupo = min(grupos, key=lambda g: len(asignaciones[g]))
+        asignaciones[grupo].append(ids[i])
+
+    return ResultadoAsignacion(asignaciones, zonas_por_grupo)
+
+
+def repartir_por_capacidad(ids: Sequence[str], horas: Sequence[float], grupos: Sequence[str],
+                           tecnicos_por_grupo: Dict[str, int]) -> ResultadoAsignacion:
+    """
+    Reparte reclamos equilibrando las horas estimadas por técnico de cada grupo.
+
+    Los reclamos más largos se reparten primero, cada uno al grupo que termina
+    antes su jornada si lo recibe ((horas del grupo + horas del reclamo) / técnicos).
+    Los grupos sin técnicos no reciben reclamos, salvo que ningún grupo tenga.
+
+    Args:
+        ids: ID de cada reclamo pendiente
+        horas: horas estimadas de cada reclamo (mismo orden que `ids`)
+        grupos: nombres de los grupos activos
+        tecnicos_por_grupo: grupo -> cantidad de técnicos asignados
+    """
+    grupos = list(grupos)
+    if not grupos:
+        return ResultadoAsignacion({}, {}, {})
+
+    horas = np.asarray(horas, dtype=float)
+    capacidad = np.array([tecnicos_por_grupo.get(g, 0) for g in grupos], dtype=float)
+    if not capacidad.any():
+        capacidad[:] = 1
+    disponibles = capacidad > 0
+
+    carga = np.zeros(len(grupos))
+    asignaciones = {g: [] for g in grupos}
+    # Orden estable: a igual duración se respeta el orden recibido
+    for i in np.argsort(-horas, kind="stable"):
+        fin = np.where(disponibles, (carga + horas[i]) / np.where(disponibles, capacidad, 1), np.inf)
+        g = int(np.argmin(fin))
+        carga[g] += horas[i]
+        asignaciones[grupos[g]].append(ids[i])
+
+    return ResultadoAsignacion(asignaciones, {g: [] for g in grupos}, dict(zip(grupos, carga.tolist())))
@@ -0,0 +1,256 @@
+"""
+Índices de búsqueda de texto sobre las instantáneas de las hojas
+Búsqueda por palabras y prefijos, o aproximada por trigramas, sin distinguir
+mayúsculas ni acentos
+"""
+import bisect
+import heapq
+import re
+from collections import Counter
+from typing import Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+import pandas as pd
+import unidecode
+
+_PATRON_PALABRA = re.compile(r"[a-z0-9]+")
+
+
+def normalizar_texto(valor) -> str:
+    """Texto en minúsculas y sin acentos ("Ñandú 12" -> "nandu 12")"""
+    if valor is None:
+        return ""
+    return unidecode.unidecode(str(valor)).lower()
+
+
+def palabras(valor) -> List[str]:
+    """Palabras (letras y números) del texto normalizado"""
+    return _PATRON_PALABRA.findall(normalizar_texto(valor))
+
+
+class DefinicionBusqueda:
+    """
+    Describe un índice de búsqueda por palabras.
+
+    Args:
+        nombre: identificador del índice (clave del caché en utils.indices)
+        columnas: columnas cuyo texto se indexa
+        columnas_numericas: columnas donde además se indexan todos los dígitos
+                            juntos (p. ej. "Teléfono": "294 412-345" -> "294412345")
+    """
+
+    def __init__(self, nombre: str, columnas: Sequence[str], columnas_numericas: Sequence[str] = ()):
+        self.nombre = nombre
+        self.columnas = list(columnas)
+        self.columnas_numericas = list(columnas_numericas)
+
+    def palabras_filas(self, df: pd.DataFrame) -> List[FrozenSet[str]]:
+        """Conjunto de palabras de cada fila de `df`"""
+        columnas = [c for c in self.columnas if c in df.columns]
+        textos = [df[c].fillna("").astype(str).tolist() for c in columnas]
+        numericas = [
+            df[c].fillna("").astype(str).str.replace(r"\D", "", regex=True).tolist()
+            for c in self.columnas_numericas if c in df.columns
+        ]
+        # Nombres y calles se repiten: cada texto distinto se normaliza una sola vez
+        por_texto: Dict[str, List[str]] = {}
+        resultado = []
+        for i in range(len(df)):
+            conjunto = set()
+            for texto in textos:
+                valor = texto[i]
+                if valor not in por_texto:
+                    por_texto[valor] = palabras(valor)
+                conjunto.update(por_texto[valor])
+            for digitos in numericas:
+                if digitos[i]:
+                    conjunto.add(digitos[i])
+            resultado.append(frozenset(conjunto))
+        return resultado
+
+    def construir(self, df: pd.DataFrame, version: int) -> "IndiceBusqueda":
+        """Índice completo de `df` (ver utils.indices.RegistroIndices)"""
+        return IndiceBusqueda.construir(self, df, version)
+
+
+class IndiceBusqueda:
+    """
+    Índice invertido palabra -> posiciones de fila, con vocabulario ordenado.
+
+    Cada palabra de la consulta debe coincidir exacta o como prefijo con alguna
+    palabra de la fila. Las coincidencias exactas pesan más que los prefijos y,
+    a igual puntaje, se prefieren las filas más nuevas (más abajo en la hoja).
+    Igual que utils.indices.IndiceHoja, un índice publicado no se modifica.
+    """
+
+    __slots__ = ("definicion", "version", "_posiciones", "_palabras_fila", "_vocabulario")
+
+    def __init__(self, definicion: DefinicionBusqueda, version: int,
+                 posiciones: Dict[str, FrozenSet[int]], palabras_fila: Dict[int, FrozenSet[str]],
+                 vocabulario: List[str]):
+        self.definicion = definicion
+        self.version = version
+        self._posiciones = posiciones
+        self._palabras_fila = palabras_fila
+        self._vocabulario = vocabulario
+
+    @classmethod
+    def construir(cls, definicion: DefinicionBusqueda, df: pd.DataFrame, version: int) -> "IndiceBusqueda":
+        posiciones: Dict[str, set] = {}
+        palabras_fila = {}
+        for posicion, conjunto in enumerate(definicion.palabras_filas(df)):
+            palabras_fila[posicion] = conjunto
+            for palabra in conjunto:
+                posiciones.setdefault(palabra, set()).add(posicion)
+        return cls(
+            definicion, version,
+            {p: frozenset(v) for p, v in posiciones.items()},
+            palabras_fila,
+            sorted(posiciones)
+        )
+
+    def actualizar(self, df: pd.DataFrame, version: int, posiciones: List[int]) -> "IndiceBusqueda":
+        """Índice nuevo con sólo las filas indicadas vueltas a indexar"""
+        por_palabra = dict(self._posiciones)
+        palabras_fila = dict(self._palabras_fila)
+        posiciones = [p for p in posiciones if 0 <= p < len(df)]
+
+        agregadas, descartadas = set(), set()
+        for posicion, nuevas in zip(posiciones, self.definicion.palabras_filas(df.iloc[posiciones])):
+            anteriores = palabras_fila.get(posicion, frozenset())
+            for palabra in anteriores - nuevas:
+                restantes = por_palabra[palabra] - {posicion}
+                if restantes:
+                    por_palabra[palabra] = restantes
+                else:
+                    del por_palabra[palabra]
+                    descartadas.add(palabra)
+            for palabra in nuevas - anteriores:
+                if palabra not in por_palabra:
+                    agregadas.add(palabra)
+                por_palabra[palabra] = por_palabra.get(palabra, frozenset()) | {posicion}
+            palabras_fila[posicion] = nuevas
+
+        # El vocabulario ordenado sólo se toca si cambió el conjunto de palabras
+        vocabulario = self._vocabulario
+        if descartadas:
+            vocabulario = [p for p in vocabulario if p in por_palabra]
+        elif agregadas:
+            vocabulario = list(vocabulario)
+        for palabra in sorted(agregadas):
+            i = bisect.bisect_left(vocabulario, palabra)
+            if palabra in por_palabra and (i == len(vocabulario) or vocabulario[i] != palabra):
+                vocabulario.insert(i, palabra)
+
+        return type(self)(self.definicion, version, por_palabra, palabras_fila, vocabulario)
+
+    def _con_prefijo(self, prefijo: str) -> List[str]:
+        vocabulario = self._vocabulario
+        i = bisect.bisect_left(vocabulario, prefijo)
+        encontradas = []
+        while i < len(vocabulario) and vocabulario[i].startswith(prefijo):
+            encontradas.append(vocabulario[i])
+            i += 1
+        return encontradas
+
+    def buscar(self, consulta: str, limite: int = 20) -> List[Tuple[int, int]]:
+        """
+        Devuelve hasta `limite` pares (posición, puntaje) ordenados por relevancia.
+
+        La consulta es texto libre, p. ej. "gomez 12" o "san mart".
+        """
+        terminos = palabras(consulta)
+        if not terminos:
+            return []
+
+        puntajes: Optional[Dict[int, int]] = None
+        for termino in dict.fromkeys(terminos):
+            del_termino: Dict[int, int] = {}
+            for palabra in self._con_prefijo(termino):
+                peso = 2 if palabra == termino else 1
+                for posicion in self._posiciones[palabra]:
+                    if del_termino.get(posicion, 0) < peso:
+                        del_termino[posicion] = peso
+            if puntajes is None:
+                puntajes = del_termino
+            else:
+                # Todas las palabras de la consulta tienen que aparecer
+                puntajes = {p: s + del_termino[p] for p, s in puntajes.items() if p in del_termino}
+            if not puntajes:
+                return []
+
+        return heapq.nlargest(limite, puntajes.items(), key=lambda par: (par[1], par[0]))
+
+    def __len__(self) -> int:
+        return len(self._palabras_fila)
+
+
+def trigramas(valor) -> FrozenSet[str]:
+    """Trigramas de cada palabra del texto, con bordes ("gomez" -> "  g", " go", "gom", ...)"""
+    resultado = set()
+    for palabra in palabras(valor):
+        relleno = f"  {palabra} "
+        resultado.update(relleno[i:i + 3] for i in range(len(relleno) - 2))
+    return frozenset(resultado)
+
+
+class DefinicionTrigramas(DefinicionBusqueda):
+    """Como DefinicionBusqueda, pero cada fila se indexa por los trigramas de sus palabras"""
+
+    def palabras_filas(self, df: pd.DataFrame) -> List[FrozenSet[str]]:
+        # Cada palabra distinta se descompone una sola vez
+        por_palabra: Dict[str, FrozenSet[str]] = {}
+        resultado = []
+        for conjunto in super().palabras_filas(df):
+            fila = set()
+            for palabra in conjunto:
+                if palabra not in por_palabra:
+                    por_palabra[palabra] = trigramas(palabra)
+                fila.update(por_palabra[palabra])
+            resultado.append(frozenset(fila))
+        return resultado
+
+    def construir(self, df: pd.DataFrame, version: int) -> "IndiceTrigramas":
+        return IndiceTrigramas.construir(self, df, version)
+
+
+class IndiceTrigramas(IndiceBusqueda):
+    """
+    Búsqueda aproximada: tolera errores de tipeo y palabras incompletas.
+
+    El puntaje de una fila es la fracción de los trigramas de la consulta que
+    aparecen en ella ("gomes" encuentra "GOMEZ"). Sólo se recorren las filas que
+    comparten algún trigrama con la consulta.
+    """
+
+    __slots__ = ()
+
+    def buscar(self, consulta: str, limite: int = 20, minimo: float = 0.5) -> List[Tuple[int, float]]:
+        """
+        Devuelve hasta `limite` pares (posición, similitud entre 0 y 1) ordenados por similitud.
+
+        Args:
+            consulta: texto libre
+            minimo: similitud mínima para incluir una fila
+        """
+        buscados = trigramas(consulta)
+        if not buscados:
+            return []
+        coincidencias = Counter()
+        for trigrama in buscados:
+            coincidencias.update(self._posiciones.get(trigrama, ()))
+        necesarios = minimo * len(buscados)
+        candidatos = ((p, n / len(buscados)) for p, n in coincidencias.items() if n >= necesarios)
+        return heapq.nlargest(limite, candidatos, key=lambda par: (par[1], par[0]))
+
+
+# Índices usados por las páginas
+BUSQUEDA_RECLAMOS = DefinicionBusqueda(
+    "busqueda_reclamos",
+    ["Nº Cliente", "Nombre", "Dirección", "Teléfono"],
+    columnas_numericas=["Teléfono"],
+)
+BUSQUEDA_CLIENTES = DefinicionTrigramas(
+    "busqueda_clientes",
+    ["Nº Cliente", "Nombre", "Dirección", "Teléfono"],
+    columnas_numericas=["Teléfono"],
+)
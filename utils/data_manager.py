@@ -5,22 +5,27 @@ Versión mejorada con manejo robusto de datos
 import pandas as pd
 import streamlit as st
 from utils.api_manager import api_manager
+from utils.sincronizacion import sincronizador
+from utils.modelo_datos import modelo_datos
+from utils.indices import registro_indices
 
-@st.cache_data(ttl=30)
 def safe_get_sheet_data(_sheet, columnas=None):
-    """Carga datos de una hoja de forma segura"""
+    """
+    Carga datos de una hoja de forma segura.
+
+    No usa st.cache_data: el sincronizador ya mantiene en memoria la última versión
+    de cada hoja y se invalida en forma selectiva con `invalidate`.
+    """
     try:
-        data, error = api_manager.safe_sheet_operation(_sheet.get_all_values)
+        df, error = sincronizador.obtener(_sheet)
         if error:
             st.error(f"Error al obtener datos: {error}")
             return pd.DataFrame(columns=columnas)
         
-        if len(data) <= 1:
+        if df is None or df.empty:
             return pd.DataFrame(columns=columnas)
         
-        headers = data[0]
-        rows = data[1:]
-        df = pd.DataFrame(rows, columns=headers)
+        df = df.copy()
 
         for col in columnas:
             if col not in df.columns:
@@ -32,6 +37,185 @@ def safe_get_sheet_data(_sheet, columnas=None):
         st.error(f"Error crítico al cargar datos: {str(e)}")
         return pd.DataFrame(columns=columnas)
 
+def get_sheet_snapshot(sheet):
+    """
+    Devuelve la instantánea compartida de la hoja (ver utils.sincronizacion.Instantanea).
+
+    Todas las sesiones reciben el mismo objeto; su DataFrame no debe modificarse.
+    Devuelve None si la hoja nunca pudo cargarse.
+    """
+    instantanea, error = sincronizador.obtener_instantanea(sheet)
+    if error:
+        st.error(f"Error al obtener datos: {error}")
+    return instantanea
+
+def get_sheet_index(sheet, definicion):
+    """
+    Índice (ver utils.indices) de la última versión conocida de la hoja, sin sincronizarla.
+
+    Lo usan las escrituras para traducir una clave (p. ej. ID Reclamo) a su número de
+    fila: esa versión ya incluye lo escrito por todas las sesiones, así que ubicar N
+    filas cuesta N búsquedas y ninguna lectura a la API. `indice.version` indica de
+    qué versión de la hoja salieron los números de fila.
+    """
+    instantanea = sincronizador.instantanea_actual(sheet.title) or get_sheet_snapshot(sheet)
+    if instantanea is None:
+        return definicion.construir(pd.DataFrame(), 0)
+    return registro_indices.obtener(instantanea, definicion)
+
+def get_data_status(sheet_name):
+    """Metadatos de frescura de la última instantánea de la hoja, sin sincronizar (o None)"""
+    return sincronizador.instantanea_actual(sheet_name)
+
+class ContextoDatos:
+    """
+    Acceso perezoso a los datasets de la app.
+
+    Se construye una vez por rerun con las hojas disponibles y se pasa a los
+    render_*: cada dataset se lee recién la primera vez que se accede a él
+    (`datos.reclamos`, `datos.clientes`, `datos.usuarios`) y queda guardado
+    para el resto del rerun. Las páginas que no lo usan nunca lo cargan.
+
+    Los datasets con normalizador se entregan ya tipados (ver utils.modelo_datos):
+    la normalización se comparte entre sesiones y se repite sólo cuando cambia la
+    hoja. Cada página recibe una copia superficial, así que reemplazar columnas no
+    afecta a las demás; los datos en sí deben tratarse como de sólo lectura.
+
+    `datos.indice(nombre, definicion)` devuelve un índice (ver utils.indices) de la
+    misma versión que el DataFrame entregado, con posiciones válidas para `.iloc`.
+
+    Las particiones (p. ej. `datos.reclamos_activos`) son subconjuntos de filas de
+    un dataset que se normalizan por separado, así las páginas que sólo trabajan
+    con reclamos abiertos no cargan todo el historial. Su índice de pandas es la
+    posición de cada fila en la hoja, la misma que devuelven los índices del
+    dataset base (`datos.indice("reclamos", ...)`), así que se usan con `.loc`.
+    `datos.filas(nombre, posiciones)` trae sólo las filas de un índice.
+    """
+
+    def __init__(self, hojas, particiones=None):
+        """
+        Args:
+            hojas: dict nombre -> (worksheet, columnas, normalizador o None), p. ej.
+                   {"reclamos": (sheet_reclamos, COLUMNAS_RECLAMOS, normalizar_reclamos)}
+            particiones: dict nombre -> (dataset base, función de partición), p. ej.
+                         {"reclamos_activos": ("reclamos", reclamos_activos)}
+        """
+        self._hojas = hojas
+        self._particiones = particiones or {}
+        self._cargados = {}
+        self._instantaneas = {}
+
+    def _base(self, nombre):
+        """Dataset base y función de partición (None si no es una partición)"""
+        return self._particiones.get(nombre, (nombre, None))
+
+    def _instantanea(self, nombre):
+        """Instantánea de la hoja del dataset, leída una sola vez por rerun"""
+        if nombre not in self._instantaneas:
+            self._instantaneas[nombre] = get_sheet_snapshot(self.sheet(nombre))
+        return self._instantaneas[nombre]
+
+    def sheet(self, nombre):
+        """Worksheet de gspread asociada al dataset (no dispara ninguna lectura)"""
+        return self._hojas[self._base(nombre)[0]][0]
+
+    def cargar(self, nombre):
+        """Devuelve el DataFrame del dataset, leyéndolo sólo la primera vez"""
+        if nombre not in self._cargados:
+            base, particion = self._base(nombre)
+            _, columnas, normalizador = self._hojas[base]
+            instantanea = self._instantanea(base)
+            if instantanea is None:
+                df = pd.DataFrame(columns=columnas)
+            else:
+                df = modelo_datos.obtener(instantanea, columnas, normalizador, particion)
+            self._cargados[nombre] = df.copy(deep=False)
+        return self._cargados[nombre]
+
+    def filas(self, nombre, posiciones):
+        """Filas normalizadas del dataset en esas posiciones, sin cargar el dataset completo"""
+        _, columnas, normalizador = self._hojas[nombre]
+        posiciones = list(posiciones)
+        if nombre in self._cargados:
+            return self._cargados[nombre].iloc[posiciones]
+        instantanea = self._instantanea(nombre)
+        if instantanea is None or not posiciones:
+            return pd.DataFrame(columns=columnas)
+        return modelo_datos.filas(instantanea, columnas, normalizador, posiciones)
+
+    def version(self, nombre):
+        """Versión de la hoja del dataset usada en este rerun (0 si no hay datos)"""
+        instantanea = self._instantanea(self._base(nombre)[0])
+        return instantanea.version if instantanea is not None else 0
+
+    def indice(self, nombre, definicion):
+        """Índice del dataset correspondiente a la versión que se usa en este rerun"""
+        instantanea = self._instantanea(self._base(nombre)[0])
+        if instantanea is None:
+            return definicion.construir(pd.DataFrame(), 0)
+        return registro_indices.obtener(instantanea, definicion)
+
+    def recargar(self, nombre=None):
+        """Olvida lo leído en este rerun para que el próximo acceso lea de nuevo"""
+        if nombre is None:
+            self._cargados.clear()
+            self._instantaneas.clear()
+        else:
+            base = self._base(nombre)[0]
+            self._instantaneas.pop(base, None)
+            for cargado in list(self._cargados):
+                if self._base(cargado)[0] == base:
+                    del self._cargados[cargado]
+
+    @property
+    def cargados(self):
+        """Nombres de los datasets ya materializados en este rerun"""
+        return list(self._cargados)
+
+    @property
+    def reclamos(self):
+        return self.cargar("reclamos")
+
+    @property
+    def clientes(self):
+        return self.cargar("clientes")
+
+    @property
+    def usuarios(self):
+        return self.cargar("usuarios")
+
+    @property
+    def reclamos_activos(self):
+        return self.cargar("reclamos_activos")
+
+    @property
+    def reclamos_cerrados(self):
+        return self.cargar("reclamos_cerrados")
+
+    @property
+    def sheet_reclamos(self):
+        return self.sheet("reclamos")
+
+    @property
+    def sheet_clientes(self):
+        return self.sheet("clientes")
+
+    @property
+    def sheet_usuarios(self):
+        return self.sheet("usuarios")
+
+def invalidate(sheet_name, rows=None, full=False):
+    """
+    Invalida sólo los datos afectados de una hoja, sin vaciar el resto de los cachés.
+
+    Args:
+        sheet_name: título de la hoja (p. ej. WORKSHEET_RECLAMOS)
+        rows: números de fila de la hoja a volver a descargar en la próxima lectura.
+              Si es None se verifican las diferencias de toda la hoja.
+        full: descarta la copia conocida (necesario tras borrar filas)
+    """
+    sincronizador.invalidar(sheet_name, filas=rows, completo=full)
+
 def safe_normalize(df, column):
     """Normaliza una columna de forma segura"""
     if column in df.columns:
@@ -63,6 +247,7 @@ def update_sheet_data(sheet, data, is_batch=True):
                 )
                 if error:
                     return False, error
+            invalidate(sheet.title, full=True)
         else:
             # Operación simple
             result, error = api_manager.safe_sheet_operation(
@@ -70,11 +255,24 @@ def update_sheet_data(sheet, data, is_batch=True):
             )
             if error:
                 return False, error
+            sincronizador.agregar_fila(sheet.title, data)
         
         return True, None
     except Exception as e:
         return False, str(e)
 
+def append_sheet_row(sheet, fila):
+    """Agrega una fila al final de la hoja y a su réplica local"""
+    try:
+        result, error = api_manager.safe_sheet_operation(sheet.append_row, fila)
+        if error:
+            return False, error
+
+        sincronizador.agregar_fila(sheet.title, fila)
+        return True, None
+    except Exception as e:
+        return False, str(e)
+
 def batch_update_sheet(sheet, updates):
     """Realiza múltiples actualizaciones en batch con mejor manejo de errores."""
     try:
@@ -86,31 +284,120 @@ def batch_update_sheet(sheet, updates):
             if "range" not in update or "values" not in update:
                 return False, "Formato de actualización incorrecto"
         
+        # Valores en rangos fijos: repetirlo ante un 5xx no cambia el resultado
         result, error = api_manager.safe_sheet_operation(
-            sheet.batch_update, updates, is_batch=True
+            sheet.batch_update, updates, is_batch=True, idempotente=True
         )
         
         if error:
             st.error(f"Error en batch_update: {error}")
             # Intentar actualizaciones individuales como fallback
             individual_errors = []
+            aplicadas = []
             for update in updates:
                 _, err = api_manager.safe_sheet_operation(
                     sheet.update, update["range"], update["values"]
                 )
                 if err:
                     individual_errors.append(f"{update['range']}: {err}")
+                else:
+                    aplicadas.append(update)
+            sincronizador.aplicar_actualizaciones(sheet.title, aplicadas)
             
             if individual_errors:
                 return False, f"Errores individuales: {', '.join(individual_errors)}"
             else:
                 return True, "Actualizado con actualizaciones individuales"
         
+        sincronizador.aplicar_actualizaciones(sheet.title, updates)
         return True, None
         
     except Exception as e:
         return False, f"Error inesperado: {str(e)}"
 
+def _rango_con_hoja(sheet, rango):
+    """Antepone el nombre de la hoja a un rango A1 (necesario en values.batchUpdate)"""
+    if "!" in rango:
+        return rango
+    titulo = sheet.title.replace("'", "''")
+    return f"'{titulo}'!{rango}"
+
+class ColaEscrituras:
+    """
+    Acumula actualizaciones de celdas de una acción del usuario y las envía juntas.
+
+    Las actualizaciones se agrupan por spreadsheet: todas las hojas de un mismo
+    documento (p. ej. Reclamos y Clientes) viajan en un único
+    spreadsheets.values.batchUpdate. Se envía con `enviar()` o al salir del bloque
+    `with`, y recién entonces se reflejan en la réplica local.
+
+    Uso:
+        with ColaEscrituras() as cola:
+            cola.agregar(sheet_reclamos, updates_reclamo)
+            cola.agregar(sheet_clientes, updates_cliente)
+            success, error = cola.enviar()
+    """
+
+    def __init__(self):
+        self._pendientes = {}  # id de spreadsheet -> (spreadsheet, {hoja: (sheet, updates)})
+
+    @property
+    def pendientes(self):
+        """Cantidad de rangos todavía sin enviar"""
+        return sum(
+            len(updates)
+            for _, hojas in self._pendientes.values()
+            for _, updates in hojas.values()
+        )
+
+    def agregar(self, sheet, updates):
+        """Encola actualizaciones con el mismo formato que batch_update_sheet"""
+        for update in updates:
+            if "range" not in update or "values" not in update:
+                raise ValueError("Formato de actualización incorrecto")
+        if not updates:
+            return
+        spreadsheet = sheet.spreadsheet
+        _, hojas = self._pendientes.setdefault(spreadsheet.id, (spreadsheet, {}))
+        _, encoladas = hojas.setdefault(sheet.title, (sheet, []))
+        encoladas.extend(updates)
+
+    def enviar(self):
+        """Envía una sola solicitud por spreadsheet. Devuelve (success, error)"""
+        errores = []
+        for spreadsheet_id, (spreadsheet, hojas) in list(self._pendientes.items()):
+            data = [
+                {"range": _rango_con_hoja(sheet, u["range"]), "values": u["values"]}
+                for sheet, updates in hojas.values()
+                for u in updates
+            ]
+            _, error = api_manager.safe_sheet_operation(
+                spreadsheet.values_batch_update,
+                {"valueInputOption": "RAW", "data": data},
+                is_batch=True
+            )
+            del self._pendientes[spreadsheet_id]
+            if error:
+                errores.append(error)
+                continue
+            for titulo, (_, updates) in hojas.items():
+                sincronizador.aplicar_actualizaciones(titulo, updates)
+
+        if errores:
+            return False, "; ".join(errores)
+        return True, None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, tipo, valor, traza):
+        # Lo que quede sin enviar al terminar la acción se envía igual (salvo excepción)
+        if tipo is None and self._pendientes:
+            success, error = self.enviar()
+            if not success:
+                st.error(f"Error al guardar cambios pendientes: {error}")
+        return False
+
 def _verificar_permisos_escritura(sheet):
     """Verifica que tenemos permisos de escritura en la hoja."""
     try:
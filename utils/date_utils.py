@@ -10,6 +10,23 @@ from typing import Union, Optional
 # Configuración de zona horaria (constante global)
 ARGENTINA_TZ = pytz.timezone("America/Argentina/Buenos_Aires")
 
+# Formatos compatibles (ordenados por probabilidad de uso)
+FORMATOS_FECHA = [
+    '%d/%m/%Y %H:%M:%S',  # 25/12/2023 14:30:45
+    '%d-%m-%Y %H:%M:%S',  # 25-12-2023 14:30:45
+    '%d/%m/%Y %H:%M',     # 25/12/2023 14:30
+    '%d-%m-%Y %H:%M',     # 25-12-2023 14:30
+    '%Y-%m-%d %H:%M:%S',  # 2023-12-25 14:30:45 (ISO)
+    '%Y/%m/%d %H:%M:%S',  # 2023/12/25 14:30:45
+    '%d/%m/%Y',           # 25/12/2023
+    '%d-%m-%Y',           # 25-12-2023
+    '%Y%m%d %H:%M:%S',    # 20231225 14:30:45
+    '%Y%m%d',             # 20231225
+]
+
+# Cantidad de valores usados para detectar el formato dominante de una columna
+_MUESTRA_FORMATO = 200
+
 def ahora_argentina() -> datetime:
     """Devuelve la fecha y hora actual en zona horaria Argentina"""
     return datetime.now(ARGENTINA_TZ)
@@ -49,22 +66,8 @@ def parse_fecha(
     if not fecha_str:
         return pd.NaT
     
-    # Lista de formatos compatibles (ordenados por probabilidad de uso)
-    formatos = [
-        '%d/%m/%Y %H:%M:%S',  # 25/12/2023 14:30:45
-        '%d-%m-%Y %H:%M:%S',  # 25-12-2023 14:30:45
-        '%d/%m/%Y %H:%M',     # 25/12/2023 14:30
-        '%d-%m-%Y %H:%M',     # 25-12-2023 14:30
-        '%Y-%m-%d %H:%M:%S',  # 2023-12-25 14:30:45 (ISO)
-        '%Y/%m/%d %H:%M:%S',  # 2023/12/25 14:30:45
-        '%d/%m/%Y',           # 25/12/2023
-        '%d-%m-%Y',           # 25-12-2023
-        '%Y%m%d %H:%M:%S',    # 20231225 14:30:45
-        '%Y%m%d',             # 20231225
-    ]
-    
     # Intentar con cada formato
-    for fmt in formatos:
+    for fmt in FORMATOS_FECHA:
         try:
             dt = datetime.strptime(fecha_str, fmt)
             # Si el formato no incluye hora, establecer medianoche
@@ -88,6 +91,64 @@ def parse_fecha(
     
     return pd.NaT
 
+def _formatos_por_frecuencia(texto: pd.Series) -> list:
+    """Ordena FORMATOS_FECHA según cuántos valores de una muestra de la columna interpreta"""
+    muestra = texto.head(_MUESTRA_FORMATO)
+    aciertos = {
+        fmt: int(pd.to_datetime(muestra, format=fmt, errors='coerce').notna().sum())
+        for fmt in FORMATOS_FECHA
+    }
+    return sorted((f for f in FORMATOS_FECHA if aciertos[f]), key=lambda f: -aciertos[f])
+
+def parse_fecha_series(serie: pd.Series, dayfirst: bool = True) -> pd.Series:
+    """
+    Versión vectorizada de parse_fecha para una columna completa.
+
+    Detecta el formato dominante con una muestra, interpreta toda la columna con un
+    único pd.to_datetime(format=...), prueba los demás formatos sólo sobre lo que
+    quedó sin interpretar y recién el resto (valores raros) pasa por parse_fecha.
+    
+    Args:
+        serie: columna con fechas (strings, datetimes o vacíos)
+        dayfirst: se usa sólo en el fallback celda por celda
+    
+    Returns:
+        Serie datetime64[ns, America/Argentina/Buenos_Aires] con el mismo índice (NaT si no se pudo)
+    """
+    if pd.api.types.is_datetime64_any_dtype(serie):
+        if getattr(serie.dt, 'tz', None) is None:
+            serie = serie.dt.tz_localize(ARGENTINA_TZ, ambiguous='NaT', nonexistent='NaT')
+        return serie.dt.tz_convert(ARGENTINA_TZ).dt.as_unit('ns')
+
+    resultado = pd.Series(pd.NaT, index=serie.index, dtype=f"datetime64[ns, {ARGENTINA_TZ.zone}]")
+    if serie.empty:
+        return resultado
+
+    # Objetos datetime sueltos en una columna de texto: se resuelven celda por celda
+    es_fecha = serie.map(lambda v: isinstance(v, datetime))
+    texto = serie.where(~es_fecha).astype(str).str.strip()
+    pendientes = ~es_fecha & serie.notna() & ~texto.isin(["", "NaT", "nan", "None"])
+
+    for fmt in _formatos_por_frecuencia(texto[pendientes]):
+        if not pendientes.any():
+            break
+        convertidas = pd.to_datetime(texto[pendientes], format=fmt, errors='coerce')
+        convertidas = convertidas[convertidas.notna()]
+        if not convertidas.empty:
+            resultado.loc[convertidas.index] = convertidas.dt.tz_localize(
+                ARGENTINA_TZ, ambiguous='NaT', nonexistent='NaT'
+            )
+            pendientes.loc[convertidas.index] = False
+
+    # Residuo: formatos no previstos u objetos datetime
+    residuo = serie[pendientes | es_fecha]
+    if not residuo.empty:
+        valores = residuo.map(lambda v: parse_fecha(v, dayfirst=dayfirst)).dropna()
+        if not valores.empty:
+            resultado.loc[valores.index] = pd.to_datetime(list(valores), utc=True).tz_convert(ARGENTINA_TZ)
+
+    return resultado
+
 def format_fecha(
     fecha: Union[datetime, pd.Timestamp, str, None], 
     formato: str = '%d/%m/%Y %H:%M',
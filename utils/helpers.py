@@ -61,6 +61,17 @@ def format_datetime(dt, format_str='%d/%m/%Y %H:%M'):
         return ''
     return dt.strftime(format_str)
 
+def format_antiguedad(segundos):
+    """Formatea una antigüedad en segundos como texto corto ("hace 2 min")"""
+    if segundos is None or segundos == float("inf"):
+        return 'sin datos'
+    segundos = int(segundos)
+    if segundos < 60:
+        return f"hace {segundos} s"
+    if segundos < 3600:
+        return f"hace {segundos // 60} min"
+    return f"hace {segundos // 3600} h"
+
 def truncate_text(text, max_length=50):
     """Trunca texto muy largo"""
     if pd.isna(text) or text == '':
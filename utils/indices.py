@@ -0,0 +1,177 @@
+"""
+Índices en memoria sobre las instantáneas de las hojas
+Permiten encontrar filas por clave sin recorrer el DataFrame completo
+"""
+import threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from config.settings import COLUMNA_ID_RECLAMO
+from utils.sincronizacion import sincronizador
+
+
+class DefinicionIndice:
+    """
+    Describe un índice: qué columna es la clave y qué filas entran.
+
+    Args:
+        nombre: identificador del índice (se usa como clave del caché)
+        columna: columna de la hoja cuyo valor (sin espacios) es la clave
+        filtro: función DataFrame -> máscara booleana con las filas a indexar.
+                Se aplica sobre la hoja completa al construir y sólo sobre las
+                filas cambiadas al actualizar, así que debe ser vectorizada.
+    """
+
+    def __init__(self, nombre: str, columna: str,
+                 filtro: Optional[Callable[[pd.DataFrame], pd.Series]] = None):
+        self.nombre = nombre
+        self.columna = columna
+        self.filtro = filtro
+
+    def claves(self, df: pd.DataFrame) -> List[Optional[str]]:
+        """Clave de cada fila de `df` (None si la fila no entra en el índice)"""
+        if self.columna not in df.columns:
+            return [None] * len(df)
+        claves = df[self.columna].fillna("").astype(str).str.strip()
+        incluir = claves != ""
+        if self.filtro is not None:
+            incluir &= self.filtro(df).to_numpy()
+        return [c if ok else None for c, ok in zip(claves.tolist(), incluir.tolist())]
+
+    def construir(self, df: pd.DataFrame, version: int) -> "IndiceHoja":
+        """Índice completo de `df` (ver RegistroIndices)"""
+        return IndiceHoja.construir(self, df, version)
+
+
+class IndiceHoja:
+    """
+    Índice clave -> posiciones de fila de una versión concreta de una hoja.
+
+    Las posiciones son las del DataFrame de la instantánea (posición 0 = fila 2
+    de la hoja) y coinciden con las de los DataFrames normalizados que reciben
+    las páginas, así que se usan directamente con `.iloc`. Igual que las
+    instantáneas, un índice publicado no se modifica: las actualizaciones
+    devuelven un índice nuevo.
+    """
+
+    __slots__ = ("definicion", "version", "_por_clave", "_por_posicion")
+
+    def __init__(self, definicion: DefinicionIndice, version: int,
+                 por_clave: Dict[str, Tuple[int, ...]], por_posicion: Dict[int, str]):
+        self.definicion = definicion
+        self.version = version
+        self._por_clave = por_clave
+        self._por_posicion = por_posicion
+
+    @classmethod
+    def construir(cls, definicion: DefinicionIndice, df: pd.DataFrame, version: int) -> "IndiceHoja":
+        por_clave: Dict[str, List[int]] = {}
+        por_posicion: Dict[int, str] = {}
+        for posicion, clave in enumerate(definicion.claves(df)):
+            if clave is not None:
+                por_clave.setdefault(clave, []).append(posicion)
+                por_posicion[posicion] = clave
+        return cls(definicion, version, {c: tuple(p) for c, p in por_clave.items()}, por_posicion)
+
+    def actualizar(self, df: pd.DataFrame, version: int, posiciones: List[int]) -> "IndiceHoja":
+        """Índice nuevo con sólo las posiciones indicadas recalculadas (filas cambiadas o agregadas)"""
+        por_clave = dict(self._por_clave)
+        por_posicion = dict(self._por_posicion)
+        posiciones = [p for p in posiciones if 0 <= p < len(df)]
+        nuevas = self.definicion.claves(df.iloc[posiciones])
+
+        tocadas = set()
+        for posicion, clave in zip(posiciones, nuevas):
+            anterior = por_posicion.pop(posicion, None)
+            if anterior is not None:
+                por_clave[anterior] = tuple(p for p in por_clave[anterior] if p != posicion)
+                tocadas.add(anterior)
+            if clave is not None:
+                por_clave[clave] = tuple(sorted(por_clave.get(clave, ()) + (posicion,)))
+                por_posicion[posicion] = clave
+        for clave in tocadas:
+            if not por_clave.get(clave):
+                por_clave.pop(clave, None)
+
+        return IndiceHoja(self.definicion, version, por_clave, por_posicion)
+
+    def posiciones(self, clave) -> Tuple[int, ...]:
+        """Posiciones (en orden de la hoja) de las filas con esa clave"""
+        return self._por_clave.get(str(clave).strip(), ())
+
+    def primera(self, clave) -> Optional[int]:
+        """Posición de la primera fila con esa clave, o None"""
+        posiciones = self.posiciones(clave)
+        return posiciones[0] if posiciones else None
+
+    def fila_hoja(self, clave) -> Optional[int]:
+        """Número de fila en la hoja (1 = encabezado) de la primera fila con esa clave"""
+        posicion = self.primera(clave)
+        return posicion + 2 if posicion is not None else None
+
+    def __contains__(self, clave) -> bool:
+        return bool(self.posiciones(clave))
+
+    def __len__(self) -> int:
+        return len(self._por_clave)
+
+
+class RegistroIndices:
+    """
+    Caché de índices compartido por todas las sesiones.
+
+    Guarda el último índice de cada (hoja, definición). Cuando llega una
+    instantánea más nueva pide al sincronizador qué filas cambiaron entre ambas
+    versiones y recalcula sólo esas (p. ej. la fila agregada por un reclamo
+    nuevo); si el historial no alcanza, reconstruye el índice completo.
+
+    Sirve para cualquier índice cuya definición tenga `nombre` y
+    `construir(df, version)`, y cuyo resultado tenga `version` y
+    `actualizar(df, version, posiciones)` (p. ej. los de utils.busqueda).
+    """
+
+    def __init__(self):
+        self._indices: Dict[Tuple[str, str], IndiceHoja] = {}
+        self._lock = threading.Lock()
+
+    def obtener(self, instantanea, definicion):
+        """Índice correspondiente exactamente a la versión de la instantánea"""
+        clave = (instantanea.hoja, definicion.nombre)
+        with self._lock:
+            actual = self._indices.get(clave)
+            if actual is not None and actual.version == instantanea.version:
+                return actual
+
+            cambios = None
+            if actual is not None and actual.version < instantanea.version:
+                cambios = sincronizador.cambios_entre(instantanea.hoja, actual.version, instantanea.version)
+
+            if cambios is None:
+                indice = definicion.construir(instantanea.df, instantanea.version)
+            else:
+                indice = actual.actualizar(instantanea.df, instantanea.version, [n - 2 for n in cambios])
+
+            # Una sesión con una instantánea vieja no pisa un índice más nuevo
+            if actual is None or indice.version >= actual.version:
+                self._indices[clave] = indice
+            return indice
+
+
+def _reclamo_activo(df: pd.DataFrame) -> pd.Series:
+    """Reclamos que bloquean cargar otro: pendientes, en curso o desconexiones a pedido"""
+    estado = df["Estado"].fillna("").astype(str).str.strip().str.lower()
+    tipo = df["Tipo de reclamo"].fillna("").astype(str).str.strip().str.lower()
+    return estado.isin(["pendiente", "en curso"]) | (tipo == "desconexion a pedido")
+
+
+# Índices usados por las páginas
+CLIENTES_POR_NUMERO = DefinicionIndice("clientes_por_numero", "Nº Cliente")
+RECLAMOS_ACTIVOS_POR_CLIENTE = DefinicionIndice(
+    "reclamos_activos_por_cliente", "Nº Cliente", filtro=_reclamo_activo
+)
+RECLAMOS_POR_ID = DefinicionIndice("reclamos_por_id", COLUMNA_ID_RECLAMO)
+RECLAMOS_POR_CLIENTE = DefinicionIndice("reclamos_por_cliente", "Nº Cliente")
+
+# Instancia única global
+registro_indices = RegistroIndices()
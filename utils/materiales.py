@@ -0,0 +1,103 @@
+"""
+Materiales necesarios para los reclamos planificados
+MATERIALES_POR_RECLAMO como matriz tipo x material y la marca de router de cada
+sector como vector, para sumar los materiales de muchos reclamos de una vez
+"""
+from typing import Dict, Sequence
+
+import numpy as np
+import pandas as pd
+
+from config.settings import MATERIALES_POR_RECLAMO, ROUTER_POR_SECTOR
+
+MARCA_ROUTER_POR_DEFECTO = "vsol"
+
+
+class TablaMateriales:
+    """
+    Materiales mínimos por tipo de reclamo, listos para sumar.
+
+    Los materiales que contienen "router" se piden como "router_<marca>", con la
+    marca del sector del reclamo (ROUTER_POR_SECTOR). Por eso la tabla se separa en:
+    - `matriz`: tipos x materiales comunes
+    - `routers`: routers por tipo (un vector), que se reparten por marca según el sector
+    """
+
+    def __init__(self, materiales_por_tipo: Dict[str, Dict[str, int]], router_por_sector: Dict[str, str]):
+        self.tipos = list(materiales_por_tipo)
+        comunes = {}
+        for materiales in materiales_por_tipo.values():
+            comunes.update((m, None) for m in materiales if "router" not in m)
+        self.comunes = list(comunes)
+
+        self.matriz = np.zeros((len(self.tipos), len(self.comunes)), dtype=int)
+        self.routers = np.zeros(len(self.tipos), dtype=int)
+        columna = {m: j for j, m in enumerate(self.comunes)}
+        for i, materiales in enumerate(materiales_por_tipo.values()):
+            for material, cantidad in materiales.items():
+                if "router" in material:
+                    self.routers[i] += cantidad
+                else:
+                    self.matriz[i, columna[material]] = cantidad
+
+        self.marcas = list(dict.fromkeys([*router_por_sector.values(), MARCA_ROUTER_POR_DEFECTO]))
+        self.marca_por_sector = {str(s): self.marcas.index(m) for s, m in router_por_sector.items()}
+        self.materiales = self.comunes + [f"router_{m}" for m in self.marcas]
+
+    def totales_por_grupo(self, grupos: Sequence[str], tipos: Sequence[str], sectores: Sequence[str]) -> pd.DataFrame:
+        """
+        Materiales de cada grupo (filas) por material (columnas).
+
+        Args:
+            grupos: grupo de cada reclamo
+            tipos: tipo de cada reclamo (mismo orden)
+            sectores: sector de cada reclamo (mismo orden)
+        """
+        codigo_grupo, nombres = pd.factorize(pd.Series(grupos, dtype=object), sort=False)
+        codigo_tipo = pd.Categorical(pd.Series(tipos, dtype=object).astype(str), categories=self.tipos).codes
+        defecto = self.marcas.index(MARCA_ROUTER_POR_DEFECTO)
+        marca = np.array(
+            [self.marca_por_sector.get(str(s).strip(), defecto) for s in sectores], dtype=int
+        ).reshape(-1)
+
+        # Tipos desconocidos: fila extra de ceros
+        matriz = np.vstack([self.matriz, np.zeros((1, len(self.comunes)), dtype=int)])
+        routers = np.append(self.routers, 0)
+        codigo_tipo = np.where(codigo_tipo < 0, len(self.tipos), codigo_tipo)
+
+        # Reclamos por (grupo, tipo) x matriz de materiales, y routers por (grupo, marca)
+        conteo = np.zeros((len(nombres), len(self.tipos) + 1), dtype=int)
+        np.add.at(conteo, (codigo_grupo, codigo_tipo), 1)
+        por_marca = np.zeros((len(nombres), len(self.marcas)), dtype=int)
+        np.add.at(por_marca, (codigo_grupo, marca), routers[codigo_tipo])
+
+        return pd.DataFrame(
+            np.hstack([conteo @ matriz, por_marca]),
+            index=pd.Index(nombres, name="Grupo"),
+            columns=self.materiales,
+        )
+
+    def totales(self, tipos: Sequence[str], sectores: Sequence[str]) -> Dict[str, int]:
+        """Materiales de un conjunto de reclamos (sólo los que hacen falta)"""
+        if len(tipos) == 0:
+            return {}
+        fila = self.totales_por_grupo([""] * len(tipos), tipos, sectores).iloc[0]
+        return {m: int(c) for m, c in fila.items() if c}
+
+
+def lista_de_retiro(totales_por_grupo: pd.DataFrame) -> pd.DataFrame:
+    """
+    Lista de retiro de depósito: una fila por material con la cantidad de cada
+    grupo y el total, sin los materiales que nadie necesita.
+    """
+    tabla = totales_por_grupo.T
+    tabla["Total"] = tabla.sum(axis=1)
+    tabla = tabla[tabla["Total"] > 0]
+    tabla.index = [m.replace("_", " ").title() for m in tabla.index]
+    tabla.index.name = "Material"
+    tabla.columns.name = None
+    return tabla.reset_index()
+
+
+# Tabla usada por la planificación
+TABLA_MATERIALES = TablaMateriales(MATERIALES_POR_RECLAMO, ROUTER_POR_SECTOR)
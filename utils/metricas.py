@@ -0,0 +1,139 @@
+"""
+Métricas materializadas de la hoja de reclamos
+Contadores del encabezado y del resumen de la jornada, calculados una vez por
+versión de la hoja y actualizados sólo con las filas que cambiaron
+"""
+from collections import Counter
+from datetime import date
+from typing import Dict, List, Tuple
+
+import pandas as pd
+
+from utils.modelo_datos import normalizar_reclamos, seleccionar_columnas
+
+_COLUMNAS = ["Fecha y hora", "Nº Cliente", "Nombre", "Estado", "Técnico"]
+
+
+class DefinicionMetricas:
+    """
+    Describe las métricas de reclamos.
+
+    Se usa igual que una definición de índice (ver utils.indices.RegistroIndices):
+    `datos.indice("reclamos", METRICAS_RECLAMOS)` devuelve las métricas de la misma
+    versión que el resto del rerun, sin cargar el dataset.
+    """
+
+    def __init__(self, nombre: str):
+        self.nombre = nombre
+
+    def filas(self, df: pd.DataFrame) -> List[Tuple]:
+        """(fecha, estado, técnicos, nombre, Nº cliente) de cada fila cruda de `df`"""
+        tipado = normalizar_reclamos(seleccionar_columnas(df, _COLUMNAS))
+        fechas = tipado["Fecha y hora"]
+        return list(zip(
+            [None if pd.isna(f) else f for f in fechas],
+            tipado["Estado"].astype(str).tolist(),
+            tipado["Técnico"].astype(str).tolist(),
+            tipado["Nombre"].fillna("").astype(str).tolist(),
+            tipado["Nº Cliente"].tolist(),
+        ))
+
+    def construir(self, df: pd.DataFrame, version: int) -> "MetricasReclamos":
+        return MetricasReclamos.construir(self, df, version)
+
+
+def _grupo_tecnicos(tecnico: str) -> Tuple[str, ...]:
+    """Técnicos de un reclamo como grupo ordenado ("MAXI, JUAN" -> ("JUAN", "MAXI"))"""
+    return tuple(sorted(t.strip() for t in tecnico.split(",") if t.strip()))
+
+
+class MetricasReclamos:
+    """
+    Contadores de una versión concreta de la hoja de reclamos.
+
+    Guarda lo que aporta cada fila (fecha de ingreso, estado y técnicos), así una
+    fila agregada o un cambio de estado se descuenta y se vuelve a sumar sin
+    recorrer la hoja. Igual que los índices, un objeto publicado no se modifica.
+    """
+
+    __slots__ = ("definicion", "version", "_filas", "_por_dia", "_por_estado", "_por_tecnicos", "_en_curso")
+
+    def __init__(self, definicion: DefinicionMetricas, version: int, filas: Dict[int, Tuple],
+                 por_dia: Counter, por_estado: Counter, por_tecnicos: Counter, en_curso: Dict[int, Tuple]):
+        self.definicion = definicion
+        self.version = version
+        self._filas = filas
+        self._por_dia = por_dia
+        self._por_estado = por_estado
+        self._por_tecnicos = por_tecnicos
+        self._en_curso = en_curso
+
+    @staticmethod
+    def _aplicar(fila: Tuple, signo: int, posicion: int, por_dia: Counter, por_estado: Counter,
+                 por_tecnicos: Counter, en_curso: Dict[int, Tuple]) -> None:
+        fecha, estado, tecnico, _, _ = fila
+        if fecha is not None:
+            por_dia[fecha.date()] += signo
+        por_estado[estado] += signo
+        if estado == "En curso":
+            grupo = _grupo_tecnicos(tecnico)
+            if grupo:
+                por_tecnicos[grupo] += signo
+            if signo > 0:
+                en_curso[posicion] = fila
+            else:
+                en_curso.pop(posicion, None)
+
+    @classmethod
+    def construir(cls, definicion: DefinicionMetricas, df: pd.DataFrame, version: int) -> "MetricasReclamos":
+        filas = dict(enumerate(definicion.filas(df)))
+        por_dia, por_estado, por_tecnicos, en_curso = Counter(), Counter(), Counter(), {}
+        for posicion, fila in filas.items():
+            cls._aplicar(fila, 1, posicion, por_dia, por_estado, por_tecnicos, en_curso)
+        return cls(definicion, version, filas, por_dia, por_estado, por_tecnicos, en_curso)
+
+    def actualizar(self, df: pd.DataFrame, version: int, posiciones: List[int]) -> "MetricasReclamos":
+        """Métricas nuevas descontando el aporte anterior de las filas indicadas y sumando el actual"""
+        filas = dict(self._filas)
+        por_dia, por_estado = Counter(self._por_dia), Counter(self._por_estado)
+        por_tecnicos, en_curso = Counter(self._por_tecnicos), dict(self._en_curso)
+        posiciones = [p for p in posiciones if 0 <= p < len(df)]
+
+        for posicion, nueva in zip(posiciones, self.definicion.filas(df.iloc[posiciones])):
+            anterior = filas.get(posicion)
+            if anterior is not None:
+                self._aplicar(anterior, -1, posicion, por_dia, por_estado, por_tecnicos, en_curso)
+            self._aplicar(nueva, 1, posicion, por_dia, por_estado, por_tecnicos, en_curso)
+            filas[posicion] = nueva
+
+        return MetricasReclamos(self.definicion, version, filas, +por_dia, +por_estado, +por_tecnicos, en_curso)
+
+    def reclamos_del_dia(self, dia: date) -> int:
+        """Reclamos ingresados ese día (en cualquier estado)"""
+        return self._por_dia.get(dia, 0)
+
+    def por_estado(self, estado: str) -> int:
+        """Cantidad de reclamos en ese estado (p. ej. "Pendiente")"""
+        return self._por_estado.get(estado, 0)
+
+    def en_curso_por_tecnicos(self) -> List[Tuple[Tuple[str, ...], int]]:
+        """(grupo de técnicos, cantidad) de los reclamos en curso con técnico asignado, por grupo"""
+        return sorted(self._por_tecnicos.items())
+
+    def en_curso_mas_antiguos(self, cantidad: int = 3) -> List[Dict]:
+        """Los reclamos en curso que ingresaron primero"""
+        ordenados = sorted(
+            (f for f in self._en_curso.values() if f[2]),
+            key=lambda f: (f[0] is None, f[0] if f[0] is not None else pd.Timestamp.min)
+        )
+        return [
+            {"Fecha y hora": f[0], "Técnico": f[2], "Nombre": f[3], "Nº Cliente": f[4]}
+            for f in ordenados[:cantidad]
+        ]
+
+    def __len__(self) -> int:
+        return len(self._filas)
+
+
+# Métricas usadas por el encabezado y el resumen de la jornada
+METRICAS_RECLAMOS = DefinicionMetricas("metricas_reclamos")
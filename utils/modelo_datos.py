@@ -0,0 +1,229 @@
+"""
+Modelo de datos tipado compartido por todas las páginas
+Normaliza cada hoja una sola vez por versión y entrega el resultado de sólo lectura
+"""
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import unidecode
+
+from config.settings import (
+    ESTADOS_ACTIVOS,
+    ESTADOS_RECLAMO,
+    SECTORES_DISPONIBLES,
+    TECNICOS_DISPONIBLES,
+    TIPOS_RECLAMO,
+)
+from utils.date_utils import parse_fecha_series
+
+# Columnas de reclamos que se guardan como categóricas (pocos valores, muchas filas),
+# con sus valores canónicos. Los valores fuera de la lista se agregan al final.
+CATEGORIAS_RECLAMOS = {
+    "Estado": ESTADOS_RECLAMO,
+    "Sector": SECTORES_DISPONIBLES,
+    "Tipo de reclamo": [t for t in TIPOS_RECLAMO if not t.startswith("—")],
+    "Técnico": [t.upper() for t in TECNICOS_DISPONIBLES],
+}
+
+
+def _texto_limpio(serie: pd.Series) -> pd.Series:
+    """Convierte a texto sin espacios sobrantes (los vacíos quedan como "")"""
+    return serie.fillna("").astype(str).str.strip()
+
+
+def _clave_canonica(valor: str) -> str:
+    """Clave de comparación: sin mayúsculas, acentos ni espacios repetidos"""
+    return " ".join(unidecode.unidecode(valor).split()).lower()
+
+
+def categorizar(serie: pd.Series, canonicas: Iterable[str] = ()) -> pd.Series:
+    """
+    Convierte una columna de texto en categórica con categorías canónicas.
+
+    Las variantes de mayúsculas/acentos/espacios de un valor canónico ("pendiente ",
+    "EN CURSO", "Desconexion") se unifican con su forma canónica. El trabajo por
+    valor se hace sobre los valores distintos (pocos) y no sobre cada fila.
+    """
+    canonicas = list(canonicas)
+    por_clave = {_clave_canonica(c): c for c in canonicas}
+
+    codigos, unicos = pd.factorize(_texto_limpio(serie), sort=False)
+    unicos = [por_clave.get(_clave_canonica(u), u) for u in unicos]
+    extras = sorted(set(unicos) - set(canonicas))
+    categorias = canonicas + extras
+
+    posicion = {c: i for i, c in enumerate(categorias)}
+    traduccion = np.array([posicion[u] for u in unicos], dtype=codigos.dtype)
+    nuevos_codigos = traduccion[codigos] if len(traduccion) else codigos
+    return pd.Series(
+        pd.Categorical.from_codes(nuevos_codigos, categories=categorias),
+        index=serie.index,
+        name=serie.name,
+    )
+
+
+def _tecnicos_canonicos(serie: pd.Series) -> pd.Series:
+    """Lista de técnicos en mayúsculas y separada por ", " (se trabaja sobre los valores distintos)"""
+    texto = _texto_limpio(serie)
+    unicos = texto.unique()
+    mapa = {
+        u: ", ".join(t.strip().upper() for t in u.split(",") if t.strip())
+        for u in unicos
+    }
+    return texto.map(mapa)
+
+
+def normalizar_reclamos(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Tipado de la hoja de reclamos.
+
+    - "Fecha y hora": datetime con zona horaria Argentina
+    - "Fecha_formateada_dt": fecha de cierre como datetime ("Fecha_formateada" queda como texto)
+    - "Estado", "Sector", "Tipo de reclamo", "Técnico": categóricas con valores canónicos
+      (ver CATEGORIAS_RECLAMOS), de modo que `df["Estado"] == "Pendiente"` compara enteros
+    - "Nº Cliente", "ID Reclamo": texto sin espacios sobrantes
+    """
+    df = df.copy()
+    df.columns = [str(c).strip() for c in df.columns]
+
+    for col in ("Nº Cliente", "ID Reclamo"):
+        if col in df.columns:
+            df[col] = _texto_limpio(df[col])
+    if "Técnico" in df.columns:
+        df["Técnico"] = _tecnicos_canonicos(df["Técnico"])
+
+    if "Fecha y hora" in df.columns:
+        df["Fecha y hora"] = parse_fecha_series(df["Fecha y hora"])
+    if "Fecha_formateada" in df.columns:
+        df["Fecha_formateada_dt"] = parse_fecha_series(df["Fecha_formateada"])
+
+    for col, canonicas in CATEGORIAS_RECLAMOS.items():
+        if col in df.columns:
+            df[col] = categorizar(df[col], canonicas)
+
+    return df
+
+
+def _estado_en(df: pd.DataFrame, estados: Iterable[str]) -> np.ndarray:
+    """Máscara de filas cuyo "Estado" (texto crudo) es uno de `estados`, sin mirar mayúsculas ni espacios"""
+    if "Estado" not in df.columns:
+        return np.zeros(len(df), dtype=bool)
+    claves = {_clave_canonica(e) for e in estados}
+    codigos, unicos = pd.factorize(df["Estado"].fillna("").astype(str), sort=False)
+    en_estados = np.array([_clave_canonica(u) in claves for u in unicos], dtype=bool)
+    return en_estados[codigos] if len(unicos) else np.zeros(len(df), dtype=bool)
+
+
+def reclamos_activos(df: pd.DataFrame) -> np.ndarray:
+    """Partición caliente: reclamos pendientes, en curso o en desconexión"""
+    return _estado_en(df, ESTADOS_ACTIVOS)
+
+
+def reclamos_cerrados(df: pd.DataFrame) -> np.ndarray:
+    """Partición fría: el historial (resueltos y cualquier otro estado)"""
+    return ~_estado_en(df, ESTADOS_ACTIVOS)
+
+
+def normalizar_clientes(df: pd.DataFrame) -> pd.DataFrame:
+    """Tipado de la hoja de clientes: "Nº Cliente" y "Sector" como texto sin espacios"""
+    df = df.copy()
+    df.columns = [str(c).strip() for c in df.columns]
+    for col in ("Nº Cliente", "Sector"):
+        if col in df.columns:
+            df[col] = _texto_limpio(df[col])
+    return df
+
+
+def seleccionar_columnas(df: pd.DataFrame, columnas: Optional[List[str]]) -> pd.DataFrame:
+    """Las columnas pedidas, en ese orden (las que falten en la hoja quedan vacías)"""
+    if not columnas:
+        return df
+    faltantes = [c for c in columnas if c not in df.columns]
+    if faltantes:
+        df = df.assign(**{c: None for c in faltantes})
+    return df[columnas]
+
+
+def memoria_df(df: pd.DataFrame) -> int:
+    """Bytes ocupados por un DataFrame, contando el contenido de los strings"""
+    return int(df.memory_usage(deep=True, index=True).sum())
+
+
+class ModeloDatos:
+    """
+    Caché de DataFrames normalizados, compartido por todas las sesiones.
+
+    Cada resultado queda asociado a la versión de la instantánea de la que salió
+    (ver utils.sincronizacion), así que la normalización corre una vez por cambio
+    de la hoja y no una vez por página ni por sesión. Los DataFrames guardados no
+    se modifican: quien los reciba debe copiarlos antes de cambiarlos.
+    """
+
+    def __init__(self):
+        self._cache: Dict[Tuple, Tuple[int, pd.DataFrame]] = {}
+        self._memoria: Dict[Tuple, Dict] = {}
+        self._lock = threading.Lock()
+
+    def obtener(self, instantanea, columnas: Optional[List[str]],
+                normalizador: Optional[Callable[[pd.DataFrame], pd.DataFrame]],
+                particion: Optional[Callable[[pd.DataFrame], np.ndarray]] = None) -> pd.DataFrame:
+        """
+        Devuelve las columnas pedidas de la instantánea, normalizadas.
+
+        Con `particion` (p. ej. reclamos_activos) sólo se normalizan las filas que
+        elige sobre los datos crudos; el índice conserva la posición de cada fila
+        en la hoja, igual que en el dataset completo.
+        """
+        clave = (
+            instantanea.hoja,
+            tuple(columnas or ()),
+            getattr(normalizador, "__name__", None),
+            getattr(particion, "__name__", None),
+        )
+        with self._lock:
+            guardado = self._cache.get(clave)
+            if guardado is not None and guardado[0] == instantanea.version:
+                return guardado[1]
+
+            crudo = seleccionar_columnas(instantanea.df, columnas)
+            if particion is not None:
+                crudo = crudo[particion(crudo)]
+            df = normalizador(crudo) if normalizador else crudo.copy()
+
+            self._cache[clave] = (instantanea.version, df)
+            self._memoria[clave] = {
+                "hoja": instantanea.hoja,
+                "particion": getattr(particion, "__name__", ""),
+                "filas": len(df),
+                "bytes_crudo": memoria_df(crudo),
+                "bytes_tipado": memoria_df(df),
+                "por_columna": df.memory_usage(deep=True, index=False).astype(int).to_dict(),
+            }
+            return df
+
+    def filas(self, instantanea, columnas: Optional[List[str]],
+              normalizador: Optional[Callable[[pd.DataFrame], pd.DataFrame]],
+              posiciones: List[int]) -> pd.DataFrame:
+        """
+        Filas normalizadas en esas posiciones (p. ej. las de un índice), sin normalizar la hoja.
+
+        Si el dataset completo de esa versión ya está en caché se toman de ahí.
+        """
+        clave = (instantanea.hoja, tuple(columnas or ()), getattr(normalizador, "__name__", None), None)
+        with self._lock:
+            guardado = self._cache.get(clave)
+        if guardado is not None and guardado[0] == instantanea.version:
+            return guardado[1].iloc[posiciones]
+        crudo = seleccionar_columnas(instantanea.df, columnas).iloc[posiciones]
+        return normalizador(crudo) if normalizador else crudo.copy()
+
+    def reporte_memoria(self) -> List[Dict]:
+        """Memoria de cada dataset normalizado frente a su versión cruda (todo texto)"""
+        with self._lock:
+            return [dict(m) for m in self._memoria.values()]
+
+
+# Instancia única global
+modelo_datos = ModeloDatos()
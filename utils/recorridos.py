@@ -0,0 +1,188 @@
+"""
+Orden de visita de los reclamos de cada grupo
+Recorrido por sectores con vecino más cercano y mejora 2-opt, con un tiempo
+máximo de cálculo por grupo
+"""
+import os
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+BASE = "Base"
+_RADIO_TIERRA_KM = 6371.0
+
+
+class MatrizDistancias:
+    """
+    Distancias entre sectores.
+
+    Attributes:
+        nodos: sectores (y "Base" si está definida), en el orden de la matriz
+        distancias: matriz nodos x nodos
+        unidad: "km" si viene de coordenadas, None si es una estimación por zonas
+    """
+
+    def __init__(self, nodos: List[str], distancias: np.ndarray, unidad: Optional[str] = None):
+        self.nodos = nodos
+        self.distancias = distancias
+        self.unidad = unidad
+        self.posicion = {n: i for i, n in enumerate(nodos)}
+
+    @property
+    def base(self) -> Optional[int]:
+        """Posición del punto de partida, si está definido"""
+        return self.posicion.get(BASE)
+
+    @classmethod
+    def desde_centroides(cls, df: pd.DataFrame) -> "MatrizDistancias":
+        """Distancia en línea recta (km) entre los centros de los sectores"""
+        df = df.assign(
+            Latitud=pd.to_numeric(df["Latitud"], errors="coerce"),
+            Longitud=pd.to_numeric(df["Longitud"], errors="coerce"),
+        ).dropna(subset=["Latitud", "Longitud"])
+        nodos = df["Sector"].astype(str).str.strip().tolist()
+        lat = np.radians(df["Latitud"].to_numpy(dtype=float))
+        lon = np.radians(df["Longitud"].to_numpy(dtype=float))
+        # Haversine de todos contra todos
+        dlat = lat[:, None] - lat[None, :]
+        dlon = lon[:, None] - lon[None, :]
+        a = np.sin(dlat / 2) ** 2 + np.cos(lat)[:, None] * np.cos(lat)[None, :] * np.sin(dlon / 2) ** 2
+        return cls(nodos, 2 * _RADIO_TIERRA_KM * np.arcsin(np.sqrt(np.clip(a, 0, 1))), "km")
+
+    @classmethod
+    def desde_zonas(cls, sectores_por_zona: Dict[str, List[str]],
+                    zonas_compatibles: Dict[str, List[str]]) -> "MatrizDistancias":
+        """
+        Estimación sin coordenadas: 1 dentro de la misma zona, 2 entre zonas
+        compatibles y 3 entre zonas no compatibles.
+        """
+        nodos = [str(s) for sectores in sectores_por_zona.values() for s in sectores]
+        zona = np.array([z for z, sectores in sectores_por_zona.items() for _ in sectores])
+        compatibles = np.array([
+            [b in zonas_compatibles.get(a, []) or a in zonas_compatibles.get(b, []) for b in zona]
+            for a in zona
+        ], dtype=bool)
+        distancias = np.where(zona[:, None] == zona[None, :], 1.0, np.where(compatibles, 2.0, 3.0))
+        np.fill_diagonal(distancias, 0.0)
+        return cls(nodos, distancias)
+
+
+_cache: Dict[Tuple, MatrizDistancias] = {}
+
+
+def cargar_matriz(ruta: str, sectores_por_zona: Dict[str, List[str]],
+                  zonas_compatibles: Dict[str, List[str]]) -> MatrizDistancias:
+    """
+    Matriz de distancias desde el CSV de centroides, o estimada por zonas si el
+    archivo no existe o no se puede leer. Se vuelve a leer sólo si el archivo cambia.
+    """
+    try:
+        clave = (ruta, os.path.getmtime(ruta))
+    except OSError:
+        clave = (ruta, None)
+
+    if clave not in _cache:
+        matriz = None
+        if clave[1] is not None:
+            try:
+                matriz = MatrizDistancias.desde_centroides(pd.read_csv(ruta, dtype={"Sector": str}))
+            except (OSError, ValueError, KeyError):
+                matriz = None
+        _cache.clear()
+        _cache[clave] = matriz or MatrizDistancias.desde_zonas(sectores_por_zona, zonas_compatibles)
+    return _cache[clave]
+
+
+def _largo(ruta: List[int], d: np.ndarray) -> float:
+    return float(sum(d[a, b] for a, b in zip(ruta, ruta[1:])))
+
+
+def _vecino_mas_cercano(nodos: List[int], inicio: int, d: np.ndarray) -> List[int]:
+    ruta, pendientes = [inicio], set(nodos) - {inicio}
+    while pendientes:
+        actual = ruta[-1]
+        # A igual distancia, el de menor posición (orden estable)
+        siguiente = min(pendientes, key=lambda n: (d[actual, n], n))
+        ruta.append(siguiente)
+        pendientes.remove(siguiente)
+    return ruta
+
+
+def _dos_opt(ruta: List[int], d: np.ndarray, fijo_inicio: bool, limite: float) -> List[int]:
+    """
+    Invierte tramos del camino (abierto, sin volver al inicio) mientras acorten el
+    recorrido o hasta `limite` (time.perf_counter).
+    """
+    ruta = list(ruta)
+    n = len(ruta)
+    mejoro = True
+    while mejoro and time.perf_counter() < limite:
+        mejoro = False
+        for i in range(1 if fijo_inicio else 0, n - 1):
+            for j in range(i + 1, n):
+                antes = d[ruta[i - 1], ruta[i]] if i > 0 else 0.0
+                despues = d[ruta[i - 1], ruta[j]] if i > 0 else 0.0
+                if j + 1 < n:
+                    antes += d[ruta[j], ruta[j + 1]]
+                    despues += d[ruta[i], ruta[j + 1]]
+                if despues < antes - 1e-9:
+                    ruta[i:j + 1] = reversed(ruta[i:j + 1])
+                    mejoro = True
+            if time.perf_counter() >= limite:
+                break
+    return ruta
+
+
+def ordenar_recorrido(ids: Sequence[str], sectores: Sequence[str], matriz: MatrizDistancias,
+                      tiempo_maximo: float = 0.5) -> Tuple[List[str], List[str]]:
+    """
+    Ordena los reclamos de un grupo para recorrer los sectores con menos traslados.
+
+    Los reclamos de un mismo sector quedan juntos y en el orden recibido; los de
+    sectores que no están en la matriz van al final.
+
+    Args:
+        ids: IDs de reclamo del grupo
+        sectores: sector de cada reclamo (mismo orden que `ids`)
+        matriz: distancias entre sectores (ver cargar_matriz)
+        tiempo_maximo: segundos disponibles para la mejora 2-opt
+
+    Returns:
+        (IDs ordenados, sectores en el orden de visita)
+    """
+    limite = time.perf_counter() + tiempo_maximo
+    por_sector: Dict[str, List[str]] = {}
+    for reclamo_id, sector in zip(ids, sectores):
+        por_sector.setdefault(str(sector).strip(), []).append(reclamo_id)
+
+    conocidos = [matriz.posicion[s] for s in por_sector if s in matriz.posicion and s != BASE]
+    desconocidos = [s for s in por_sector if s not in matriz.posicion or s == BASE]
+    d = matriz.distancias
+
+    ruta: List[int] = []
+    if conocidos:
+        base = matriz.base
+        if base is not None:
+            ruta = _dos_opt(_vecino_mas_cercano(conocidos + [base], base, d), d, True, limite)[1:]
+        else:
+            # Sin punto de partida: se prueba arrancar desde cada sector mientras haya tiempo
+            for inicio in sorted(conocidos):
+                candidata = _vecino_mas_cercano(conocidos, inicio, d)
+                if not ruta or _largo(candidata, d) < _largo(ruta, d):
+                    ruta = candidata
+                if time.perf_counter() >= limite:
+                    break
+            ruta = _dos_opt(ruta, d, False, limite)
+
+    orden_sectores = [matriz.nodos[n] for n in ruta] + desconocidos
+    return [i for s in orden_sectores for i in por_sector[s]], orden_sectores
+
+
+def largo_recorrido(orden_sectores: Sequence[str], matriz: MatrizDistancias) -> float:
+    """Largo del recorrido (desde la base, si hay) por los sectores conocidos"""
+    nodos = [matriz.posicion[s] for s in orden_sectores if s in matriz.posicion]
+    if matriz.base is not None:
+        nodos = [matriz.base] + nodos
+    return _largo(nodos, matriz.distancias)
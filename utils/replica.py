@@ -0,0 +1,207 @@
+"""
+Réplica local de las hojas de Google Sheets
+Copia en SQLite que sirve las lecturas y recibe las escrituras (write-through)
+"""
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from config.settings import REPLICA_DB_PATH, REPLICA_TTL
+
+_PATRON_CELDA = re.compile(r"^\$?([A-Za-z]+)\$?(\d+)$")
+
+
+def columna_a_indice(letras: str) -> int:
+    """Convierte una letra de columna de Excel (A, B, ..., AA) a índice 1-based"""
+    indice = 0
+    for letra in letras.upper():
+        indice = indice * 26 + (ord(letra) - 64)
+    return indice
+
+
+def parsear_celda_inicial(rango: str) -> Tuple[int, int]:
+    """
+    Devuelve (fila, columna) 1-based de la celda superior izquierda de un rango A1.
+
+    Acepta rangos con o sin nombre de hoja: "I5", "A2:O2", "'Reclamos'!F12".
+    """
+    celda = rango.split("!")[-1].split(":")[0].strip()
+    match = _PATRON_CELDA.match(celda)
+    if not match:
+        raise ValueError(f"Rango no soportado por la réplica: {rango}")
+    return int(match.group(2)), columna_a_indice(match.group(1))
+
+
+class ReplicaLocal:
+    """
+    Copia local de cada hoja, guardada fila por fila en SQLite.
+
+    Las filas se indexan por su número en la hoja (la fila 1 es el encabezado),
+    de modo que las actualizaciones con rangos A1 se aplican sin recalcular posiciones.
+    Si SQLite no está disponible la réplica queda deshabilitada y la app
+    sigue funcionando directamente contra la API.
+    """
+
+    def __init__(self, ruta: str = REPLICA_DB_PATH, ttl: int = REPLICA_TTL):
+        self.ruta = ruta
+        self.ttl = ttl
+        self.disponible = True
+        self._conn = None
+        self._lock = threading.RLock()
+
+    def _conexion(self):
+        if self._conn is None:
+            directorio = os.path.dirname(self.ruta)
+            if directorio:
+                os.makedirs(directorio, exist_ok=True)
+            conn = sqlite3.connect(self.ruta, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS hojas ("
+                "hoja TEXT PRIMARY KEY, sincronizado_en REAL NOT NULL)"
+            )
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS filas ("
+                "hoja TEXT NOT NULL, fila INTEGER NOT NULL, valores TEXT NOT NULL, "
+                "PRIMARY KEY (hoja, fila))"
+            )
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def _ejecutar(self, operacion, por_defecto=None):
+        """Ejecuta una operación sobre SQLite deshabilitando la réplica ante fallas"""
+        if not self.disponible:
+            return por_defecto
+        with self._lock:
+            try:
+                return operacion(self._conexion())
+            except (sqlite3.Error, OSError):
+                self.disponible = False
+                return por_defecto
+
+    def sincronizado_en(self, hoja: str) -> Optional[float]:
+        """Momento (epoch) de la última sincronización de la hoja, o None si no hay copia"""
+        def _op(conn):
+            fila = conn.execute(
+                "SELECT sincronizado_en FROM hojas WHERE hoja = ?", (hoja,)
+            ).fetchone()
+            return fila[0] if fila else None
+
+        return self._ejecutar(_op)
+
+    def esta_vigente(self, hoja: str) -> bool:
+        """Indica si la copia local de la hoja se sincronizó hace menos de `ttl` segundos"""
+        momento = self.sincronizado_en(hoja)
+        return momento is not None and (time.time() - momento) < self.ttl
+
+    def marcar_sincronizada(self, hoja: str) -> None:
+        """Registra que la copia local acaba de verificarse contra la hoja"""
+        def _op(conn):
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO hojas (hoja, sincronizado_en) VALUES (?, ?)",
+                    (hoja, time.time())
+                )
+
+        self._ejecutar(_op)
+
+    def leer(self, hoja: str) -> Optional[List[List[str]]]:
+        """Devuelve los valores de la hoja con el mismo formato que get_all_values"""
+        def _op(conn):
+            if conn.execute("SELECT 1 FROM hojas WHERE hoja = ?", (hoja,)).fetchone() is None:
+                return None
+            filas = conn.execute(
+                "SELECT fila, valores FROM filas WHERE hoja = ? ORDER BY fila", (hoja,)
+            ).fetchall()
+            valores = []
+            for numero, contenido in filas:
+                # Rellenar filas intermedias vacías para respetar la numeración de la hoja
+                while len(valores) < numero - 1:
+                    valores.append([])
+                valores.append(json.loads(contenido))
+            ancho = max((len(f) for f in valores), default=0)
+            return [f + [""] * (ancho - len(f)) for f in valores]
+
+        return self._ejecutar(_op)
+
+    def reemplazar(self, hoja: str, valores: List[List[str]]) -> bool:
+        """Reemplaza por completo la copia local de la hoja"""
+        def _op(conn):
+            with conn:
+                conn.execute("DELETE FROM filas WHERE hoja = ?", (hoja,))
+                conn.executemany(
+                    "INSERT INTO filas (hoja, fila, valores) VALUES (?, ?, ?)",
+                    [(hoja, i + 1, json.dumps(fila)) for i, fila in enumerate(valores)]
+                )
+                conn.execute(
+                    "INSERT OR REPLACE INTO hojas (hoja, sincronizado_en) VALUES (?, ?)",
+                    (hoja, time.time())
+                )
+            return True
+
+        return self._ejecutar(_op, por_defecto=False)
+
+    def aplicar_actualizaciones(self, hoja: str, updates: List[Dict]) -> bool:
+        """Aplica sobre la copia local las mismas actualizaciones enviadas a batch_update"""
+        def _op(conn):
+            with conn:
+                for update in updates:
+                    fila_inicial, col_inicial = parsear_celda_inicial(update["range"])
+                    valores = update["values"]
+                    if not isinstance(valores, list):
+                        valores = [[valores]]
+                    for desplazamiento, valores_fila in enumerate(valores):
+                        numero = fila_inicial + desplazamiento
+                        actual = conn.execute(
+                            "SELECT valores FROM filas WHERE hoja = ? AND fila = ?", (hoja, numero)
+                        ).fetchone()
+                        fila = json.loads(actual[0]) if actual else []
+                        for j, valor in enumerate(valores_fila):
+                            posicion = col_inicial - 1 + j
+                            while len(fila) <= posicion:
+                                fila.append("")
+                            fila[posicion] = "" if valor is None else str(valor)
+                        conn.execute(
+                            "INSERT OR REPLACE INTO filas (hoja, fila, valores) VALUES (?, ?, ?)",
+                            (hoja, numero, json.dumps(fila))
+                        )
+            return True
+
+        try:
+            return self._ejecutar(_op, por_defecto=False)
+        except ValueError:
+            # Rango que no sabemos interpretar: forzar una sincronización completa
+            self.invalidar(hoja)
+            return False
+
+    def agregar_fila(self, hoja: str, fila: List) -> bool:
+        """Agrega una fila al final de la copia local (equivalente a append_row)"""
+        def _op(conn):
+            with conn:
+                ultima = conn.execute(
+                    "SELECT MAX(fila) FROM filas WHERE hoja = ?", (hoja,)
+                ).fetchone()[0] or 0
+                conn.execute(
+                    "INSERT INTO filas (hoja, fila, valores) VALUES (?, ?, ?)",
+                    (hoja, ultima + 1, json.dumps(["" if v is None else str(v) for v in fila]))
+                )
+            return True
+
+        return self._ejecutar(_op, por_defecto=False)
+
+    def invalidar(self, hoja: str) -> None:
+        """Marca la hoja como vencida para que la próxima lectura la sincronice"""
+        def _op(conn):
+            with conn:
+                conn.execute("UPDATE hojas SET sincronizado_en = 0 WHERE hoja = ?", (hoja,))
+
+        self._ejecutar(_op)
+
+
+# Instancia única global
+replica = ReplicaLocal()
@@ -12,7 +12,7 @@ import pandas as pd
 from PIL import Image, ImageDraw, ImageFont
 import streamlit as st
 
-from utils.date_utils import ahora_argentina, format_fecha
+from utils.date_utils import ahora_argentina, format_fecha, ARGENTINA_TZ
 
 
 def _to_datetime_clean(series: pd.Series) -> pd.Series:
@@ -24,14 +24,25 @@ def _to_datetime_clean(series: pd.Series) -> pd.Series:
     return out
 
 
+def _fecha_local(series: pd.Series) -> pd.Series:
+    """Fecha sin zona horaria en hora argentina; reutiliza columnas ya tipadas por el modelo de datos"""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        if getattr(series.dt, "tz", None) is not None:
+            return series.dt.tz_convert(ARGENTINA_TZ).dt.tz_localize(None)
+        return series
+    return _to_datetime_clean(series)
+
+
 def _prep_df(df_reclamos: pd.DataFrame) -> Tuple[pd.DataFrame, pd.Timestamp, pd.Timestamp]:
     df = df_reclamos.copy()
     df.columns = [str(c).strip() for c in df.columns]
     for col in ("Fecha y hora", "Fecha_formateada", "Estado", "Técnico", "Tipo de reclamo"):
         if col not in df.columns:
             df[col] = pd.NA
-    df["Fecha y hora"] = _to_datetime_clean(df["Fecha y hora"])
-    df["Fecha_formateada"] = _to_datetime_clean(df["Fecha_formateada"])
+    df["Fecha y hora"] = _fecha_local(df["Fecha y hora"])
+    df["Fecha_formateada"] = _fecha_local(
+        df["Fecha_formateada_dt"] if "Fecha_formateada_dt" in df.columns else df["Fecha_formateada"]
+    )
     df["Estado"] = df["Estado"].astype(str).str.strip().str.lower()
     df["Técnico"] = df["Técnico"].fillna("Sin técnico").astype(str).str.strip()
     df["Tipo de reclamo"] = df["Tipo de reclamo"].fillna("Sin tipo").astype(str).str.strip()
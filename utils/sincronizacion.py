@@ -0,0 +1,439 @@
+"""
+Sincronización incremental de hojas de Google Sheets
+Mantiene un DataFrame por hoja y sólo descarga las filas nuevas o modificadas
+"""
+import itertools
+import threading
+from collections import deque
+import time
+import zlib
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+
+from config.settings import REPLICA_TTL, SYNC_COLUMNAS_SONDA, SYNC_INTERVALO_COMPLETO
+from utils.api_manager import api_manager
+from utils.replica import replica, columna_a_indice, parsear_celda_inicial
+
+
+def letra_columna(n: int) -> str:
+    """Convierte un índice 1-based de columna a su letra de Excel"""
+    letras = ""
+    while n:
+        n, resto = divmod(n - 1, 26)
+        letras = chr(65 + resto) + letras
+    return letras
+
+
+def _huella(valores: List[str]) -> int:
+    """Huella estable de una lista de celdas"""
+    return zlib.crc32("\x1f".join(valores).encode("utf-8"))
+
+
+def _ajustar(fila: List, ancho: int) -> List[str]:
+    """Recorta o rellena una fila para que tenga exactamente `ancho` celdas"""
+    fila = ["" if v is None else str(v) for v in fila[:ancho]]
+    return fila + [""] * (ancho - len(fila))
+
+
+def agrupar_contiguas(numeros: List[int]) -> List[Tuple[int, int]]:
+    """Agrupa números de fila ordenados en rangos (inicio, fin) contiguos"""
+    rangos = []
+    for numero in sorted(numeros):
+        if rangos and numero == rangos[-1][1] + 1:
+            rangos[-1] = (rangos[-1][0], numero)
+        else:
+            rangos.append((numero, numero))
+    return rangos
+
+
+# Cambios recordados por hoja para que los índices se actualicen sin reconstruirse
+_HISTORIAL_CAMBIOS = 256
+
+# Contador global: cada cambio sobre cualquier hoja produce una versión nueva y única
+_versiones = itertools.count(1)
+
+
+class Instantanea:
+    """
+    Versión inmutable de una hoja entregada a las sesiones.
+
+    El DataFrame nunca se modifica después de publicado: cada cambio genera un
+    DataFrame nuevo, así que todas las sesiones que esperaron la misma descarga
+    comparten el mismo objeto sin riesgo. Quien necesite modificarlo debe copiarlo.
+    """
+
+    __slots__ = ("hoja", "df", "version", "sincronizado_en", "error")
+
+    def __init__(self, hoja: str, df: pd.DataFrame, version: int, sincronizado_en: float,
+                 error: Optional[str] = None):
+        self.hoja = hoja
+        self.df = df
+        self.version = version
+        self.sincronizado_en = sincronizado_en
+        self.error = error
+
+    @property
+    def edad(self) -> float:
+        """Segundos desde la última verificación contra Google Sheets"""
+        return max(time.time() - self.sincronizado_en, 0.0) if self.sincronizado_en else float("inf")
+
+    @property
+    def desactualizada(self) -> bool:
+        """True si la última sincronización falló y se sirven datos anteriores"""
+        return self.error is not None
+
+
+class EstadoHoja:
+    """Última versión conocida de una hoja: encabezados, DataFrame y huellas por fila"""
+
+    def __init__(self, encabezados: List[str], filas: List[List[str]], sincronizado_en: float):
+        self.encabezados = encabezados
+        self.df = pd.DataFrame(filas, columns=encabezados)
+        self.huellas: List[Optional[int]] = []
+        self.sincronizado_en = sincronizado_en
+        self.completo_en = sincronizado_en
+        self.filas_pendientes = set()
+        self.version = next(_versiones)
+        # (versión anterior, versión nueva, números de fila tocados) de cada parche
+        self.cambios = deque(maxlen=_HISTORIAL_CAMBIOS)
+        self.ultimo_error: Optional[str] = None
+        self.reintentar_en = 0.0
+
+    @property
+    def filas(self) -> int:
+        """Cantidad de filas de la hoja, incluyendo el encabezado"""
+        return len(self.df) + 1
+
+
+class SincronizadorHojas:
+    """
+    Motor de sincronización incremental.
+
+    En cada sincronización descarga la columna A (para conocer la cantidad de filas)
+    y las columnas sonda de la hoja; compara la huella de cada fila con la conocida
+    y sólo pide los rangos completos de las filas nuevas o modificadas, que se
+    parchean sobre el DataFrame en memoria y sobre la réplica local.
+    Cada `intervalo_completo` segundos, o si se borraron filas, se descarga todo.
+
+    Las sincronizaciones son "single-flight": hay un candado por hoja, de modo que
+    si varias sesiones piden la misma hoja vencida sólo una llama a la API y las
+    demás reciben la misma instantánea al terminar. Hojas distintas no se bloquean.
+    """
+
+    def __init__(self, ttl=REPLICA_TTL, intervalo_completo=SYNC_INTERVALO_COMPLETO, sondas=None):
+        self.ttl = ttl
+        self.intervalo_completo = intervalo_completo
+        self.sondas = SYNC_COLUMNAS_SONDA if sondas is None else sondas
+        self._estados: Dict[str, EstadoHoja] = {}
+        self._locks: Dict[str, threading.RLock] = {}
+        self._lock = threading.Lock()
+
+    def _lock_hoja(self, hoja: str) -> threading.RLock:
+        """Candado propio de cada hoja (se crea la primera vez que se usa)"""
+        with self._lock:
+            if hoja not in self._locks:
+                self._locks[hoja] = threading.RLock()
+            return self._locks[hoja]
+
+    # --- Lectura ---
+    def obtener(self, sheet) -> Tuple[Optional[pd.DataFrame], Optional[str]]:
+        """Devuelve el DataFrame actualizado de la hoja (todas sus columnas)"""
+        instantanea, error = self.obtener_instantanea(sheet)
+        if instantanea is None:
+            return None, error
+        return instantanea.df, None
+
+    def obtener_instantanea(self, sheet) -> Tuple[Optional[Instantanea], Optional[str]]:
+        """Devuelve la instantánea vigente de la hoja, sincronizándola si venció"""
+        hoja = sheet.title
+        with self._lock_hoja(hoja):
+            estado = self._estados.get(hoja) or self._cargar_desde_replica(hoja)
+            ahora = time.time()
+
+            if estado is not None and (ahora - estado.sincronizado_en < self.ttl or ahora < estado.reintentar_en):
+                if estado.filas_pendientes:
+                    self._descargar_filas(sheet, estado, sorted(estado.filas_pendientes))
+                return self._instantanea(hoja, estado), None
+
+            error = None
+            if estado is None or ahora - estado.completo_en >= self.intervalo_completo or hoja not in self.sondas:
+                error = self._sincronizar_completo(sheet)
+            else:
+                error = self._sincronizar_diferencias(sheet, estado)
+
+            estado = self._estados.get(hoja)
+            if estado is None:
+                return None, error
+            # Ante un error de la API se sirve la última versión conocida, marcada como desactualizada
+            estado.ultimo_error = error
+            if error:
+                # No reintentar en cada rerun mientras la API siga fallando
+                estado.reintentar_en = ahora + min(self.ttl, 30)
+            return self._instantanea(hoja, estado), None
+
+    def _instantanea(self, hoja: str, estado: EstadoHoja) -> Instantanea:
+        return Instantanea(hoja, estado.df, estado.version, estado.sincronizado_en, estado.ultimo_error)
+
+    def instantanea_actual(self, hoja: str) -> Optional[Instantanea]:
+        """Instantánea conocida de la hoja sin sincronizar (None si nunca se cargó)"""
+        estado = self._estados.get(hoja)
+        return self._instantanea(hoja, estado) if estado is not None else None
+
+    def _cargar_desde_replica(self, hoja: str) -> Optional[EstadoHoja]:
+        valores = replica.leer(hoja)
+        if not valores:
+            return None
+        return self._crear_estado(hoja, valores, replica.sincronizado_en(hoja) or 0)
+
+    def _crear_estado(self, hoja: str, valores: List[List[str]], momento: float) -> EstadoHoja:
+        encabezados = [str(h) for h in valores[0]]
+        filas = [_ajustar(f, len(encabezados)) for f in valores[1:]]
+        estado = EstadoHoja(encabezados, filas, momento)
+        estado.huellas = [self._huella_sonda(hoja, f) for f in filas]
+        self._estados[hoja] = estado
+        return estado
+
+    def _columnas_sonda(self, hoja: str) -> Tuple[int, int]:
+        inicio, fin = self.sondas[hoja].split(":")
+        return columna_a_indice(inicio), columna_a_indice(fin)
+
+    def _huella_sonda(self, hoja: str, fila: List[str]) -> Optional[int]:
+        if hoja not in self.sondas:
+            return None
+        inicio, fin = self._columnas_sonda(hoja)
+        return _huella(_ajustar(fila[inicio - 1:fin], fin - inicio + 1))
+
+    def _sincronizar_completo(self, sheet) -> Optional[str]:
+        data, error = api_manager.safe_sheet_operation(sheet.get_all_values)
+        if error:
+            return error
+        if not data:
+            data = [[]]
+        replica.reemplazar(sheet.title, data)
+        anterior = self._estados.get(sheet.title)
+        estado = self._crear_estado(sheet.title, data, time.time())
+        if anterior is not None:
+            self._continuar_historial(anterior, estado)
+        return None
+
+    def _continuar_historial(self, anterior: EstadoHoja, estado: EstadoHoja) -> None:
+        """
+        Enlaza una descarga completa con la versión anterior de la hoja.
+
+        Si no se borraron filas, la descarga se registra como un cambio más sobre
+        las filas que difieren (y si no difiere ninguna se conserva la versión),
+        así los índices y cachés por versión no se reconstruyen cada
+        `intervalo_completo` segundos.
+        """
+        if anterior.encabezados != estado.encabezados or len(estado.df) < len(anterior.df):
+            return
+        filas_anteriores = anterior.df.values.tolist()
+        filas_nuevas = estado.df.values.tolist()
+        distintas = frozenset(
+            i + 2 for i, fila in enumerate(filas_nuevas)
+            if i >= len(filas_anteriores) or fila != filas_anteriores[i]
+        )
+        estado.cambios = anterior.cambios
+        if not distintas:
+            estado.df = anterior.df
+            estado.version = anterior.version
+        else:
+            estado.cambios.append((anterior.version, estado.version, distintas))
+
+    def _sincronizar_diferencias(self, sheet, estado: EstadoHoja) -> Optional[str]:
+        hoja = sheet.title
+        inicio, fin = self._columnas_sonda(hoja)
+        ancho_sonda = fin - inicio + 1
+        rango_sonda = f"{letra_columna(inicio)}1:{letra_columna(fin)}"
+
+        respuesta, error = api_manager.safe_sheet_operation(sheet.batch_get, ["A1:A", rango_sonda])
+        if error:
+            return error
+        columna_a, sonda = respuesta[0], respuesta[1]
+        filas_remotas = len(columna_a)
+
+        # Filas borradas o encabezado distinto: las posiciones ya no son confiables
+        encabezado_sonda = _ajustar(sonda[0] if sonda else [], ancho_sonda)
+        if (filas_remotas < estado.filas or
+                encabezado_sonda != _ajustar(estado.encabezados[inicio - 1:fin], ancho_sonda)):
+            return self._sincronizar_completo(sheet)
+
+        modificadas = []
+        for pos, huella_local in enumerate(estado.huellas):
+            numero = pos + 2
+            valores = sonda[numero - 1] if numero - 1 < len(sonda) else []
+            if _huella(_ajustar(valores, ancho_sonda)) != huella_local:
+                modificadas.append(numero)
+        nuevas = list(range(estado.filas + 1, filas_remotas + 1))
+        pendientes = [n for n in estado.filas_pendientes if n <= filas_remotas]
+
+        error = self._descargar_filas(sheet, estado, sorted(set(modificadas + nuevas + pendientes)))
+        if error:
+            return error
+
+        estado.sincronizado_en = time.time()
+        replica.marcar_sincronizada(hoja)
+        return None
+
+    def _descargar_filas(self, sheet, estado: EstadoHoja, numeros: List[int]) -> Optional[str]:
+        """Descarga filas completas agrupadas en rangos contiguos y las parchea"""
+        estado.filas_pendientes.clear()
+        if not numeros:
+            return None
+
+        ancho = len(estado.encabezados)
+        ultima_col = letra_columna(ancho)
+        rangos = agrupar_contiguas(numeros)
+        respuesta, error = api_manager.safe_sheet_operation(
+            sheet.batch_get, [f"A{a}:{ultima_col}{b}" for a, b in rangos]
+        )
+        if error:
+            estado.filas_pendientes.update(numeros)
+            return error
+
+        filas_descargadas = {}
+        for (a, b), valores in zip(rangos, respuesta):
+            for numero in range(a, b + 1):
+                desplazamiento = numero - a
+                fila = valores[desplazamiento] if desplazamiento < len(valores) else []
+                filas_descargadas[numero] = _ajustar(fila, ancho)
+
+        # Sólo se aceptan filas existentes o nuevas consecutivas al final (sin huecos)
+        ultima = estado.filas
+        for numero in sorted(filas_descargadas):
+            if numero > ultima + 1 or (numero > estado.filas and not any(filas_descargadas[numero])):
+                del filas_descargadas[numero]
+            elif numero > ultima:
+                ultima = numero
+        self._parchear(sheet.title, estado, filas_descargadas)
+        replica.aplicar_actualizaciones(
+            sheet.title, [{"range": f"A{n}", "values": [f]} for n, f in filas_descargadas.items()]
+        )
+        return None
+
+    def _parchear(self, hoja: str, estado: EstadoHoja, filas: Dict[int, List[str]]) -> None:
+        """Aplica filas completas (numeradas como en la hoja) sobre el DataFrame en memoria"""
+        existentes = {n: f for n, f in filas.items() if n <= estado.filas}
+        agregadas = [filas[n] for n in sorted(filas) if n > estado.filas]
+
+        if existentes:
+            # Copia antes de modificar: las instantáneas ya entregadas no deben cambiar
+            df = estado.df.copy()
+            for numero, fila in existentes.items():
+                df.iloc[numero - 2] = fila
+                estado.huellas[numero - 2] = self._huella_sonda(hoja, fila)
+            estado.df = df
+
+        if agregadas:
+            nuevas = pd.DataFrame(agregadas, columns=estado.encabezados)
+            estado.df = pd.concat([estado.df, nuevas], ignore_index=True)
+            estado.huellas.extend(self._huella_sonda(hoja, f) for f in agregadas)
+
+        if filas:
+            anterior, estado.version = estado.version, next(_versiones)
+            estado.cambios.append((anterior, estado.version, frozenset(filas)))
+
+    # --- Escrituras (write-through) ---
+    def aplicar_actualizaciones(self, hoja: str, updates: List[Dict]) -> None:
+        """Refleja en memoria y en la réplica las actualizaciones ya enviadas a la hoja"""
+        with self._lock_hoja(hoja):
+            replica.aplicar_actualizaciones(hoja, updates)
+            estado = self._estados.get(hoja)
+            if estado is None:
+                return
+            try:
+                filas = {}
+                for update in updates:
+                    fila_inicial, col_inicial = parsear_celda_inicial(update["range"])
+                    valores = update["values"]
+                    if not isinstance(valores, list):
+                        valores = [[valores]]
+                    for desplazamiento, valores_fila in enumerate(valores):
+                        numero = fila_inicial + desplazamiento
+                        if numero < 2:
+                            raise ValueError("Actualización sobre el encabezado")
+                        if numero not in filas:
+                            filas[numero] = (
+                                list(estado.df.iloc[numero - 2]) if numero <= estado.filas
+                                else [""] * len(estado.encabezados)
+                            )
+                        for j, valor in enumerate(valores_fila):
+                            posicion = col_inicial - 1 + j
+                            if posicion < len(estado.encabezados):
+                                filas[numero][posicion] = "" if valor is None else str(valor)
+                if any(n > estado.filas + 1 for n in filas):
+                    raise ValueError("Actualización fuera del rango conocido")
+                self._parchear(hoja, estado, filas)
+            except ValueError:
+                self.invalidar(hoja, completo=True)
+
+    def agregar_fila(self, hoja: str, fila: List) -> None:
+        """Refleja en memoria y en la réplica una fila agregada al final de la hoja"""
+        with self._lock_hoja(hoja):
+            replica.agregar_fila(hoja, fila)
+            estado = self._estados.get(hoja)
+            if estado is not None:
+                self._parchear(hoja, estado, {estado.filas + 1: _ajustar(fila, len(estado.encabezados))})
+
+    def invalidar(self, hoja: str, filas: Optional[Iterable[int]] = None, completo: bool = False) -> None:
+        """
+        Invalida sólo lo necesario de una hoja, sin tocar las demás.
+
+        Args:
+            hoja: título de la hoja
+            filas: números de fila (como en la hoja) a volver a descargar en la próxima lectura
+            completo: si es True descarta todo y la próxima lectura baja la hoja completa
+                      (necesario cuando se borran filas y cambian las posiciones)
+        """
+        with self._lock_hoja(hoja):
+            if completo:
+                replica.invalidar(hoja)
+                self._estados.pop(hoja, None)
+                return
+
+            estado = self._estados.get(hoja)
+            if estado is None:
+                return
+            if filas is not None:
+                estado.filas_pendientes.update(int(n) for n in filas if int(n) >= 2)
+            else:
+                # Verificar diferencias contra la hoja en la próxima lectura
+                estado.sincronizado_en = 0
+                estado.reintentar_en = 0.0
+
+    def cambios_entre(self, hoja: str, desde: int, hasta: int) -> Optional[List[int]]:
+        """
+        Números de fila (como en la hoja) modificados o agregados entre dos versiones.
+
+        Devuelve None si el camino entre ambas versiones no se conoce (hubo una
+        descarga completa, se borraron filas o el historial ya se descartó):
+        en ese caso quien pregunta debe reconstruir desde cero.
+        """
+        if desde == hasta:
+            return []
+        with self._lock_hoja(hoja):
+            estado = self._estados.get(hoja)
+            if estado is None:
+                return None
+            filas = set()
+            actual = hasta
+            for anterior, nueva, numeros in reversed(estado.cambios):
+                if nueva > actual:
+                    continue
+                if nueva < actual:
+                    return None
+                filas |= numeros
+                actual = anterior
+                if actual == desde:
+                    return sorted(filas)
+            return None
+
+    def version(self, hoja: str) -> Optional[int]:
+        """Versión actual de la hoja en memoria (cambia con cada modificación conocida)"""
+        estado = self._estados.get(hoja)
+        return estado.version if estado is not None else None
+
+
+# Instancia única global
+sincronizador = SincronizadorHojas()
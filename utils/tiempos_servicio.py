@@ -0,0 +1,130 @@
+"""
+Tiempo estimado de resolución por tipo de reclamo
+Mediana de las horas entre el ingreso y el cierre de los reclamos resueltos,
+calculada una vez por versión de la hoja y actualizada sólo con las filas que
+cambiaron
+"""
+import bisect
+from typing import Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from config.settings import (
+    TIEMPO_SERVICIO_MAXIMO,
+    TIEMPO_SERVICIO_MIN_MUESTRAS,
+    TIEMPO_SERVICIO_POR_DEFECTO,
+)
+from utils.modelo_datos import normalizar_reclamos, seleccionar_columnas
+
+_COLUMNAS = ["Fecha y hora", "Tipo de reclamo", "Estado", "Fecha_formateada"]
+
+
+class DefinicionTiemposServicio:
+    """
+    Describe las estimaciones de tiempo de resolución.
+
+    Se usa igual que una definición de índice (ver utils.indices.RegistroIndices):
+    `datos.indice("reclamos", TIEMPOS_SERVICIO)`.
+    """
+
+    def __init__(self, nombre: str):
+        self.nombre = nombre
+
+    def filas(self, df: pd.DataFrame) -> List[Optional[Tuple[str, float]]]:
+        """(tipo, horas) de cada fila cruda de `df`, o None si no es un cierre utilizable"""
+        tipado = normalizar_reclamos(seleccionar_columnas(df, _COLUMNAS))
+        horas = (tipado["Fecha_formateada_dt"] - tipado["Fecha y hora"]).dt.total_seconds() / 3600
+        validas = (tipado["Estado"] == "Resuelto") & horas.between(0, TIEMPO_SERVICIO_MAXIMO)
+        return [
+            (str(tipo), float(h)) if ok else None
+            for tipo, h, ok in zip(tipado["Tipo de reclamo"], horas, validas.fillna(False))
+        ]
+
+    def construir(self, df: pd.DataFrame, version: int) -> "TiemposServicio":
+        return TiemposServicio.construir(self, df, version)
+
+
+class TiemposServicio:
+    """
+    Horas de resolución de una versión concreta de la hoja de reclamos.
+
+    Guarda las duraciones ordenadas por tipo, así un cierre nuevo (o un reclamo que
+    vuelve a pendiente) se inserta o se quita sin recorrer la hoja. Igual que los
+    índices, un objeto publicado no se modifica.
+    """
+
+    __slots__ = ("definicion", "version", "_filas", "_por_tipo")
+
+    def __init__(self, definicion: DefinicionTiemposServicio, version: int,
+                 filas: Dict[int, Tuple[str, float]], por_tipo: Dict[str, List[float]]):
+        self.definicion = definicion
+        self.version = version
+        self._filas = filas
+        self._por_tipo = por_tipo
+
+    @classmethod
+    def construir(cls, definicion: DefinicionTiemposServicio, df: pd.DataFrame, version: int) -> "TiemposServicio":
+        filas = {p: f for p, f in enumerate(definicion.filas(df)) if f is not None}
+        por_tipo: Dict[str, List[float]] = {}
+        for tipo, horas in filas.values():
+            por_tipo.setdefault(tipo, []).append(horas)
+        return cls(definicion, version, filas, {t: sorted(h) for t, h in por_tipo.items()})
+
+    def actualizar(self, df: pd.DataFrame, version: int, posiciones: List[int]) -> "TiemposServicio":
+        """Estimaciones nuevas quitando la duración anterior de las filas indicadas y agregando la actual"""
+        filas = dict(self._filas)
+        por_tipo = dict(self._por_tipo)
+        copiados = set()  # sólo se copian las listas de los tipos que cambian
+
+        def lista(tipo):
+            if tipo not in copiados:
+                por_tipo[tipo] = list(por_tipo.get(tipo, []))
+                copiados.add(tipo)
+            return por_tipo[tipo]
+
+        posiciones = [p for p in posiciones if 0 <= p < len(df)]
+        for posicion, nueva in zip(posiciones, self.definicion.filas(df.iloc[posiciones])):
+            anterior = filas.pop(posicion, None)
+            if anterior == nueva:
+                if nueva is not None:
+                    filas[posicion] = nueva
+                continue
+            if anterior is not None:
+                horas = lista(anterior[0])
+                del horas[bisect.bisect_left(horas, anterior[1])]
+            if nueva is not None:
+                bisect.insort(lista(nueva[0]), nueva[1])
+                filas[posicion] = nueva
+
+        return TiemposServicio(self.definicion, version, filas, {t: h for t, h in por_tipo.items() if h})
+
+    @staticmethod
+    def _mediana(horas: List[float]) -> float:
+        medio = len(horas) // 2
+        return horas[medio] if len(horas) % 2 else (horas[medio - 1] + horas[medio]) / 2
+
+    def general(self) -> float:
+        """Mediana de las medianas por tipo (para tipos con poco historial)"""
+        medianas = sorted(self._mediana(h) for h in self._por_tipo.values())
+        return self._mediana(medianas) if medianas else TIEMPO_SERVICIO_POR_DEFECTO
+
+    def horas(self, tipo: str) -> float:
+        """Horas estimadas para resolver un reclamo de ese tipo"""
+        muestras = self._por_tipo.get(str(tipo), [])
+        if len(muestras) < TIEMPO_SERVICIO_MIN_MUESTRAS:
+            return self.general()
+        return self._mediana(muestras)
+
+    def estimaciones(self) -> pd.DataFrame:
+        """Tabla tipo / horas estimadas / cierres usados, ordenada por horas"""
+        return pd.DataFrame(
+            [(t, self.horas(t), len(h)) for t, h in self._por_tipo.items()],
+            columns=["Tipo de reclamo", "Horas estimadas", "Cierres"]
+        ).sort_values("Horas estimadas", ascending=False, ignore_index=True)
+
+    def __len__(self) -> int:
+        return len(self._filas)
+
+
+# Estimaciones usadas por la planificación
+TIEMPOS_SERVICIO = DefinicionTiemposServicio("tiempos_servicio")